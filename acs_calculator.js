@@ -689,7 +689,8 @@ searchBtn.addEventListener('click', async () => {
             target_acs: currentAcsScore,
             target_category: jobCategory,
             target_country: country || null,
-            max_results: 10
+            max_results: 10,
+            include_related: true
         };
         
         // Call backend API
@@ -750,7 +751,9 @@ function displayResults(response, category, country) {
                     <h3 class="client-name">${client.client_name}</h3>
                     <span class="acs-badge">ACS ${client.acs_score}</span>
                 </div>
-                
+                ${client.match_type === 'related' ? `
+                <div class="match-note">Related: ${client.matching_category} (related to ${client.related_to})</div>
+                ` : ''}
                 <div class="client-stats">
                     <div class="stat-item">
                         <div class="stat-label">Job Categories Count</div>
@@ -831,6 +834,55 @@ document.addEventListener('DOMContentLoaded', function() {
 
 // Database functionality
 let allClientsData = [];
+// Data version and ETag of allClientsData, used for delta sync on repeat opens
+let clientDataVersion = null;
+let clientDataEtag = null;
+
+function sortClientsByName(clients) {
+    return clients.sort((a, b) => a.client_name.localeCompare(b.client_name));
+}
+
+function applyClientChanges(clients, changes) {
+    // Merge added, changed and removed clients into the cached list
+    const byName = new Map(clients.map(client => [client.client_name, client]));
+    changes.removed.forEach(name => byName.delete(name));
+    changes.added.concat(changes.changed).forEach(client => byName.set(client.client_name, client));
+    return sortClientsByName(Array.from(byName.values()));
+}
+
+async function fetchClientData() {
+    // First open: full list. Later opens: only what changed since the cached version.
+    if (clientDataVersion === null) {
+        const response = await fetch('/get-all-clients');
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.message || 'Failed to load client data');
+        }
+        allClientsData = data.clients;
+        clientDataVersion = data.version;
+        clientDataEtag = response.headers.get('ETag');
+        return;
+    }
+    
+    const headers = clientDataEtag ? { 'If-None-Match': clientDataEtag } : {};
+    const response = await fetch(`/clients/changes?since=${encodeURIComponent(clientDataVersion)}`, { headers });
+    if (response.status === 304) {
+        return;
+    }
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    const data = await response.json();
+    if (!data.success) {
+        throw new Error(data.message || 'Failed to load client data');
+    }
+    allClientsData = data.full ? data.clients : applyClientChanges(allClientsData, data);
+    clientDataVersion = data.version;
+    clientDataEtag = response.headers.get('ETag');
+}
 
 async function loadDatabaseData() {
     const loadingSection = document.getElementById('databaseLoadingSection');
@@ -844,20 +896,8 @@ async function loadDatabaseData() {
     
     try {
         // Fetch real client data from the backend
-        const response = await fetch('/get-all-clients');
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const data = await response.json();
-        
-        if (data.success) {
-            allClientsData = data.clients;
-            displayDatabaseResults(allClientsData);
-        } else {
-            throw new Error(data.message || 'Failed to load client data');
-        }
+        await fetchClientData();
+        displayDatabaseResults(allClientsData);
         
     } catch (error) {
         console.error('Error loading database data:', error);
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+ACS What-If Re-Scoring
+Re-scores stored calculations under alternative weights, login multipliers and thresholds
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Methodology in acs_calculator.js (calculateACS / getFinalACS)
+CURRENT_WEIGHTS = {'pages': 0.2, 'time': 0.6, 'documents': 0.2}
+CURRENT_LOGIN_MULTIPLIER = 1.2
+CURRENT_THRESHOLDS = [1.5, 2.5, 3.5, 4.5]
+ACS_LEVELS = [1, 2, 3, 4, 5]
+MAX_SCHEMES = 20
+DEFAULT_MAX_CLIENTS = 50
+
+
+class ScoringScheme:
+    """Factor weights, login multiplier and ACS cut-offs (a score <= thresholds[i] is ACS i + 1)"""
+
+    def __init__(self, name: str, weights: Dict[str, float] = None, login_multiplier: float = CURRENT_LOGIN_MULTIPLIER,
+                 thresholds: Sequence[float] = None):
+        weights = {**CURRENT_WEIGHTS, **(weights or {})}
+        unknown = set(weights) - set(CURRENT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown weight(s): {', '.join(sorted(unknown))}; expected pages, time, documents")
+        thresholds = list(CURRENT_THRESHOLDS if thresholds is None else thresholds)
+        if len(thresholds) != len(ACS_LEVELS) - 1:
+            raise ValueError(f"thresholds needs {len(ACS_LEVELS) - 1} cut-offs, got {len(thresholds)}")
+        if any(later <= earlier for earlier, later in zip(thresholds, thresholds[1:])):
+            raise ValueError("thresholds must be strictly increasing")
+        self.name = name
+        self.weights = {key: float(value) for key, value in weights.items()}
+        self.login_multiplier = float(login_multiplier)
+        self.thresholds = [float(value) for value in thresholds]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], default_name: str) -> 'ScoringScheme':
+        """Scheme from a request payload; omitted parts keep the current methodology"""
+        return cls(
+            name=str(data.get('name') or default_name),
+            weights=data.get('weights'),
+            login_multiplier=data.get('login_multiplier', CURRENT_LOGIN_MULTIPLIER),
+            thresholds=data.get('thresholds')
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'weights': self.weights, 'login_multiplier': self.login_multiplier,
+                'thresholds': self.thresholds}
+
+
+CURRENT_SCHEME = ScoringScheme('current')
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class CalculationFactors:
+    """
+    Factor columns of stored calculations as numpy arrays
+
+    Rows without all three factor scores (e.g. hand-edited rows) are left out and
+    counted in `skipped`.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]]):
+        records = list(records)
+        pages = np.array([_to_float(r.get('pageScore')) for r in records], dtype=np.float64)
+        time = np.array([_to_float(r.get('timeScore')) for r in records], dtype=np.float64)
+        documents = np.array([_to_float(r.get('documentScore')) for r in records], dtype=np.float64)
+        # The stored multiplier is authoritative; fall back to the login flag for rows without one
+        multiplier = np.array([_to_float(r.get('loginMultiplier')) for r in records], dtype=np.float64)
+        login_flag = np.array([str(r.get('loginRequired', '')).strip().lower() == 'true' for r in records], dtype=bool)
+        login = np.where(np.isnan(multiplier), login_flag, multiplier > 1.0)
+        stored = np.array([_to_float(r.get('acsScore')) for r in records], dtype=np.float64)
+
+        valid = ~(np.isnan(pages) | np.isnan(time) | np.isnan(documents))
+        self.skipped = int((~valid).sum())
+        self.pages, self.time, self.documents = pages[valid], time[valid], documents[valid]
+        self.login = login[valid]
+        self.stored_acs = stored[valid]
+        client_names = [str(r.get('clientName', '')).strip() for r, ok in zip(records, valid) if ok]
+        self.client_codes, self.clients = _factorize(client_names)
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def score(self, scheme: ScoringScheme) -> np.ndarray:
+        """ACS level (1-5) of every row under a scheme"""
+        # Same operation order as calculateACS so boundary cases round identically
+        raw = (self.pages * scheme.weights['pages'] + self.time * scheme.weights['time']
+               + self.documents * scheme.weights['documents'])
+        adjusted = np.where(self.login, raw * scheme.login_multiplier, raw)
+        return (np.searchsorted(scheme.thresholds, adjusted, side='left') + 1).astype(np.int8)
+
+
+def _factorize(values: List[str]):
+    uniques: Dict[str, int] = {}
+    codes = np.fromiter((uniques.setdefault(value, len(uniques)) for value in values), dtype=np.int64, count=len(values))
+    return codes, list(uniques)
+
+
+def _distribution(scores: np.ndarray) -> Dict[str, int]:
+    counts = np.bincount(scores, minlength=ACS_LEVELS[-1] + 1)
+    return {str(level): int(counts[level]) for level in ACS_LEVELS}
+
+
+def what_if(factors: CalculationFactors, schemes: List[ScoringScheme], baseline: ScoringScheme = CURRENT_SCHEME,
+            max_clients: int = DEFAULT_MAX_CLIENTS) -> Dict[str, Any]:
+    """
+    Compare each scheme against the baseline over every stored calculation
+
+    Reports the ACS distribution and its shift, a baseline -> scheme transition
+    matrix, and the clients whose mean ACS moves the most.
+    """
+    baseline_scores = factors.score(baseline)
+    n_clients = len(factors.clients)
+    client_rows = np.bincount(factors.client_codes, minlength=n_clients)
+    baseline_sums = np.bincount(factors.client_codes, weights=baseline_scores, minlength=n_clients)
+    levels = len(ACS_LEVELS)
+    stored_valid = ~np.isnan(factors.stored_acs)
+
+    results = []
+    for scheme in schemes:
+        scores = factors.score(scheme)
+        changed = scores != baseline_scores
+        delta = scores.astype(np.int16) - baseline_scores
+        transitions = np.bincount((baseline_scores.astype(np.int64) - 1) * levels + (scores - 1),
+                                  minlength=levels * levels).reshape(levels, levels)
+
+        sums = np.bincount(factors.client_codes, weights=scores, minlength=n_clients)
+        changed_rows = np.bincount(factors.client_codes, weights=changed, minlength=n_clients)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_delta = (sums - baseline_sums) / client_rows
+        moved = np.flatnonzero(changed_rows > 0)
+        moved = moved[np.argsort(-np.abs(mean_delta[moved]), kind='stable')]
+
+        distribution = _distribution(scores)
+        baseline_distribution = _distribution(baseline_scores)
+        results.append({
+            'scheme': scheme.to_dict(),
+            'distribution': distribution,
+            'distribution_shift': {level: distribution[level] - baseline_distribution[level]
+                                   for level in distribution},
+            'mean_acs': round(float(scores.mean()), 4) if len(scores) else None,
+            'rows_changed': int(changed.sum()),
+            'rows_up': int((delta > 0).sum()),
+            'rows_down': int((delta < 0).sum()),
+            'transitions': {str(ACS_LEVELS[i]): {str(ACS_LEVELS[j]): int(transitions[i, j]) for j in range(levels)
+                                                 if transitions[i, j]}
+                            for i in range(levels) if transitions[i].any()},
+            'clients_changed': int(len(moved)),
+            'client_changes': [
+                {
+                    'client_name': factors.clients[code],
+                    'calculations': int(client_rows[code]),
+                    'calculations_changed': int(changed_rows[code]),
+                    'baseline_mean_acs': round(float(baseline_sums[code] / client_rows[code]), 3),
+                    'scheme_mean_acs': round(float(sums[code] / client_rows[code]), 3),
+                    'mean_acs_change': round(float(mean_delta[code]), 3)
+                }
+                for code in moved[:max_clients]
+            ]
+        })
+
+    return {
+        'calculations': len(factors),
+        'skipped_rows': factors.skipped,
+        'clients': n_clients,
+        'baseline': {
+            'scheme': baseline.to_dict(),
+            'distribution': _distribution(baseline_scores),
+            'mean_acs': round(float(baseline_scores.mean()), 4) if len(baseline_scores) else None,
+            # Stored scores that the baseline doesn't reproduce (e.g. rows saved under older rules)
+            'stored_mismatches': int((factors.stored_acs[stored_valid] != baseline_scores[stored_valid]).sum())
+        },
+        'schemes': results
+    }
+
+
+def parse_schemes(payload: Optional[List[Dict[str, Any]]]) -> List[ScoringScheme]:
+    """Validate the `schemes` list of a what-if request"""
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("schemes must be a non-empty list")
+    if len(payload) > MAX_SCHEMES:
+        raise ValueError(f"At most {MAX_SCHEMES} schemes per request")
+    schemes = []
+    for index, entry in enumerate(payload, 1):
+        if not isinstance(entry, dict):
+            raise ValueError("each scheme must be an object")
+        schemes.append(ScoringScheme.from_dict(entry, f"scheme_{index}"))
+    return schemes
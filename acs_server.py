@@ -4,39 +4,466 @@ ACS Calculator Server
 Simple HTTP server to connect frontend with Google Sheets backend
 """
 
+import time
+
+# Taken before anything else is imported so startup timings include import cost
+PROCESS_START = time.time()
+
+import gc
+import hmac
 import json
 import logging
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import select
+import signal
+import socket
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
-from google_sheets_backend import GoogleSheetsBackend
 from datetime import datetime
-import pandas as pd
+import admission
+import deadlines
+import memory_monitor
+import metrics
+import profiling
+import structured_logging
+from client_versions import version_etag
+from metrics import REGISTRY
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# One structured record per request (replaces BaseHTTPRequestHandler's stderr access log)
+access_logger = logging.getLogger('acs.access')
+
+JOB_DATA_FILE = "2025-08-29 3_39pm.csv"
+COUNTRY_DATA_FILE = "client_countries.csv"
+# Dated job exports ("2025-08-29 3_39pm.csv", ...); JOB_DATA_FILE is only used when this holds none
+JOB_DATA_DIR = os.getenv('ACS_JOB_DATA_DIR', os.path.join('data', 'jobs'))
+JOB_RETENTION_DAYS = float(os.getenv('ACS_JOB_RETENTION_DAYS', '0')) or None
+JOB_RESCAN_SECONDS = float(os.getenv('ACS_JOB_RESCAN_SECONDS', '300'))
+
+STATIC_EXTENSIONS = ('.html', '.css', '.js', '.jpg', '.jpeg', '.png', '.svg', '.txt')
+
+# Known routes are used as metric labels; everything else is bucketed to keep label cardinality bounded
+KNOWN_ROUTES = {
+    '/', '/status', '/spreadsheet-info', '/get-all-clients', '/metrics', '/healthz', '/ready',
+    '/client-summary', '/stats', '/export/jobs', '/export/clients', '/calculations', '/clients/changes',
+    '/clients/name-matches', '/stats/ats',
+    '/debug/memory',
+    '/store-calculation', '/find-similar-clients', '/calculations/what-if'
+}
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'acs_http_requests_total', 'HTTP requests handled', ['method', 'route', 'status'])
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'acs_http_request_duration_seconds', 'HTTP request latency', ['method', 'route', 'status'])
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    'acs_http_requests_in_flight', 'HTTP requests currently being handled', ['route'])
+REQUEST_PHASE_SECONDS = REGISTRY.histogram(
+    'acs_request_phase_duration_seconds', 'Time spent in each phase of a request', ['route', 'phase'])
+CACHE_REQUESTS = REGISTRY.counter(
+    'acs_cache_requests_total', 'Lookups of shared server-side objects', ['cache', 'result'])
+STARTUP_SECONDS = REGISTRY.gauge(
+    'acs_startup_seconds', 'Seconds from process start until a startup milestone', ['milestone'])
+
+PROFILER = profiling.RequestProfiler.from_env()
+MEMORY_BUDGET = memory_monitor.MemoryBudget.from_env()
+# Per-route concurrency limits and wait queues for expensive routes (admission.py)
+ADMISSION = admission.AdmissionController.from_env()
+
+# Admin-only endpoints (/debug/*) require ACS_ADMIN_TOKEN in this header; disabled when unset
+ADMIN_TOKEN = os.getenv('ACS_ADMIN_TOKEN') or None
+ADMIN_HEADER = 'X-ACS-Admin-Token'
+
+# Time budget for each request; every Sheets call (and quota wait) made while serving it must fit inside
+REQUEST_DEADLINE_SECONDS = float(os.getenv('ACS_REQUEST_DEADLINE_SECONDS', '8'))
+# Suggested client back-off when a request is answered degraded because Sheets didn't respond in time
+DEGRADED_RETRY_AFTER_SECONDS = 5
+# Suggested client back-off when admission control sheds a request
+SHED_RETRY_AFTER_SECONDS = 1
+
+# Graceful shutdown: SIGTERM stops accepting, then in-flight requests get this long to finish
+SHUTDOWN_TIMEOUT = float(os.getenv('ACS_SHUTDOWN_TIMEOUT', '25'))
+# Keep serving this long after SIGTERM (with /ready failing) so load balancers stop routing here first
+DRAIN_GRACE_SECONDS = float(os.getenv('ACS_DRAIN_GRACE_SECONDS', '0'))
+# SO_REUSEPORT lets a replacement process bind the port before this one exits (rolling_restart.py)
+REUSE_PORT = os.getenv('ACS_REUSE_PORT', '').strip().lower() in ('1', 'true', 'yes')
+# Written once warm ({"pid", "port", "ready_at"}) so a restart script knows the new process can take over
+READY_FILE = os.getenv('ACS_READY_FILE') or None
+
+SHUTDOWN_IN_FLIGHT = REGISTRY.gauge(
+    'acs_shutdown_requests_in_flight', 'Requests still running while the server drains for shutdown')
+
+# Shared across requests: a new handler instance is created for every request.
+# Separate locks so a slow finder build never blocks Sheets-only routes.
+_backend_lock = threading.Lock()
+_finder_lock = threading.Lock()
+_shared_backend = None
+_shared_backend_initialized = False
+_client_finder = None
+_history_lock = threading.Lock()
+_calculation_history = None
+
+# Background warmup progress per component: pending, ready or failed
+_warmup_state = {'sheets_backend': 'pending', 'client_finder': 'pending'}
+_first_response_recorded = False
+_draining = threading.Event()
+_server = None
+
+
+def record_startup_milestone(milestone):
+    """Record and log time since process start for a startup milestone"""
+    elapsed = time.time() - PROCESS_START
+    STARTUP_SECONDS.set(round(elapsed, 3), milestone=milestone)
+    logger.info(f"Startup milestone {milestone} reached after {elapsed:.2f}s")
+
+
+def route_label(path):
+    """Map a request path to a bounded metric label"""
+    if path in KNOWN_ROUTES:
+        return path
+    if path.endswith(STATIC_EXTENSIONS):
+        return 'static'
+    return 'unmatched'
+
+
+def get_shared_backend():
+    """Return the process-wide Google Sheets backend, initializing it on first use"""
+    global _shared_backend, _shared_backend_initialized
+    with _backend_lock:
+        if _shared_backend_initialized:
+            CACHE_REQUESTS.inc(cache='sheets_backend', result='hit')
+            return _shared_backend
+        CACHE_REQUESTS.inc(cache='sheets_backend', result='miss')
+        try:
+            # Deferred: gspread and google-auth are slow to import
+            from google_sheets_backend import GoogleSheetsBackend
+            # Shared by every later request, so it mustn't fail just because this request is short on time
+            with deadlines.no_deadline():
+                _shared_backend = GoogleSheetsBackend()
+            logger.info("Google Sheets backend initialized successfully")
+        except Exception as e:
+            logger.warning(f"Google Sheets backend initialization failed: {e}")
+            _shared_backend = None
+        _shared_backend_initialized = True
+        return _shared_backend
+
+
+def get_client_finder():
+    """Return the process-wide Client Reference Finder, building it on first use"""
+    global _client_finder
+    with _finder_lock:
+        if _client_finder is not None:
+            CACHE_REQUESTS.inc(cache='client_finder', result='hit')
+            return _client_finder
+        CACHE_REQUESTS.inc(cache='client_finder', result='miss')
+        # Deferred: pandas is slow to import
+        from client_reference_finder import ClientReferenceFinder
+        _client_finder = ClientReferenceFinder(job_data_file=JOB_DATA_FILE, country_data_file=COUNTRY_DATA_FILE,
+                                               job_data_dir=JOB_DATA_DIR, retention_days=JOB_RETENTION_DAYS)
+        logger.info("Client Reference Finder initialized successfully")
+        return _client_finder
+
+
+def get_calculation_history():
+    """Return the process-wide calculation history mirror, or None without Sheets"""
+    global _calculation_history
+    backend = get_shared_backend()
+    if backend is None:
+        return None
+    with _history_lock:
+        if _calculation_history is None:
+            from calculation_history import CalculationHistory
+            _calculation_history = CalculationHistory(backend)
+        return _calculation_history
+
+
+def _warmup():
+    """Build the shared finder and Sheets backend so the first real request is fast"""
+    try:
+        finder = get_client_finder()
+        _warmup_state['client_finder'] = 'ready' if finder.combined_data is not None else 'failed'
+    except Exception as e:
+        logger.error(f"Client Reference Finder warmup failed: {e}")
+        _warmup_state['client_finder'] = 'failed'
+    record_startup_milestone('client_finder_warm')
+
+    backend = get_shared_backend()
+    _warmup_state['sheets_backend'] = 'ready' if backend is not None and backend.worksheet else 'failed'
+    record_startup_milestone('sheets_backend_warm')
+    
+    history = get_calculation_history()
+    if history is not None:
+        history.maybe_sync()
+    
+    register_memory_caches()
+    start_job_partition_rescan()
+    
+    if is_ready() and _server is not None:
+        write_ready_file(_server.server_address[1])
+
+
+def _rescan_job_partitions():
+    while True:
+        time.sleep(JOB_RESCAN_SECONDS)
+        finder = _client_finder
+        if finder is None or not finder.job_data_dir:
+            continue
+        try:
+            finder.ingest_partitions()
+        except Exception as e:
+            logger.error(f"Job partition rescan failed: {e}")
+
+
+def start_job_partition_rescan():
+    """Pick up new dated job exports (and age out old ones) without a restart"""
+    if JOB_RESCAN_SECONDS <= 0:
+        return None
+    thread = threading.Thread(target=_rescan_job_partitions, name='acs-job-rescan', daemon=True)
+    thread.start()
+    return thread
+
+
+def register_memory_caches():
+    """Let the soft memory budget shed caches, cheapest to rebuild first"""
+    history = get_calculation_history()
+    if history is not None:
+        MEMORY_BUDGET.register('calculation_history', history.shed_records)
+    finder = _client_finder
+    if finder is not None:
+        MEMORY_BUDGET.register('client_summaries', finder.shed_client_summaries)
+        MEMORY_BUDGET.register('analytics_cube', finder.shed_analytics_cube)
+        MEMORY_BUDGET.register('title_classifier', finder.shed_title_classifier)
+        MEMORY_BUDGET.register('category_graph', finder.shed_category_graph)
+
+
+def start_warmup():
+    """Start background warmup of data and Sheets connections"""
+    thread = threading.Thread(target=_warmup, name='acs-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def is_ready():
+    """Ready once the finder has data; a missing Sheets connection only degrades storage"""
+    if _draining.is_set():
+        return False
+    return _warmup_state['client_finder'] == 'ready' and _warmup_state['sheets_backend'] != 'pending'
+
+
+def write_ready_file(port):
+    """Announce that this process is warm (atomically, so readers never see a partial file)"""
+    if not READY_FILE:
+        return
+    try:
+        directory = os.path.dirname(READY_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{READY_FILE}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'pid': os.getpid(), 'port': port, 'ready_at': datetime.now().isoformat()}, f)
+        os.replace(temp_path, READY_FILE)
+        logger.info(f"Wrote ready file {READY_FILE}")
+    except OSError as e:
+        logger.warning(f"Could not write ready file {READY_FILE}: {e}")
+
+
+def remove_ready_file():
+    """Remove the ready file unless a replacement process has already claimed it"""
+    if not READY_FILE:
+        return
+    try:
+        with open(READY_FILE, 'r') as f:
+            owner = json.load(f).get('pid')
+        if owner == os.getpid():
+            os.remove(READY_FILE)
+    except (OSError, ValueError):
+        pass
+
+
+class ACSHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server that counts in-flight requests so shutdown can drain them"""
+    
+    def __init__(self, server_address, handler_class, reuse_port=False):
+        self.reuse_port = reuse_port
+        self.active_requests = 0
+        self._active = threading.Condition()
+        super().__init__(server_address, handler_class)
+    
+    def server_bind(self):
+        if self.reuse_port:
+            if hasattr(socket, 'SO_REUSEPORT'):
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            else:
+                logger.warning("SO_REUSEPORT is not supported on this platform; rolling restarts will fail to bind")
+        super().server_bind()
+    
+    def process_request(self, request, client_address):
+        # Counted before the worker thread starts so a drain never misses a just-accepted request
+        with self._active:
+            self.active_requests += 1
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._request_done()
+            raise
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._request_done()
+    
+    def _request_done(self):
+        with self._active:
+            self.active_requests -= 1
+            self._active.notify_all()
+    
+    def accept_backlog(self):
+        """Serve connections already queued on the listening socket; closing it would reset them"""
+        accepted = 0
+        while select.select([self.socket], [], [], 0)[0]:
+            self._handle_request_noblock()
+            accepted += 1
+        return accepted
+    
+    def wait_for_requests(self, timeout):
+        """Wait until no requests are in flight; returns how many are still running"""
+        deadline = time.monotonic() + timeout
+        with self._active:
+            while self.active_requests > 0:
+                SHUTDOWN_IN_FLIGHT.set(self.active_requests)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._active.wait(min(remaining, 0.5))
+            SHUTDOWN_IN_FLIGHT.set(self.active_requests)
+            return self.active_requests
+
+
+def begin_shutdown(httpd, reason):
+    """Fail readiness, optionally keep serving through the grace period, then stop accepting"""
+    if _draining.is_set():
+        return
+    _draining.set()
+    logger.info(f"Shutdown requested ({reason}); {httpd.active_requests} requests in flight")
+    remove_ready_file()
+    if DRAIN_GRACE_SECONDS > 0:
+        time.sleep(DRAIN_GRACE_SECONDS)
+    # Returns once serve_forever has exited on the main thread
+    httpd.shutdown()
+
+
+def finish_shutdown(httpd):
+    """Drain in-flight requests (and the Sheets writes they carry), then flush background work"""
+    backlog = httpd.accept_backlog()
+    httpd.server_close()
+    remaining = httpd.wait_for_requests(SHUTDOWN_TIMEOUT)
+    if remaining:
+        logger.warning(f"Shutdown deadline of {SHUTDOWN_TIMEOUT:.0f}s passed with {remaining} requests still running")
+    else:
+        logger.info(f"Drained all requests ({backlog} accepted from the backlog after stopping)")
+    MEMORY_BUDGET.stop()
+    remove_ready_file()
+    structured_logging.shutdown_logging()
 
 class ACSCalculatorHandler(BaseHTTPRequestHandler):
     """HTTP request handler for ACS Calculator"""
     
     def __init__(self, *args, **kwargs):
-        self.backend = None
-        self.backend_initialized = False
+        self.response_status = None
+        self.request_id = None
+        self.use_chunked = False
+        self.phase_timer = profiling.PhaseTimer()
         super().__init__(*args, **kwargs)
     
     def get_backend(self):
         """Lazy initialization of Google Sheets backend"""
-        if not self.backend_initialized:
+        return get_shared_backend()
+    
+    def get_client_finder(self):
+        """Lazy initialization of the Client Reference Finder"""
+        try:
+            return get_client_finder()
+        except Exception as e:
+            logger.error(f"Error initializing Client Reference Finder: {e}")
+            return None
+    
+    def send_response(self, code, message=None):
+        """Record the response status for request metrics"""
+        self.response_status = code
+        super().send_response(code, message)
+    
+    def end_headers(self):
+        """Echo the request ID on every response so client and server logs can be joined"""
+        if self.request_id:
+            self.send_header(structured_logging.REQUEST_ID_HEADER, self.request_id)
+        super().end_headers()
+    
+    def log_request(self, code='-', size='-'):
+        """Access records are logged by track_request with route, status and duration"""
+    
+    @contextmanager
+    def track_request(self, path):
+        """
+        Record count, latency, in-flight gauge and an access log record for a request
+        
+        Yields whether the request was admitted; a shed request has already been answered with 503.
+        """
+        route = route_label(path)
+        # Accept a caller's request ID if it looks sane, otherwise mint one
+        request_id = (self.headers.get(structured_logging.REQUEST_ID_HEADER) or '')[:64]
+        if not request_id.replace('-', '').isalnum():
+            request_id = None
+        HTTP_IN_FLIGHT.inc(route=route)
+        start = time.perf_counter()
+        with structured_logging.request_context(route, request_id) as context:
+            self.request_id = context['request_id']
             try:
-                self.backend = GoogleSheetsBackend()
-                self.backend_initialized = True
-                logger.info("Google Sheets backend initialized successfully")
-            except Exception as e:
-                logger.warning(f"Google Sheets backend initialization failed: {e}")
-                self.backend = None
-                self.backend_initialized = True
-        return self.backend
+                with profiling.request_timer() as self.phase_timer, PROFILER.maybe_profile(route, self.headers), \
+                        deadlines.deadline(REQUEST_DEADLINE_SECONDS), ADMISSION.admit(route) as shed_reason:
+                    if shed_reason is not None:
+                        self.send_shed_response(route, shed_reason)
+                    yield shed_reason is None
+            finally:
+                elapsed = time.perf_counter() - start
+                HTTP_IN_FLIGHT.dec(route=route)
+                for phase_name, seconds in self.phase_timer.phases.items():
+                    REQUEST_PHASE_SECONDS.observe(seconds, route=route, phase=phase_name)
+                status = str(self.response_status) if self.response_status else 'none'
+                global _first_response_recorded
+                if not _first_response_recorded and self.response_status:
+                    _first_response_recorded = True
+                    record_startup_milestone('first_response')
+                HTTP_REQUESTS.inc(method=self.command, route=route, status=status)
+                HTTP_REQUEST_SECONDS.observe(elapsed, method=self.command, route=route, status=status)
+                access_logger.info('%s %s %s %.1fms', self.command, path, status, elapsed * 1000, extra={
+                    'method': self.command,
+                    'path': path,
+                    'status': self.response_status,
+                    'duration_ms': round(elapsed * 1000, 3),
+                    'client': self.client_address[0] if self.client_address else None
+                })
+    
+    def send_shed_response(self, route, reason):
+        """Fast 503 for a request turned away by admission control"""
+        body = json.dumps({
+            'success': False,
+            'error': 'Server busy, please retry',
+            'route': route,
+            'reason': reason,
+            'retry_after': SHED_RETRY_AFTER_SECONDS,
+            'timestamp': datetime.now().isoformat()
+        }).encode('utf-8')
+        self.send_response(503)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Retry-After', str(SHED_RETRY_AFTER_SECONDS))
+        self.end_headers()
+        self.wfile.write(body)
     
     def do_OPTIONS(self):
         """Handle CORS preflight requests"""
@@ -50,29 +477,59 @@ class ACSCalculatorHandler(BaseHTTPRequestHandler):
         """Handle GET requests"""
         parsed_url = urlparse(self.path)
         
-        if parsed_url.path == '/':
-            self.handle_root()
-        elif parsed_url.path == '/status':
-            self.handle_status()
-        elif parsed_url.path == '/spreadsheet-info':
-            self.handle_spreadsheet_info()
-        elif parsed_url.path == '/get-all-clients':
-            self.handle_get_all_clients()
-        elif parsed_url.path.endswith(('.html', '.css', '.js', '.jpg', '.jpeg', '.png', '.svg', '.txt')):
-            self.handle_static_file(parsed_url.path)
-        else:
-            self.send_error(404, "Endpoint not found")
+        with self.track_request(parsed_url.path) as admitted:
+            if not admitted:
+                return
+            if parsed_url.path == '/':
+                self.handle_root()
+            elif parsed_url.path == '/status':
+                self.handle_status()
+            elif parsed_url.path == '/spreadsheet-info':
+                self.handle_spreadsheet_info()
+            elif parsed_url.path == '/get-all-clients':
+                self.handle_get_all_clients()
+            elif parsed_url.path == '/clients/changes':
+                self.handle_client_changes(parse_qs(parsed_url.query))
+            elif parsed_url.path == '/clients/name-matches':
+                self.handle_client_name_matches(parse_qs(parsed_url.query))
+            elif parsed_url.path == '/client-summary':
+                self.handle_client_summary(parse_qs(parsed_url.query))
+            elif parsed_url.path == '/calculations':
+                self.handle_calculations(parse_qs(parsed_url.query))
+            elif parsed_url.path == '/stats':
+                self.handle_stats(parse_qs(parsed_url.query))
+            elif parsed_url.path == '/stats/ats':
+                self.handle_ats_stats(parse_qs(parsed_url.query))
+            elif parsed_url.path in ('/export/jobs', '/export/clients'):
+                self.handle_export(parsed_url.path.rsplit('/', 1)[1], parse_qs(parsed_url.query))
+            elif parsed_url.path == '/metrics':
+                self.handle_metrics()
+            elif parsed_url.path == '/debug/memory':
+                self.handle_debug_memory(parse_qs(parsed_url.query))
+            elif parsed_url.path == '/healthz':
+                self.handle_healthz()
+            elif parsed_url.path == '/ready':
+                self.handle_ready()
+            elif parsed_url.path.endswith(STATIC_EXTENSIONS):
+                self.handle_static_file(parsed_url.path)
+            else:
+                self.send_error(404, "Endpoint not found")
     
     def do_POST(self):
         """Handle POST requests"""
         parsed_url = urlparse(self.path)
         
-        if parsed_url.path == '/store-calculation':
-            self.handle_store_calculation()
-        elif parsed_url.path == '/find-similar-clients':
-            self.handle_find_similar_clients()
-        else:
-            self.send_error(404, "Endpoint not found")
+        with self.track_request(parsed_url.path) as admitted:
+            if not admitted:
+                return
+            if parsed_url.path == '/store-calculation':
+                self.handle_store_calculation()
+            elif parsed_url.path == '/find-similar-clients':
+                self.handle_find_similar_clients()
+            elif parsed_url.path == '/calculations/what-if':
+                self.handle_calculations_what_if()
+            else:
+                self.send_error(404, "Endpoint not found")
     
     def handle_root(self):
         """Handle root path - redirect to demo page"""
@@ -151,6 +608,7 @@ class ACSCalculatorHandler(BaseHTTPRequestHandler):
             response = {
                 'success': True,
                 'status': status,
+                'admission': ADMISSION.status(),
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -160,6 +618,80 @@ class ACSCalculatorHandler(BaseHTTPRequestHandler):
             logger.error(f"Error handling status request: {e}")
             self.send_error(500, f"Internal server error: {str(e)}")
     
+    def send_json(self, status_code, payload):
+        """Send a small JSON response with an explicit Content-Length"""
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def handle_healthz(self):
+        """Liveness probe: the process is up and serving requests"""
+        self.send_json(200, {'status': 'ok'})
+    
+    def handle_ready(self):
+        """Readiness probe: data is loaded and Sheets initialization has finished"""
+        ready = is_ready()
+        self.send_json(200 if ready else 503, {
+            'ready': ready,
+            'draining': _draining.is_set(),
+            'components': dict(_warmup_state),
+            'uptime_seconds': round(time.time() - PROCESS_START, 3)
+        })
+    
+    def handle_metrics(self):
+        """Handle Prometheus metrics scrape"""
+        try:
+            body = REGISTRY.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-type', metrics.CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except Exception as e:
+            logger.error(f"Error rendering metrics: {e}")
+            self.send_error(500, f"Internal server error: {str(e)}")
+    
+    def is_admin_request(self):
+        """True if the request carries the configured admin token"""
+        token = self.headers.get(ADMIN_HEADER)
+        return bool(ADMIN_TOKEN and token and hmac.compare_digest(token, ADMIN_TOKEN))
+    
+    def handle_debug_memory(self, query):
+        """Admin-only breakdown of memory held by datasets, indexes and caches"""
+        if not self.is_admin_request():
+            self.send_error(403, "Admin token required")
+            return
+        try:
+            limit = int((query.get('top') or ['15'])[0])
+            
+            finder = _client_finder
+            history = _calculation_history
+            rss = memory_monitor.process_rss_bytes()
+            report = {
+                'process': {
+                    'rss_bytes': rss,
+                    'gc_counts': list(gc.get_count())
+                },
+                'budget': MEMORY_BUDGET.status(),
+                'finder': finder.memory_report() if finder is not None else None,
+                'caches': {
+                    'calculation_history': {'bytes': history.memory_bytes()} if history is not None else None
+                },
+                'tracemalloc': memory_monitor.tracemalloc_top(limit),
+                'timestamp': datetime.now().isoformat()
+            }
+            self.send_json(200, report)
+            
+        except ValueError:
+            self.send_error(400, "Invalid top parameter")
+        except Exception as e:
+            logger.error(f"Error handling memory debug request: {e}")
+            self.send_error(500, f"Internal server error: {str(e)}")
+    
     def handle_spreadsheet_info(self):
         """Handle spreadsheet info request"""
         try:
@@ -186,51 +718,63 @@ class ACSCalculatorHandler(BaseHTTPRequestHandler):
             logger.error(f"Error handling spreadsheet info request: {e}")
             self.send_error(500, f"Internal server error: {str(e)}")
     
+    def send_not_modified_if_current(self, etag):
+        """Answer a conditional request with 304 if the client already has this version"""
+        if_none_match = self.headers.get('If-None-Match', '')
+        if etag not in [tag.strip() for tag in if_none_match.split(',')] and if_none_match.strip() != '*':
+            return False
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
+        self.end_headers()
+        return True
+    
+    def send_versioned_json(self, response, etag, indent=None):
+        """Send a JSON response tagged with a data version so browsers can revalidate it"""
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
+        self.end_headers()
+        self.wfile.write(json.dumps(response, indent=indent).encode('utf-8'))
+    
+    def with_complexity(self, clients):
+        """Client records as sent to the frontend"""
+        return [{**client, 'complexity_level': self.get_complexity_level(client['acs_score'])} for client in clients]
+    
     def handle_get_all_clients(self):
         """Handle request to get all clients with ACS data"""
         try:
             # Initialize client finder if not already done
-            if not hasattr(self, 'client_finder') or self.client_finder is None:
-                try:
-                    from client_reference_finder import ClientReferenceFinder
-                    self.client_finder = ClientReferenceFinder(job_data_file="2025-08-29 3_39pm.csv")
-                    logger.info("Client Reference Finder initialized successfully")
-                except Exception as e:
-                    logger.error(f"Error initializing Client Reference Finder: {e}")
-                    self.send_error(500, "Failed to initialize client finder")
-                    return
+            self.client_finder = self.get_client_finder()
+            if self.client_finder is None:
+                self.send_error(500, "Failed to initialize client finder")
+                return
             
             # Get all clients from the ACS data (not just from combined data)
-            if self.client_finder.acs_data is not None and not self.client_finder.acs_data.empty:
-                clients_data = []
-                
-                # Get all clients directly from ACS data DataFrame
-                for _, row in self.client_finder.acs_data.iterrows():
-                    clients_data.append({
-                        'client_name': row['CLIENT_NAME'],
-                        'acs_score': int(row['ACS_SCORE']),
-                        'complexity_level': self.get_complexity_level(int(row['ACS_SCORE']))
-                    })
-                
-                # Sort by client name
-                clients_data.sort(key=lambda x: x['client_name'])
-                
-                logger.info(f"Retrieved {len(clients_data)} client records")
+            client_versions = self.client_finder.client_versions
+            version, clients = client_versions.snapshot()
+            if clients:
+                etag = version_etag(version)
+                if self.send_not_modified_if_current(etag):
+                    return
                 
-                # Send response
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
+                clients_data = self.with_complexity(clients)
+                logger.info("Retrieved %d client records (version %s)", len(clients_data), version)
                 
                 response = {
                     'success': True,
                     'clients': clients_data,
                     'total_count': len(clients_data),
+                    'version': version,
                     'timestamp': datetime.now().isoformat()
                 }
                 
-                self.wfile.write(json.dumps(response, indent=2).encode('utf-8'))
+                self.send_versioned_json(response, etag, indent=2)
                 
             else:
                 self.send_error(500, "No client data available")
@@ -239,6 +783,368 @@ class ACSCalculatorHandler(BaseHTTPRequestHandler):
             logger.error(f"Error handling get all clients request: {e}")
             self.send_error(500, f"Internal server error: {str(e)}")
     
+    def handle_client_changes(self, query):
+        """Handle delta sync of the client list since a previously seen data version"""
+        try:
+            since = (query.get('since') or [''])[0].strip()
+            if not since.lstrip('-').isdigit():
+                self.send_error(400, "Missing or invalid parameter: since (a data version)")
+                return
+            
+            client_finder = self.get_client_finder()
+            if client_finder is None:
+                self.send_error(500, "Failed to initialize client finder")
+                return
+            
+            changes = client_finder.client_versions.changes_since(int(since))
+            etag = version_etag(changes['version'])
+            if self.send_not_modified_if_current(etag):
+                return
+            
+            for key in ('clients', 'added', 'changed'):
+                if key in changes:
+                    changes[key] = self.with_complexity(changes[key])
+            
+            response = {
+                'success': True,
+                **changes,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            self.send_versioned_json(response, etag)
+            
+        except Exception as e:
+            logger.error(f"Error handling client changes request: {e}")
+            self.send_error(500, f"Internal server error: {str(e)}")
+    
+    def handle_client_summary(self, query):
+        """Handle request for a single client's precomputed summary"""
+        try:
+            client_name = (query.get('client') or [''])[0].strip()
+            if not client_name:
+                self.send_error(400, "Missing required parameter: client")
+                return
+            
+            client_finder = self.get_client_finder()
+            if client_finder is None:
+                self.send_error(500, "Failed to initialize client finder")
+                return
+            
+            summary = client_finder.get_client_summary(client_name)
+            if not summary:
+                self.send_error(404, f"No job data for client: {client_name}")
+                return
+            
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            
+            response = {
+                'success': True,
+                'summary': summary,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            self.wfile.write(json.dumps(response).encode('utf-8'))
+            
+        except Exception as e:
+            logger.error(f"Error handling client summary request: {e}")
+            self.send_error(500, f"Internal server error: {str(e)}")
+    
+    def handle_client_name_matches(self, query):
+        """Handle report of how job-data client names were joined to the ACS registry"""
+        try:
+            limit = (query.get('limit') or ['100'])[0]
+            if not limit.isdigit():
+                self.send_error(400, "Invalid parameter: limit (a non-negative integer)")
+                return
+            
+            client_finder = self.get_client_finder()
+            if client_finder is None:
+                self.send_error(500, "Failed to initialize client finder")
+                return
+            
+            response = {
+                'success': True,
+                **client_finder.client_name_report(int(limit)),
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            
+            self.wfile.write(json.dumps(response).encode('utf-8'))
+            
+        except Exception as e:
+            logger.error(f"Error handling client name match request: {e}")
+            self.send_error(500, f"Internal server error: {str(e)}")
+    
+    def handle_calculations(self, query):
+        """Handle paginated calculation history request, served from the local mirror"""
+        try:
+            def param(name):
+                return (query.get(name) or [None])[0]
+            
+            history = get_calculation_history()
+            if history is None:
+                self.send_error(503, "Google Sheets not available")
+                return
+            synced = history.maybe_sync()
+            
+            result = history.query(
+                client=param('client'),
+                ats=param('ats'),
+                date_from=param('from'),
+                date_to=param('to'),
+                page=int(param('page') or 1),
+                page_size=int(param('page_size') or 50)
+            )
+            
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            
+            response = {
+                'success': True,
+                **result,
+                # Sheets didn't answer in time (or failed); these rows come from the local mirror only
+                'degraded': not synced,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            self.wfile.write(json.dumps(response).encode('utf-8'))
+            
+        except ValueError:
+            self.send_error(400, "Invalid page, page_size or date (use YYYY-MM-DD)")
+        except Exception as e:
+            logger.error(f"Error handling calculations request: {e}")
+            self.send_error(500, f"Internal server error: {str(e)}")
+    
+    def handle_ats_stats(self, query):
+        """Handle per-ATS (or per-client) complexity aggregates of stored calculations"""
+        try:
+            def param(name):
+                return (query.get(name) or [None])[0]
+            
+            history = get_calculation_history()
+            if history is None:
+                self.send_error(503, "Google Sheets not available")
+                return
+            synced = history.maybe_sync()
+            
+            result = history.ats_stats(
+                group_by=param('group_by') or 'ats',
+                name=param('name'),
+                min_count=int(param('min_count') or 1),
+                sort=param('sort') or 'count',
+                limit=int(param('limit') or 50)
+            )
+            
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            
+            response = {
+                'success': True,
+                **result,
+                'degraded': not synced,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            self.wfile.write(json.dumps(response).encode('utf-8'))
+            
+        except ValueError as e:
+            self.send_error(400, f"Invalid parameter: {e}")
+        except Exception as e:
+            logger.error(f"Error handling ATS stats request: {e}")
+            self.send_error(500, f"Internal server error: {str(e)}")
+    
+    def handle_calculations_what_if(self):
+        """Re-score every stored calculation under alternative weights and thresholds"""
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            if content_length == 0:
+                self.send_error(400, "No data provided")
+                return
+            request_data = json.loads(self.rfile.read(content_length).decode('utf-8'))
+            
+            from acs_rescoring import CURRENT_SCHEME, DEFAULT_MAX_CLIENTS, ScoringScheme, parse_schemes, what_if
+            schemes = parse_schemes(request_data.get('schemes'))
+            baseline = request_data.get('baseline')
+            baseline = ScoringScheme.from_dict(baseline, 'baseline') if isinstance(baseline, dict) else CURRENT_SCHEME
+            max_clients = int(request_data.get('max_clients', DEFAULT_MAX_CLIENTS))
+            
+            history = get_calculation_history()
+            if history is None:
+                self.send_error(503, "Google Sheets not available")
+                return
+            synced = history.maybe_sync()
+            
+            with profiling.phase('rescore'):
+                result = what_if(history.calculation_factors(), schemes, baseline, max_clients)
+            result['degraded'] = not synced
+            
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            
+            response = {
+                'success': True,
+                **result,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            self.wfile.write(json.dumps(response).encode('utf-8'))
+            
+        except (ValueError, TypeError) as e:
+            self.send_error(400, f"Invalid what-if request: {e}")
+        except Exception as e:
+            logger.error(f"Error handling what-if request: {e}")
+            self.send_error(500, f"Internal server error: {str(e)}")
+    
+    def handle_stats(self, query):
+        """Handle slice/dice query over the ACS x category x country cube"""
+        try:
+            filters = {dimension: query[dimension] for dimension in ('acs', 'category', 'country') if dimension in query}
+            group_by = [d.strip() for value in query.get('group_by', []) for d in value.split(',') if d.strip()]
+            limit = int(query['limit'][0]) if 'limit' in query else None
+            
+            client_finder = self.get_client_finder()
+            if client_finder is None:
+                self.send_error(500, "Failed to initialize client finder")
+                return
+            
+            try:
+                result = client_finder.analytics_cube.query(filters, group_by, limit)
+            except ValueError as e:
+                self.send_error(400, str(e))
+                return
+            
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            
+            response = {
+                'success': True,
+                'filters': filters,
+                'group_by': group_by,
+                **result,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            self.wfile.write(json.dumps(response).encode('utf-8'))
+            
+        except ValueError:
+            self.send_error(400, "Invalid limit parameter")
+        except Exception as e:
+            logger.error(f"Error handling stats request: {e}")
+            self.send_error(500, f"Internal server error: {str(e)}")
+    
+    def start_chunked_response(self, content_type, filename=None):
+        """Send headers for a streamed response using chunked transfer encoding"""
+        # Chunked encoding needs an HTTP/1.1 status line; HTTP/1.0 clients get a close-delimited body
+        self.use_chunked = self.request_version == 'HTTP/1.1'
+        if self.use_chunked:
+            self.protocol_version = 'HTTP/1.1'
+        self.close_connection = True
+        
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Cache-Control', 'no-store')
+        if filename:
+            self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        if self.use_chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+    
+    def write_chunk(self, data):
+        """Write one piece of a streamed response body"""
+        if not data:
+            return
+        if self.use_chunked:
+            self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+        else:
+            self.wfile.write(data)
+    
+    def end_chunked_response(self):
+        """Terminate a streamed response"""
+        if self.use_chunked:
+            self.wfile.write(b"0\r\n\r\n")
+    
+    def handle_export(self, kind, query):
+        """Stream job rows or clients as NDJSON or CSV in bounded-size batches"""
+        try:
+            export_format = (query.get('format') or ['ndjson'])[0].lower()
+            if export_format not in ('ndjson', 'csv'):
+                self.send_error(400, "format must be ndjson or csv")
+                return
+            columns = [c.strip() for value in query.get('columns', []) for c in value.split(',') if c.strip()]
+            acs_scores = [int(value) for value in query.get('acs', [])]
+            
+            client_finder = self.get_client_finder()
+            if client_finder is None:
+                self.send_error(500, "Failed to initialize client finder")
+                return
+            
+            if kind == 'jobs':
+                batches = client_finder.iter_job_batches(
+                    columns=columns or None,
+                    clients=query.get('client'),
+                    categories=query.get('category'),
+                    acs_scores=acs_scores or None
+                )
+            else:
+                batches = client_finder.iter_client_batches(columns=columns or None, acs_scores=acs_scores or None)
+            
+            # Pull the first batch before sending headers so bad parameters still get a 400
+            first_batch = next(batches, None)
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        except Exception as e:
+            logger.error(f"Error preparing {kind} export: {e}")
+            self.send_error(500, f"Internal server error: {str(e)}")
+            return
+        
+        content_type = 'application/x-ndjson' if export_format == 'ndjson' else 'text/csv; charset=utf-8'
+        self.start_chunked_response(content_type, f"{kind}.{export_format}")
+        rows = 0
+        try:
+            batch = first_batch
+            header = True
+            while batch is not None:
+                if export_format == 'ndjson':
+                    text = batch.to_json(orient='records', lines=True, force_ascii=False)
+                    if text and not text.endswith('\n'):
+                        text += '\n'
+                else:
+                    text = batch.to_csv(index=False, header=header)
+                    header = False
+                self.write_chunk(text.encode('utf-8'))
+                rows += len(batch)
+                batch = next(batches, None)
+            if first_batch is None and export_format == 'csv':
+                # Empty result: still send the header row
+                from client_reference_finder import JOB_EXPORT_COLUMNS, CLIENT_EXPORT_COLUMNS
+                columns = columns or (JOB_EXPORT_COLUMNS if kind == 'jobs' else CLIENT_EXPORT_COLUMNS)
+                self.write_chunk((','.join(columns) + '\n').encode('utf-8'))
+            self.end_chunked_response()
+            logger.info("Exported %d %s rows as %s", rows, kind, export_format)
+        except (BrokenPipeError, ConnectionResetError):
+            logger.warning(f"Client disconnected during {kind} export after {rows} rows")
+        except Exception as e:
+            # Headers are already sent; closing without the terminating chunk signals a failed transfer
+            logger.error(f"Error streaming {kind} export after {rows} rows: {e}")
+    
     def get_complexity_level(self, score):
         """Get complexity level description for ACS score"""
         levels = {
@@ -264,19 +1170,27 @@ class ACSCalculatorHandler(BaseHTTPRequestHandler):
             post_data = self.rfile.read(content_length)
             acs_data = json.loads(post_data.decode('utf-8'))
             
-            logger.info(f"Received ACS calculation data: {acs_data}")
+            # Full payloads only at DEBUG; formatted lazily, off the request thread
+            logger.debug("Received ACS calculation data: %s", acs_data)
             
             # Store in Google Sheets
             backend = self.get_backend()
             if backend:
                 result = backend.store_acs_calculation(acs_data)
+                if result.get('success'):
+                    history = get_calculation_history()
+                    if history is not None:
+                        history.record_stored(result.get('row_number'), result.get('row_data'), result.get('worksheet'))
             else:
                 result = {'error': 'Google Sheets not available', 'row_number': None}
             
-            # Send response
-            self.send_response(200)
+            # Send response; a Sheets timeout gets a fast 503 the client can retry
+            timed_out = result.get('timed_out', False)
+            self.send_response(503 if timed_out else 200)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
+            if timed_out:
+                self.send_header('Retry-After', str(DEGRADED_RETRY_AFTER_SECONDS))
             self.end_headers()
             
             response = {
@@ -285,6 +1199,8 @@ class ACSCalculatorHandler(BaseHTTPRequestHandler):
                 'row_number': result.get('row_number'),
                 'timestamp': datetime.now().isoformat()
             }
+            if timed_out:
+                response.update(degraded=True, outcome_unknown=result.get('outcome_unknown', False))
             
             self.wfile.write(json.dumps(response).encode())
             
@@ -312,56 +1228,86 @@ class ACSCalculatorHandler(BaseHTTPRequestHandler):
             # Extract parameters
             target_acs = request_data.get('target_acs')
             target_category = request_data.get('target_category')
+            target_title = request_data.get('target_title')
             target_country = request_data.get('target_country')
             max_results = request_data.get('max_results', 10)
+            # Related-category fallback is opt-in; only a JSON true or "true" turns it on (bool("false") is True)
+            include_related = request_data.get('include_related', False)
+            include_related = include_related is True or (
+                isinstance(include_related, str) and include_related.strip().lower() == 'true')
             
-            if not target_acs or not target_category:
-                self.send_error(400, "Missing required parameters: target_acs and target_category")
+            if not target_acs or not (target_category or target_title):
+                self.send_error(400, "Missing required parameters: target_acs and target_category (or target_title)")
                 return
             
-            logger.info(f"Finding similar clients: ACS={target_acs}, Category={target_category}, Country={target_country}")
+            logger.info("Finding similar clients: ACS=%s, Category=%s, Title=%s, Country=%s",
+                        target_acs, target_category, target_title, target_country)
             
             # Initialize client finder if not already done
-            if not hasattr(self, 'client_finder') or self.client_finder is None:
-                try:
-                    from client_reference_finder import ClientReferenceFinder
-                    self.client_finder = ClientReferenceFinder(job_data_file="2025-08-29 3_39pm.csv")
-                    logger.info("Client Reference Finder initialized successfully")
-                except Exception as e:
-                    logger.error(f"Error initializing Client Reference Finder: {e}")
-                    self.send_error(500, "Failed to initialize client finder")
-                    return
-            
-            # Find similar clients
-            similar_clients = self.client_finder.find_similar_clients(
-                target_acs=target_acs,
-                target_category=target_category,
-                target_country=target_country,
-                max_results=max_results
-            )
+            self.client_finder = self.get_client_finder()
+            if self.client_finder is None:
+                self.send_error(500, "Failed to initialize client finder")
+                return
             
-            logger.info(f"Found {len(similar_clients)} similar clients")
+            # Find similar clients; an exact category wins over a free-text title
+            predicted_categories = None
+            if target_category:
+                similar_clients = self.client_finder.find_similar_clients(
+                    target_acs=target_acs,
+                    target_category=target_category,
+                    target_country=target_country,
+                    max_results=max_results,
+                    include_related=include_related
+                )
+            else:
+                match = self.client_finder.find_similar_clients_for_title(
+                    target_acs=target_acs,
+                    target_title=target_title,
+                    target_country=target_country,
+                    max_results=max_results,
+                    include_related=include_related
+                )
+                similar_clients = match['clients']
+                target_category = match['matching_category']
+                predicted_categories = match['predicted_categories']
             
-            # Send response
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-            self.end_headers()
+            exact_matches = sum(1 for client in similar_clients if client.get('match_type') == 'exact')
+            logger.info("Found %d similar clients (%d exact)", len(similar_clients), exact_matches)
             
             response_data = {
                 'success': True,
                 'clients': similar_clients,
                 'total_found': len(similar_clients),
+                'exact_matches': exact_matches,
+                'related_matches': len(similar_clients) - exact_matches,
                 'search_params': {
                     'target_acs': target_acs,
                     'target_category': target_category,
-                    'max_results': max_results
+                    'max_results': max_results,
+                    'include_related': include_related
                 }
             }
+            if predicted_categories is not None:
+                response_data['search_params']['target_title'] = target_title
+                response_data['predicted_categories'] = predicted_categories
             
-            self.wfile.write(json.dumps(response_data, indent=2).encode('utf-8'))
+            with profiling.phase('serialize'):
+                body = json.dumps(response_data, indent=2).encode('utf-8')
+            
+            # Send response
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.send_header('Access-Control-Expose-Headers', 'Server-Timing')
+            self.send_header('Server-Timing', self.phase_timer.server_timing_header())
+            self.end_headers()
+            
+            # The write phase happens after the headers are sent, so it is reported in /metrics only
+            with profiling.phase('write'):
+                self.wfile.write(body)
             
         except json.JSONDecodeError:
             self.send_error(400, "Invalid JSON in request body")
@@ -371,29 +1317,44 @@ class ACSCalculatorHandler(BaseHTTPRequestHandler):
     
     def log_message(self, format, *args):
         """Custom logging for requests"""
-        logger.info(f"{self.address_string()} - {format % args}")
+        logger.info('%s - ' + format, self.address_string(), *args)
 
 def run_server(port=None):
     """Run the ACS Calculator server"""
+    global _server
+    structured_logging.configure_logging()
     if port is None:
         port = int(os.getenv('PORT', 8000))
     server_address = ('0.0.0.0', port)
-    httpd = HTTPServer(server_address, ACSCalculatorHandler)
+    # Threaded so health checks and static files are served while data loads
+    memory_monitor.start_tracemalloc_from_env()
+    httpd = _server = ACSHTTPServer(server_address, ACSCalculatorHandler, reuse_port=REUSE_PORT)
+    record_startup_milestone('listening')
+    
+    def handle_signal(signum, frame):
+        # shutdown() blocks until serve_forever returns, so it can't run on this (the serving) thread
+        threading.Thread(target=begin_shutdown, args=(httpd, signal.Signals(signum).name),
+                         name='acs-shutdown', daemon=True).start()
+    
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    start_warmup()
+    MEMORY_BUDGET.start()
     
     print(f"🚀 ACS Calculator Server starting on port {port}")
     print(f"📊 Frontend: http://localhost:{port}/acs_calculator.html")
     print(f"🔧 Backend API: http://localhost:{port}/")
     print(f"📋 Status: http://localhost:{port}/status")
+    print(f"💓 Liveness: http://localhost:{port}/healthz | Readiness: http://localhost:{port}/ready")
+    print(f"📉 Metrics: http://localhost:{port}/metrics")
     print(f"📈 Spreadsheet Info: http://localhost:{port}/spreadsheet-info")
     print(f"💾 Store Calculation: POST http://localhost:{port}/store-calculation")
     print(f"🔍 Find Similar Clients: POST http://localhost:{port}/find-similar-clients")
     print("\nPress Ctrl+C to stop the server")
     
-    try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\n🛑 Server stopped by user")
-        httpd.server_close()
+    httpd.serve_forever()
+    finish_shutdown(httpd)
+    print("\n🛑 Server stopped")
 
 if __name__ == "__main__":
     run_server()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Admission Control for ACS Calculator
+Per-route concurrency limits with a bounded FIFO wait queue; excess requests are shed instead of piling up
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import deadlines
+from metrics import REGISTRY
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Expensive routes: (requests running at once, requests allowed to wait). Unlisted routes are never limited,
+# so static files, /status and the health probes stay fast however busy the heavy routes are.
+DEFAULT_ROUTE_LIMITS: Dict[str, Tuple[int, int]] = {
+    '/find-similar-clients': (4, 8),
+    '/get-all-clients': (2, 8),
+    '/calculations': (4, 8),
+    '/calculations/what-if': (1, 2),
+    '/export/jobs': (2, 2),
+    '/export/clients': (2, 2)
+}
+# Longest a request waits in the queue (also capped by its deadline) before it is shed
+DEFAULT_MAX_WAIT_SECONDS = 2.0
+
+ADMISSION_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    'acs_admission_queue_wait_seconds', 'Time admitted requests waited for a slot on a limited route', ['route'],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0))
+ADMISSION_QUEUE_DEPTH = REGISTRY.gauge(
+    'acs_admission_queue_depth', 'Requests waiting for a slot on a limited route', ['route'])
+ADMISSION_SHED = REGISTRY.counter(
+    'acs_admission_shed_total', 'Requests rejected by admission control', ['route', 'reason'])
+
+
+def parse_route_limits(spec: str) -> Dict[str, Tuple[int, int]]:
+    """Parse "route=concurrency:queue,..." (e.g. "/find-similar-clients=8:16"); concurrency 0 lifts the limit"""
+    limits = {}
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        route, _, value = item.partition('=')
+        concurrency, _, queue = value.partition(':')
+        limits[route.strip()] = (int(concurrency), int(queue or 0))
+    return limits
+
+
+class RouteLimiter:
+    """At most max_concurrent requests run; up to max_queue more wait their turn in arrival order"""
+
+    def __init__(self, route: str, max_concurrent: int, max_queue: int):
+        self.route = route
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiting = deque()
+        self._condition = threading.Condition()
+        # Statistics for /status
+        self.admitted = 0
+        self.queued = 0
+        self.shed = {'queue_full': 0, 'timeout': 0}
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def acquire(self, timeout: float) -> Optional[str]:
+        """Take a slot, waiting up to timeout; returns None when admitted, else why the request was shed"""
+        with self._condition:
+            if self.active < self.max_concurrent and not self._waiting:
+                self.active += 1
+                self.admitted += 1
+                ADMISSION_QUEUE_WAIT_SECONDS.observe(0, route=self.route)
+                return None
+            if len(self._waiting) >= self.max_queue:
+                return self._shed('queue_full')
+
+            ticket = object()
+            self._waiting.append(ticket)
+            self.queued += 1
+            ADMISSION_QUEUE_DEPTH.set(len(self._waiting), route=self.route)
+            start = time.monotonic()
+            try:
+                while self._waiting[0] is not ticket or self.active >= self.max_concurrent:
+                    left = start + timeout - time.monotonic()
+                    if left <= 0:
+                        self._waiting.remove(ticket)
+                        return self._shed('timeout')
+                    self._condition.wait(left)
+                self._waiting.popleft()
+                self.active += 1
+                self.admitted += 1
+            finally:
+                ADMISSION_QUEUE_DEPTH.set(len(self._waiting), route=self.route)
+                # The new head of the queue may be able to go now
+                self._condition.notify_all()
+
+            waited = time.monotonic() - start
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            ADMISSION_QUEUE_WAIT_SECONDS.observe(waited, route=self.route)
+            return None
+
+    def _shed(self, reason: str) -> str:
+        self.shed[reason] += 1
+        ADMISSION_SHED.inc(route=self.route, reason=reason)
+        return reason
+
+    def release(self) -> None:
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def status(self) -> Dict:
+        with self._condition:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'active': self.active,
+                'waiting': len(self._waiting),
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'shed': dict(self.shed),
+                'mean_queue_wait_ms': round(self.wait_seconds_total / self.admitted * 1000, 1)
+                if self.admitted else 0.0,
+                'max_queue_wait_ms': round(self.wait_seconds_max * 1000, 1)
+            }
+
+
+class AdmissionController:
+    """Routes requests through their route's limiter; routes without a limit pass straight through"""
+
+    def __init__(self, limits: Dict[str, Tuple[int, int]], max_wait: float = DEFAULT_MAX_WAIT_SECONDS):
+        self.max_wait = max_wait
+        self.limiters = {
+            route: RouteLimiter(route, concurrency, max(0, queue))
+            for route, (concurrency, queue) in limits.items() if concurrency > 0
+        }
+
+    @classmethod
+    def from_env(cls) -> 'AdmissionController':
+        """Limits from DEFAULT_ROUTE_LIMITS overridden by ACS_ADMISSION_LIMITS, wait from ACS_ADMISSION_MAX_WAIT_SECONDS"""
+        limits = dict(DEFAULT_ROUTE_LIMITS)
+        spec = os.getenv('ACS_ADMISSION_LIMITS', '')
+        try:
+            limits.update(parse_route_limits(spec))
+        except ValueError:
+            logger.warning(f"Ignoring invalid ACS_ADMISSION_LIMITS: {spec!r}")
+        return cls(limits, float(os.getenv('ACS_ADMISSION_MAX_WAIT_SECONDS', DEFAULT_MAX_WAIT_SECONDS)))
+
+    @contextmanager
+    def admit(self, route: str):
+        """Yield None if the request may run (holding a slot until the block exits), else the shed reason"""
+        limiter = self.limiters.get(route)
+        if limiter is None:
+            yield None
+            return
+        timeout = self.max_wait
+        left = deadlines.remaining()
+        if left is not None:
+            timeout = min(timeout, left)
+        reason = limiter.acquire(timeout)
+        if reason is not None:
+            yield reason
+            return
+        try:
+            yield None
+        finally:
+            limiter.release()
+
+    def status(self) -> Dict:
+        return {
+            'max_wait_seconds': self.max_wait,
+            'routes': {route: limiter.status() for route, limiter in self.limiters.items()}
+        }
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+ACS Analytics Cube
+Precomputed job and client counts over (ACS, category, country) with rollups
+"""
+
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+DIMENSIONS = ('acs', 'category', 'country')
+
+# Clients without a country mapping, as in ClientReferenceFinder.load_country_data
+DEFAULT_COUNTRY = 'United States'
+
+
+class AnalyticsCube:
+    """
+    OLAP-style cube of job and distinct-client counts
+
+    Cells exist for every grouping set of the three dimensions (None means "all"),
+    so slices and dice are answered from the cube without row-level data. Each cell
+    keeps its clients as a bitset, which keeps distinct client counts exact when
+    cells are merged. Jobs carry no country of their own, so a client's jobs are
+    counted in every country that client hires in; cells that roll up over all
+    countries count each job once.
+    """
+
+    def __init__(self):
+        # mask (which dimensions are specific) -> {(acs, category, country): [jobs, client_bits]}
+        self.cells: Dict[Tuple[bool, ...], Dict[Tuple, List[int]]] = {}
+
+    @classmethod
+    def build(cls, combined_data: pd.DataFrame, country_data: Optional[pd.DataFrame] = None) -> 'AnalyticsCube':
+        """Aggregate combined job/ACS data (or job aggregates with a JOB_COUNT column) into the cube"""
+        cube = cls()
+        if combined_data is None or combined_data.empty:
+            return cube
+
+        group_columns = ['CLIENT_NAME', 'ACS_SCORE', 'DETAIL_NORMALISED_CATEGORY']
+        if 'NORMALISED_COUNTRY' in combined_data.columns:
+            group_columns.append('NORMALISED_COUNTRY')
+        # One row per (client, acs, category[, country]) before any expansion
+        groups = combined_data.groupby(group_columns, sort=False)
+        if 'JOB_COUNT' in combined_data.columns:
+            base = groups['JOB_COUNT'].sum().reset_index()
+        else:
+            base = groups.size().rename('JOB_COUNT').reset_index()
+
+        client_ids, _ = pd.factorize(base['CLIENT_NAME'])
+        base = base.assign(CLIENT_ID=client_ids)
+        if 'NORMALISED_COUNTRY' in base.columns:
+            by_country = base
+        elif country_data is not None and not country_data.empty:
+            # One copy of each row per country the client hires in; only country-specific cells read these
+            countries = country_data[['CLIENT_NAME', 'NORMALISED_COUNTRY']].drop_duplicates()
+            by_country = base.merge(countries, on='CLIENT_NAME', how='left')
+        else:
+            by_country = base.assign(NORMALISED_COUNTRY=None)
+        by_country = by_country.assign(NORMALISED_COUNTRY=by_country['NORMALISED_COUNTRY'].fillna(DEFAULT_COUNTRY))
+
+        masks = list(product((True, False), repeat=len(DIMENSIONS)))
+        cube.cells = {mask: {} for mask in masks}
+        country_index = DIMENSIONS.index('country')
+        # Rollups over all countries come from the unexpanded rows, so each job is counted once
+        cube._add_rows(by_country, [mask for mask in masks if mask[country_index]], with_country=True)
+        cube._add_rows(base, [mask for mask in masks if not mask[country_index]], with_country=False)
+        return cube
+
+    def _add_rows(self, frame: pd.DataFrame, masks: List[Tuple[bool, ...]], with_country: bool) -> None:
+        countries = frame['NORMALISED_COUNTRY'] if with_country else [None] * len(frame)
+        rows = zip(frame['ACS_SCORE'].astype(int), frame['DETAIL_NORMALISED_CATEGORY'], countries,
+                   frame['JOB_COUNT'], frame['CLIENT_ID'])
+        for acs, category, country, jobs, client_id in rows:
+            values = (int(acs), category, country)
+            client_bit = 1 << int(client_id)
+            for mask in masks:
+                key = tuple(value if specific else None for value, specific in zip(values, mask))
+                cell = self.cells[mask].get(key)
+                if cell is None:
+                    self.cells[mask][key] = [int(jobs), client_bit]
+                else:
+                    cell[0] += int(jobs)
+                    cell[1] |= client_bit
+
+    @property
+    def total_cells(self) -> int:
+        return sum(len(cells) for cells in self.cells.values())
+
+    def values(self, dimension: str) -> List:
+        """Distinct values of one dimension"""
+        index = DIMENSIONS.index(dimension)
+        mask = tuple(i == index for i in range(len(DIMENSIONS)))
+        return sorted(key[index] for key in self.cells.get(mask, {}))
+
+    def query(self, filters: Optional[Dict[str, Iterable]] = None, group_by: Iterable[str] = (),
+              limit: Optional[int] = None) -> Dict:
+        """
+        Answer a slice/dice query
+
+        filters maps dimension -> allowed values (one value slices, several dice);
+        group_by lists dimensions to break the result down by.
+        """
+        filters = {dim: {self._coerce(dim, v) for v in values} for dim, values in (filters or {}).items() if values}
+        group_by = list(dict.fromkeys(group_by))
+        unknown = [dim for dim in list(filters) + group_by if dim not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimension(s): {', '.join(unknown)}; expected {', '.join(DIMENSIONS)}")
+
+        # Read the rollup level where exactly the filtered and grouped dimensions are specific
+        mask = tuple(dim in filters or dim in group_by for dim in DIMENSIONS)
+        groups: Dict[Tuple, List[int]] = {}
+        total = [0, 0]
+        for key, (jobs, client_bits) in self.cells.get(mask, {}).items():
+            if any(dim in filters and value not in filters[dim] for dim, value in zip(DIMENSIONS, key)):
+                continue
+            group_key = tuple(value for dim, value in zip(DIMENSIONS, key) if dim in group_by)
+            group = groups.setdefault(group_key, [0, 0])
+            group[0] += jobs
+            group[1] |= client_bits
+            total[0] += jobs
+            total[1] |= client_bits
+
+        results = []
+        for group_key, (jobs, client_bits) in groups.items():
+            row = dict(zip(group_by, group_key))
+            row['job_count'] = jobs
+            row['client_count'] = client_bits.bit_count()
+            results.append(row)
+        results.sort(key=lambda row: row['job_count'], reverse=True)
+
+        return {
+            'total': {'job_count': total[0], 'client_count': total[1].bit_count()},
+            'cells': results[:limit] if limit else results,
+            'cell_count': len(results)
+        }
+
+    @staticmethod
+    def _coerce(dim: str, value):
+        if dim == 'acs':
+            return int(value)
+        return value
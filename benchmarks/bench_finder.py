@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Client Reference Finder Benchmarks
+Times and measures peak memory of finder operations on synthetic data at scale
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from client_reference_finder import ClientReferenceFinder
+from synthetic_data import generate_job_data
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+# Query operations are cheap, so they are repeated and reported per call
+QUERY_REPEATS = 20
+
+
+def measure(func: Callable, track_memory: bool) -> Dict[str, float]:
+    """Run func once, returning wall time and (optionally) peak traced memory"""
+    gc.collect()
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        func()
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = 0
+        if track_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return {'seconds': elapsed, 'peak_mb': round(peak / (1024 * 1024), 3) if track_memory else None}
+
+
+def bench_size(rows: int, data_dir: str, track_memory: bool) -> List[Dict]:
+    """Benchmark every finder operation at one data size"""
+    path = os.path.join(data_dir, f'synthetic_{rows}.csv')
+    if not os.path.exists(path):
+        print(f"📝 Generating {rows} rows...")
+        generate_job_data(path, rows)
+
+    finder = ClientReferenceFinder()
+    results = []
+
+    def record(operation: str, func: Callable, calls: int = 1):
+        # Time without tracemalloc (it slows allocation-heavy code), then measure memory separately
+        timing = measure(func, track_memory=False)
+        memory = measure(func, track_memory=True) if track_memory else {'peak_mb': None}
+        result = {
+            'operation': operation,
+            'rows': rows,
+            'calls': calls,
+            'seconds': round(timing['seconds'] / calls, 6),
+            'peak_mb': memory['peak_mb']
+        }
+        results.append(result)
+        peak = f"{result['peak_mb']:.1f} MB" if result['peak_mb'] is not None else 'n/a'
+        print(f"  {operation:<22} {result['seconds'] * 1000:>10.2f} ms/call   peak {peak}")
+
+    record('load_job_data', lambda: finder.load_job_data(path))
+    record('combine_data', finder.combine_data)
+
+    combined = finder.combined_data
+    if combined is None or combined.empty:
+        print("  ⚠️  No combined data; skipping query benchmarks")
+        return results
+
+    # Query the most common category/ACS pairs and clients, as real traffic does
+    pairs = (combined.groupby(['DETAIL_NORMALISED_CATEGORY', 'ACS_SCORE']).size()
+             .sort_values(ascending=False).head(QUERY_REPEATS).index.tolist())
+    clients = combined['CLIENT_NAME'].value_counts().head(QUERY_REPEATS).index.tolist()
+
+    def run_find():
+        for category, acs in pairs:
+            finder.find_similar_clients(target_acs=int(acs), target_category=category)
+
+    def run_summary():
+        for client in clients:
+            finder.get_client_summary(client)
+
+    def run_search():
+        for client in clients:
+            finder.search_clients(client.split()[0])
+
+    record('find_similar_clients', run_find, calls=len(pairs))
+    record('get_client_summary', run_summary, calls=len(clients))
+    record('search_clients', run_search, calls=len(clients))
+    return results
+
+
+def compare_to_baseline(results: List[Dict], baseline: Dict, threshold: float) -> List[str]:
+    """Return a description of every result that regressed beyond the threshold"""
+    reference = {(r['operation'], r['rows']): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        base = reference.get((result['operation'], result['rows']))
+        if base is None:
+            continue
+        for field in ('seconds', 'peak_mb'):
+            current, previous = result.get(field), base.get(field)
+            if current is None or not previous:
+                continue
+            if current > previous * (1 + threshold):
+                regressions.append(
+                    f"{result['operation']} @ {result['rows']} rows: {field} {previous} -> {current} "
+                    f"(+{(current / previous - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    """Run the benchmark suite from the command line"""
+    parser = argparse.ArgumentParser(description="Benchmark the Client Reference Finder on synthetic data")
+    parser.add_argument('--rows', default=','.join(str(n) for n in DEFAULT_SIZES),
+                        help="Comma-separated data sizes, e.g. 10000,100000,10000000")
+    parser.add_argument('--data-dir', default=None, help="Where synthetic CSVs are cached (default: temp dir)")
+    parser.add_argument('--output', default='bench_results.json', help="Machine-readable results file")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline results to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Write these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc peak-memory pass")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    sizes = [int(n) for n in args.rows.split(',') if n.strip()]
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='acs_bench_')
+    os.makedirs(data_dir, exist_ok=True)
+
+    print("🚀 Client Reference Finder Benchmarks")
+    print("=" * 50)
+    results = []
+    for rows in sizes:
+        print(f"\n📊 {rows:,} rows")
+        results.extend(bench_size(rows, data_dir, track_memory=not args.no_memory))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform()
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📌 Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️  No baseline found; run with --save-baseline to create one")
+        return
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print("\n❌ Regressions against baseline:")
+        for line in regressions:
+            print(f"  • {line}")
+        sys.exit(1)
+    print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
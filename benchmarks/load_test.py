@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+ACS Server Load Test
+Replays a weighted request mix against acs_server at fixed concurrency and
+reports p50/p95/p99 latency and throughput per route
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+DEFAULT_MIX = os.path.join(BENCH_DIR, 'request_mix.jsonl')
+
+
+def load_mix(path: str) -> List[Dict]:
+    """
+    Load a recorded request mix (one JSON object per line)
+
+    Each entry has method, path, optional body (JSON object) and optional weight.
+    """
+    entries = []
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            entry = json.loads(line)
+            if 'path' not in entry:
+                raise ValueError(f"{path}:{line_number}: request entry needs a 'path'")
+            entry.setdefault('method', 'POST' if 'body' in entry else 'GET')
+            entry.setdefault('weight', 1)
+            entries.append(entry)
+    if not entries:
+        raise ValueError(f"{path} contains no requests")
+    return entries
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+class LoadStats:
+    """Thread-safe collection of request outcomes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def record(self, route: str, status: str, seconds: float) -> None:
+        with self._lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            route_statuses = self.statuses.setdefault(route, {})
+            route_statuses[status] = route_statuses.get(status, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict:
+        def describe(values: List[float], statuses: Dict[str, int]) -> Dict:
+            values = sorted(values)
+            errors = sum(count for status, count in statuses.items() if not status.startswith(('2', '3')))
+            return {
+                'requests': len(values),
+                'errors': errors,
+                'throughput_rps': round(len(values) / elapsed, 2) if elapsed else 0,
+                'p50_ms': round(percentile(values, 50) * 1000, 2) if values else None,
+                'p95_ms': round(percentile(values, 95) * 1000, 2) if values else None,
+                'p99_ms': round(percentile(values, 99) * 1000, 2) if values else None,
+                'max_ms': round(values[-1] * 1000, 2) if values else None,
+                'statuses': dict(sorted(statuses.items()))
+            }
+
+        with self._lock:
+            routes = {route: describe(values, self.statuses[route]) for route, values in self.latencies.items()}
+            all_values = [v for values in self.latencies.values() for v in values]
+            all_statuses: Dict[str, int] = {}
+            for statuses in self.statuses.values():
+                for status, count in statuses.items():
+                    all_statuses[status] = all_statuses.get(status, 0) + count
+        return {'overall': describe(all_values, all_statuses), 'routes': dict(sorted(routes.items()))}
+
+
+def send_request(host: str, port: int, entry: Dict, timeout: float) -> str:
+    """Send one request and return its status code (or error class name)"""
+    body = None
+    headers = {}
+    if entry.get('body') is not None:
+        body = json.dumps(entry['body']).encode('utf-8')
+        headers['Content-Type'] = 'application/json'
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request(entry['method'], entry['path'], body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return str(response.status)
+    except (OSError, http.client.HTTPException) as e:
+        return type(e).__name__
+    finally:
+        connection.close()
+
+
+def run_load(base_url: str, mix: List[Dict], concurrency: int, duration: float,
+             total_requests: Optional[int], replay: bool, timeout: float) -> Dict:
+    """Drive the server with the request mix and return a summary"""
+    parsed = urlparse(base_url)
+    host, port = parsed.hostname or 'localhost', parsed.port or 80
+    stats = LoadStats()
+    weights = [entry['weight'] for entry in mix]
+    counter_lock = threading.Lock()
+    issued = [0]
+    deadline = time.perf_counter() + duration
+
+    def next_entry() -> Optional[Dict]:
+        with counter_lock:
+            if total_requests is not None and issued[0] >= total_requests:
+                return None
+            index = issued[0]
+            issued[0] += 1
+        if total_requests is None and time.perf_counter() >= deadline:
+            return None
+        # Replay keeps the recorded order; otherwise sample by weight
+        return mix[index % len(mix)] if replay else random.choices(mix, weights=weights)[0]
+
+    def worker():
+        while True:
+            entry = next_entry()
+            if entry is None:
+                return
+            start = time.perf_counter()
+            status = send_request(host, port, entry, timeout)
+            stats.record(f"{entry['method']} {entry['path']}", status, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - start
+
+    summary = stats.summary(elapsed)
+    summary['elapsed_seconds'] = round(elapsed, 3)
+    return summary
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def spawn_server(args) -> (subprocess.Popen, str):
+    """Start acs_server with the fake Sheets backend and wait until it answers"""
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        'PORT': str(port),
+        'ACS_FAKE_SHEETS': '1',
+        'ACS_FAKE_SHEETS_LATENCY_MS': str(args.sheets_latency_ms),
+        'ACS_FAKE_SHEETS_JITTER_MS': str(args.sheets_jitter_ms),
+        'ACS_FAKE_SHEETS_FAILURE_RATE': str(args.sheets_failure_rate)
+    })
+    if args.sheets_quota_per_minute is not None:
+        env['ACS_SHEETS_QUOTA_PER_MINUTE'] = str(args.sheets_quota_per_minute)
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, 'acs_server.py')],
+        cwd=args.server_cwd or REPO_ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + args.startup_timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"acs_server exited with code {process.returncode}")
+        if send_request('127.0.0.1', port, {'method': 'GET', 'path': '/status'}, 1.0) == '200':
+            return process, base_url
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("acs_server did not become ready in time")
+
+
+def print_summary(summary: Dict) -> None:
+    """Print a human-readable latency table"""
+    def fmt(value):
+        return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+
+    print(f"{'route':<38} {'reqs':>6} {'err':>5} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print('-' * 90)
+    rows = list(summary['routes'].items()) + [('OVERALL', summary['overall'])]
+    for route, data in rows:
+        print(f"{route[:38]:<38} {data['requests']:>6} {data['errors']:>5} {data['throughput_rps']:>8.1f} "
+              f"{fmt(data['p50_ms'])} {fmt(data['p95_ms'])} {fmt(data['p99_ms'])}")
+
+
+def main():
+    """Run a load test from the command line"""
+    parser = argparse.ArgumentParser(description="Load test acs_server with a recorded request mix")
+    parser.add_argument('--url', default=None, help="Server to test; omit to spawn a local server with fake Sheets")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="JSONL request mix to replay")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds to run (ignored with --requests)")
+    parser.add_argument('--requests', type=int, default=None, help="Stop after this many requests")
+    parser.add_argument('--replay', action='store_true', help="Replay the mix in recorded order instead of by weight")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument('--output', default=None, help="Write the JSON summary to this file")
+    parser.add_argument('--sheets-latency-ms', type=float, default=150.0, help="Fake Sheets call latency")
+    parser.add_argument('--sheets-jitter-ms', type=float, default=50.0, help="Fake Sheets latency jitter (+/-)")
+    parser.add_argument('--sheets-failure-rate', type=float, default=0.0, help="Fraction of fake Sheets calls that fail")
+    parser.add_argument('--sheets-quota-per-minute', type=float, default=None,
+                        help="Sheets scheduler quota for the spawned server (default: server's own default)")
+    parser.add_argument('--server-cwd', default=None, help="Working directory for the spawned server (job data location)")
+    parser.add_argument('--startup-timeout', type=float, default=120.0)
+    args = parser.parse_args()
+
+    mix = load_mix(args.mix)
+    process = None
+    base_url = args.url
+    if base_url is None:
+        print("🚀 Spawning acs_server with fake Google Sheets backend...")
+        process, base_url = spawn_server(args)
+
+    try:
+        print(f"📈 {base_url} | concurrency {args.concurrency} | "
+              f"{f'{args.requests} requests' if args.requests else f'{args.duration:.0f}s'}")
+        summary = run_load(base_url, mix, args.concurrency, args.duration, args.requests, args.replay, args.timeout)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    summary['config'] = {
+        'timestamp': datetime.now().isoformat(),
+        'url': base_url,
+        'mix': args.mix,
+        'concurrency': args.concurrency,
+        'replay': args.replay,
+        'fake_sheets': process is not None,
+        'sheets_latency_ms': args.sheets_latency_ms if process is not None else None,
+        'sheets_failure_rate': args.sheets_failure_rate if process is not None else None
+    }
+    print_summary(summary)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n💾 Summary written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
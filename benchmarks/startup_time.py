@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+ACS Server Startup Timing
+Restarts acs_server and measures time to first byte for liveness, readiness and
+the first data-dependent request
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from load_test import REPO_ROOT, _free_port, send_request
+
+FIRST_DATA_REQUEST = {
+    'method': 'POST',
+    'path': '/find-similar-clients',
+    'body': {'target_acs': 5, 'target_category': 'Registered Nurses', 'max_results': 10}
+}
+
+
+def wait_for(port, entry, expected, deadline):
+    """Poll until the request returns the expected status; return seconds waited or None"""
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        if send_request('127.0.0.1', port, entry, 5.0) == expected:
+            return round(time.perf_counter() - start, 3)
+        time.sleep(0.02)
+    return None
+
+
+def measure_startup(server_cwd, timeout, fake_sheets):
+    """Start a fresh server process and time each milestone from spawn"""
+    import subprocess
+
+    port = _free_port()
+    env = dict(os.environ, PORT=str(port))
+    if fake_sheets:
+        env['ACS_FAKE_SHEETS'] = '1'
+    spawned = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.join(REPO_ROOT, 'acs_server.py')],
+                               cwd=server_cwd or REPO_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = spawned + timeout
+    try:
+        healthz = wait_for(port, {'method': 'GET', 'path': '/healthz'}, '200', deadline)
+        ready = wait_for(port, {'method': 'GET', 'path': '/ready'}, '200', deadline)
+        request_start = time.perf_counter()
+        status = send_request('127.0.0.1', port, FIRST_DATA_REQUEST, timeout)
+        first_data = round(time.perf_counter() - request_start, 3)
+        return {
+            'healthz_seconds': healthz,
+            'ready_seconds': round(healthz + ready, 3) if healthz is not None and ready is not None else None,
+            'first_data_request_seconds': first_data,
+            'first_data_request_status': status,
+            'total_seconds': round(time.perf_counter() - spawned, 3)
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main():
+    """Measure startup time over several restarts"""
+    parser = argparse.ArgumentParser(description="Measure acs_server time to first byte after restart")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=180.0)
+    parser.add_argument('--server-cwd', default=None, help="Working directory for the server (job data location)")
+    parser.add_argument('--real-sheets', action='store_true', help="Use the configured Google Sheets instead of the fake")
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    runs = []
+    for run in range(1, args.runs + 1):
+        result = measure_startup(args.server_cwd, args.timeout, fake_sheets=not args.real_sheets)
+        runs.append(result)
+        print(f"Run {run}: healthz {result['healthz_seconds']}s | ready {result['ready_seconds']}s | "
+              f"first /find-similar-clients {result['first_data_request_seconds']}s "
+              f"({result['first_data_request_status']})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'runs': runs}, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
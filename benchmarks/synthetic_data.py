@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Synthetic Job Data Generator
+Writes job postings CSVs matching the real export schema at arbitrary scale
+"""
+
+import argparse
+import os
+import sys
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Same column order as the Snowflake export
+COLUMNS = ['CLIENT_NAME', 'JOB_TITLE', 'DETAIL_NORMALISED_CATEGORY']
+
+TITLE_PREFIXES = ['', '', '', 'Senior ', 'Junior ', 'Lead ', 'Part Time ', 'Temporary ']
+TITLE_SUFFIXES = ['', '', '', ' - Remote', ' - Dallas, TX', ' - London', ' (m/w/d)', ' - Night Shift', ' II']
+
+# Rows are written in chunks so 10M-row files never need to fit in memory at once
+CHUNK_ROWS = 500_000
+
+
+def load_categories(path: str = None) -> List[str]:
+    """Load the job categories used by the frontend"""
+    path = path or os.path.join(REPO_ROOT, 'job_categories.txt')
+    with open(path, 'r') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def load_client_names(unknown_clients: int = 200) -> List[str]:
+    """Client names from the ACS registry plus some without an ACS score"""
+    from client_reference_finder import ClientReferenceFinder
+
+    finder = ClientReferenceFinder()
+    names = finder.acs_data['CLIENT_NAME'].tolist()
+    # Real exports contain many clients that are not in the ACS registry
+    names.extend(f"Synthetic Client {i}" for i in range(unknown_clients))
+    return names
+
+
+def _zipf_weights(n: int, exponent: float = 1.1) -> np.ndarray:
+    """Skewed popularity: a few clients/categories account for most postings"""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def generate_chunk(rng: np.random.Generator, rows: int, clients: List[str], categories: List[str]) -> pd.DataFrame:
+    """Generate one chunk of synthetic job postings"""
+    client_idx = rng.choice(len(clients), size=rows, p=_zipf_weights(len(clients)))
+    category_idx = rng.choice(len(categories), size=rows, p=_zipf_weights(len(categories), 0.9))
+    prefix_idx = rng.integers(0, len(TITLE_PREFIXES), size=rows)
+    suffix_idx = rng.integers(0, len(TITLE_SUFFIXES), size=rows)
+
+    category_values = np.asarray(categories, dtype=object)[category_idx]
+    # Titles derive from the category so title/category pairs look realistic
+    titles = (np.asarray(TITLE_PREFIXES, dtype=object)[prefix_idx]
+              + category_values
+              + np.asarray(TITLE_SUFFIXES, dtype=object)[suffix_idx])
+
+    return pd.DataFrame({
+        'CLIENT_NAME': np.asarray(clients, dtype=object)[client_idx],
+        'JOB_TITLE': titles,
+        'DETAIL_NORMALISED_CATEGORY': category_values
+    }, columns=COLUMNS)
+
+
+def generate_job_data(path: str, rows: int, seed: int = 42) -> str:
+    """Write a synthetic job data CSV with the given number of rows"""
+    rng = np.random.default_rng(seed)
+    clients = load_client_names()
+    categories = load_categories()
+
+    written = 0
+    with open(path, 'w', newline='') as f:
+        while written < rows:
+            chunk_rows = min(CHUNK_ROWS, rows - written)
+            chunk = generate_chunk(rng, chunk_rows, clients, categories)
+            chunk.to_csv(f, header=(written == 0), index=False)
+            written += chunk_rows
+    return path
+
+
+def main():
+    """Generate a synthetic job data file from the command line"""
+    parser = argparse.ArgumentParser(description="Generate synthetic job data for benchmarks")
+    parser.add_argument('--rows', type=int, default=10_000, help="Number of job postings")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='synthetic_jobs.csv')
+    args = parser.parse_args()
+
+    generate_job_data(args.output, args.rows, args.seed)
+    print(f"✅ Wrote {args.rows} synthetic job postings to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
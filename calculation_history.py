@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Calculation History for ACS Calculator
+Local mirror of the ACS_Calculations worksheet, synced incrementally from Google Sheets
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from calculation_stats import CalculationStats
+from google_sheets_backend import CALCULATION_FIELDS, partition_overlaps, partition_sort_key
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIRROR_PATH = os.path.join('data', 'calculations_mirror.jsonl')
+DEFAULT_SYNC_INTERVAL = 60.0
+MAX_PAGE_SIZE = 500
+
+
+def row_to_record(row_number: int, values: List[str], worksheet: Optional[str] = None) -> Dict[str, Any]:
+    """Turn a worksheet row into a calculation record keyed like the store payload"""
+    values = list(values) + [''] * (len(CALCULATION_FIELDS) - len(values))
+    record = dict(zip(CALCULATION_FIELDS, values))
+    record['rowNumber'] = row_number
+    record['worksheet'] = worksheet
+    return record
+
+
+class CalculationHistory:
+    """
+    Serves past calculations from a local JSONL mirror of the calculation worksheets
+
+    The mirror tracks each partition worksheet separately. Only rows below the last
+    mirrored row are fetched from Sheets, using ranged batch reads, and sealed
+    partitions that are fully mirrored are never read again, so a sync costs one
+    or two API calls once the mirror is warm.
+    """
+
+    def __init__(self, backend, mirror_path: str = None, sync_interval: float = None):
+        self.backend = backend
+        self.mirror_path = mirror_path or os.getenv('ACS_HISTORY_MIRROR', DEFAULT_MIRROR_PATH)
+        self.sync_interval = sync_interval if sync_interval is not None else float(
+            os.getenv('ACS_HISTORY_SYNC_SECONDS', DEFAULT_SYNC_INTERVAL))
+        # Per partition worksheet: mirrored records, last mirrored row (row 1 holds the headers) and period
+        self.records: Dict[str, List[Dict[str, Any]]] = {}
+        self.last_rows: Dict[str, int] = {}
+        self.periods: Dict[str, Optional[str]] = {}
+        self.last_synced: Optional[float] = None
+        # Records dropped under memory pressure are reloaded from the mirror file on next query
+        self._records_shed = False
+        # Factor arrays for what-if re-scoring, with the records snapshot they were built from
+        self._factors = None
+        self._factors_source = None
+        # Per-ATS / per-client aggregates; small, so kept even when records are shed
+        self.stats = CalculationStats()
+        self._source = self._source_id()
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.load_mirror()
+
+    def _source_id(self) -> Optional[str]:
+        """Identify the spreadsheet being mirrored so a config change resets the mirror"""
+        if self.backend is None:
+            return None
+        return f"{self.backend.spreadsheet_id}/{self.backend.sheet_name}"
+
+    def _default_worksheet(self) -> Optional[str]:
+        # Mirror lines written before partitioning belong to the single worksheet
+        return self.backend.sheet_name if self.backend is not None else None
+
+    def load_mirror(self) -> None:
+        """Load previously mirrored rows from disk"""
+        if not os.path.exists(self.mirror_path):
+            return
+        try:
+            rows: Dict[str, Dict[int, List[str]]] = {}
+            periods: Dict[str, Optional[str]] = {}
+            with open(self.mirror_path, 'r') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry.get('source') != self._source:
+                        logger.info("Calculation mirror belongs to a different spreadsheet; starting fresh")
+                        rows, periods = {}, {}
+                        break
+                    worksheet = entry.get('worksheet', self._default_worksheet())
+                    periods.setdefault(worksheet, entry.get('period'))
+                    # A worksheet mirrored again from row 2 rewrites its rows; the latest line wins
+                    rows.setdefault(worksheet, {})[entry['row']] = entry['values']
+            records = {
+                worksheet: [row_to_record(row, values, worksheet) for row, values in sorted(by_row.items()) if any(values)]
+                for worksheet, by_row in rows.items()
+            }
+            last_rows = {worksheet: max(by_row) for worksheet, by_row in rows.items()}
+            with self._lock:
+                self.records, self.last_rows, self.periods = records, last_rows, periods
+            self.stats.reset(records)
+            logger.info(f"Loaded {sum(len(r) for r in records.values())} calculations from mirror "
+                        f"({len(records)} worksheets)")
+        except Exception as e:
+            logger.error(f"Error loading calculation mirror, starting fresh: {e}")
+            with self._lock:
+                self.records, self.last_rows, self.periods = {}, {}, {}
+            self.stats.reset({})
+
+    def _append_to_mirror(self, worksheet: str, first_row: int, rows: List[List[str]]) -> None:
+        directory = os.path.dirname(self.mirror_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        period = self.periods.get(worksheet)
+        with open(self.mirror_path, 'a') as f:
+            for offset, values in enumerate(rows):
+                f.write(json.dumps({'source': self._source, 'worksheet': worksheet, 'period': period,
+                                    'row': first_row + offset, 'values': values}) + '\n')
+
+    def sync(self) -> int:
+        """Fetch rows added since the last sync; returns the number of new rows"""
+        with self._sync_lock:
+            return self._sync()
+
+    def _sync(self) -> int:
+        if self.backend is None or not self.backend.worksheet:
+            return 0
+        new_rows = 0
+        for partition in self.backend.list_partitions():
+            worksheet = partition['worksheet']
+            with self._lock:
+                self.periods[worksheet] = partition['period']
+            after_row = self.last_rows.get(worksheet, 1)
+            # Sealed partitions never grow; skip them once fully mirrored
+            if partition['rows'] is not None and after_row >= partition['rows']:
+                continue
+            rows = self.backend.read_rows_after(after_row, worksheet)
+            self._extend(worksheet, after_row + 1, rows)
+            new_rows += len(rows)
+        self.last_synced = time.time()
+        if new_rows:
+            logger.info(f"Synced {new_rows} new calculation rows")
+        return new_rows
+
+    def _is_fresh(self) -> bool:
+        return self.last_synced is not None and time.time() - self.last_synced < self.sync_interval
+
+    def maybe_sync(self) -> bool:
+        """
+        Sync if the mirror is older than the sync interval; False if a due sync failed (serve stale data)
+
+        Single flight: while one request syncs, others serve the mirror instead of
+        queueing up to repeat the same Sheets reads.
+        """
+        if self._is_fresh():
+            return True
+        if not self._sync_lock.acquire(blocking=False):
+            return True
+        try:
+            # Another request may have finished a sync between the check above and taking the lock
+            if not self._is_fresh():
+                self._sync()
+            return True
+        except TimeoutError as e:
+            logger.warning(f"Calculation history sync timed out, serving mirror: {e}")
+        except Exception as e:
+            logger.warning(f"Calculation history sync failed, serving mirror: {e}")
+        finally:
+            self._sync_lock.release()
+        return False
+
+    def record_stored(self, row_number: Optional[int], values: List[Any], worksheet: Optional[str] = None) -> None:
+        """
+        Add a just-stored row without reading it back, if it directly follows the mirror
+
+        Never waits for a running sync (which may be a full sheet read): the row is
+        left to that sync or the next delta sync, which read everything after the
+        last mirrored row anyway.
+        """
+        if not row_number:
+            return
+        worksheet = worksheet or self._default_worksheet()
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            if worksheet not in self.periods and self.backend is not None:
+                with self._lock:
+                    self.periods[worksheet] = self.backend.current_period
+            if row_number == self.last_rows.get(worksheet, 1) + 1:
+                self._extend(worksheet, row_number, [['' if v is None else str(v) for v in values]])
+        finally:
+            self._sync_lock.release()
+
+    def _extend(self, worksheet: str, first_row: int, rows: List[List[str]]) -> None:
+        if not rows:
+            return
+        self._append_to_mirror(worksheet, first_row, rows)
+        new_records = [
+            row_to_record(first_row + offset, values, worksheet) for offset, values in enumerate(rows) if any(values)
+        ]
+        with self._lock:
+            if not self._records_shed:
+                records = [] if first_row == 2 else self.records.get(worksheet, [])
+                # Copy on write so readers iterating a snapshot never see a partial update
+                self.records = {**self.records, worksheet: records + new_records}
+            self.last_rows[worksheet] = first_row + len(rows) - 1
+        # A worksheet mirrored again from row 2 replaces what was counted for it
+        self.stats.add(worksheet, new_records, replace=first_row == 2)
+
+    def shed_records(self) -> bool:
+        """Drop in-memory records under memory pressure; the mirror file keeps them"""
+        with self._sync_lock, self._lock:
+            if self._records_shed:
+                return False
+            self.records = {}
+            self._factors = self._factors_source = None
+            self._records_shed = True
+            return True
+
+    def _ensure_records(self) -> None:
+        if not self._records_shed:
+            return
+        with self._sync_lock:
+            if self._records_shed:
+                self.load_mirror()
+                self._records_shed = False
+
+    def calculation_factors(self):
+        """Factor columns of every mirrored calculation, rebuilt only when records change"""
+        from acs_rescoring import CalculationFactors
+        self._ensure_records()
+        with self._lock:
+            records = self.records
+            if self._factors is not None and self._factors_source is records:
+                return self._factors
+        # Records are replaced (never mutated) on update, so identity marks the snapshot
+        factors = CalculationFactors(record for worksheet_records in records.values() for record in worksheet_records)
+        with self._lock:
+            self._factors, self._factors_source = factors, records
+        return factors
+
+    def ats_stats(self, group_by: str = 'ats', name: str = None, min_count: int = 1, sort: str = 'count',
+                  limit: int = 50) -> Dict[str, Any]:
+        """Per-ATS or per-client aggregates of every mirrored calculation, from memory"""
+        result = self.stats.query(group_by=group_by, name=name, min_count=min_count, sort=sort, limit=limit)
+        result['last_synced'] = datetime.fromtimestamp(self.last_synced).isoformat() if self.last_synced else None
+        return result
+
+    def memory_bytes(self) -> int:
+        """Deep size of the in-memory records"""
+        from memory_monitor import deep_sizeof
+        return deep_sizeof(self.records)
+
+    def query(self, client: str = None, ats: str = None, date_from: str = None, date_to: str = None,
+              page: int = 1, page_size: int = 50) -> Dict[str, Any]:
+        """Filter mirrored calculations (newest first) and return one page"""
+        page = max(1, page)
+        page_size = max(1, min(MAX_PAGE_SIZE, page_size))
+        client = client.casefold() if client else None
+        ats = ats.casefold() if ats else None
+        for value in (date_from, date_to):
+            if value:
+                datetime.strptime(value, '%Y-%m-%d')  # ValueError for bad dates
+
+        self._ensure_records()
+        with self._lock:
+            records = self.records
+            periods = dict(self.periods)
+
+        # Only partitions whose period overlaps the date range are scanned, newest first
+        worksheets = sorted(
+            (worksheet for worksheet in records if partition_overlaps(periods.get(worksheet), date_from, date_to)),
+            key=lambda worksheet: partition_sort_key(periods.get(worksheet)), reverse=True
+        )
+
+        matches = []
+        for worksheet in worksheets:
+            for record in reversed(records[worksheet]):
+                if client and client not in str(record['clientName']).casefold():
+                    continue
+                if ats and ats not in str(record['atsName']).casefold():
+                    continue
+                day = str(record['timestamp'])[:10]
+                if date_from and day < date_from:
+                    continue
+                if date_to and day > date_to:
+                    continue
+                matches.append(record)
+
+        start = (page - 1) * page_size
+        return {
+            'calculations': matches[start:start + page_size],
+            'page': page,
+            'page_size': page_size,
+            'total': len(matches),
+            'synced_through': dict(self.last_rows),
+            'last_synced': datetime.fromtimestamp(self.last_synced).isoformat() if self.last_synced else None
+        }
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Calculation Statistics
+Per-ATS and per-client aggregates of stored calculations, maintained incrementally as rows arrive
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+FACTOR_FIELDS = ('pageScore', 'timeScore', 'documentScore')
+PERCENTILES = (50, 90)
+GROUP_FIELDS = {'ats': 'atsName', 'client': 'clientName'}
+SORT_KEYS = ('count', 'mean_acs', 'name')
+UNKNOWN_GROUP = '(none)'
+
+
+def _level(value) -> Optional[int]:
+    """Integer level (ACS and factor scores are 1-5) of a stored value, or None if blank/invalid"""
+    try:
+        return int(round(float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+def _percentile(counts: Dict[int, int], total: int, percentile: float) -> Optional[int]:
+    """Nearest-rank percentile of a level histogram"""
+    if not total:
+        return None
+    rank = max(1, -(-total * percentile // 100))
+    seen = 0
+    for level in sorted(counts):
+        seen += counts[level]
+        if seen >= rank:
+            return level
+    return None
+
+
+class GroupStats:
+    """Running aggregates of one group of calculations; level histograms make percentiles exact"""
+
+    __slots__ = ('name', 'count', 'acs_counts', 'adjusted_sum', 'adjusted_count', 'login_required', 'factor_counts',
+                 'first_seen', 'last_seen')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.acs_counts: Dict[int, int] = {}
+        self.adjusted_sum = 0.0
+        self.adjusted_count = 0
+        self.login_required = 0
+        self.factor_counts: Dict[str, Dict[int, int]] = {field: {} for field in FACTOR_FIELDS}
+        self.first_seen: Optional[str] = None
+        self.last_seen: Optional[str] = None
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.count += 1
+        acs = _level(record.get('acsScore'))
+        if acs is not None:
+            self.acs_counts[acs] = self.acs_counts.get(acs, 0) + 1
+        try:
+            self.adjusted_sum += float(record.get('adjustedScore'))
+            self.adjusted_count += 1
+        except (TypeError, ValueError):
+            pass
+        if str(record.get('loginRequired', '')).strip().lower() == 'true':
+            self.login_required += 1
+        for field in FACTOR_FIELDS:
+            level = _level(record.get(field))
+            if level is not None:
+                self.factor_counts[field][level] = self.factor_counts[field].get(level, 0) + 1
+        timestamp = str(record.get('timestamp') or '')
+        if timestamp:
+            self.first_seen = min(self.first_seen or timestamp, timestamp)
+            self.last_seen = max(self.last_seen or timestamp, timestamp)
+
+    def merge(self, other: 'GroupStats') -> None:
+        self.count += other.count
+        for level, count in other.acs_counts.items():
+            self.acs_counts[level] = self.acs_counts.get(level, 0) + count
+        self.adjusted_sum += other.adjusted_sum
+        self.adjusted_count += other.adjusted_count
+        self.login_required += other.login_required
+        for field in FACTOR_FIELDS:
+            counts = self.factor_counts[field]
+            for level, count in other.factor_counts[field].items():
+                counts[level] = counts.get(level, 0) + count
+        for timestamp in (other.first_seen, other.last_seen):
+            if timestamp:
+                self.first_seen = min(self.first_seen or timestamp, timestamp)
+                self.last_seen = max(self.last_seen or timestamp, timestamp)
+
+    @property
+    def mean_acs(self) -> Optional[float]:
+        scored = sum(self.acs_counts.values())
+        return sum(level * count for level, count in self.acs_counts.items()) / scored if scored else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        scored = sum(self.acs_counts.values())
+        mean_acs = self.mean_acs
+        return {
+            'name': self.name,
+            'count': self.count,
+            'mean_acs': round(mean_acs, 3) if mean_acs is not None else None,
+            **{f"p{percentile}_acs": _percentile(self.acs_counts, scored, percentile) for percentile in PERCENTILES},
+            'acs_distribution': {str(level): count for level, count in sorted(self.acs_counts.items())},
+            'mean_adjusted_score': round(self.adjusted_sum / self.adjusted_count, 3) if self.adjusted_count else None,
+            'login_required_share': round(self.login_required / self.count, 3) if self.count else None,
+            'factor_distributions': {
+                field: {str(level): count for level, count in sorted(counts.items())}
+                for field, counts in self.factor_counts.items()
+            },
+            'first_seen': self.first_seen,
+            'last_seen': self.last_seen
+        }
+
+
+class CalculationStats:
+    """
+    Per-ATS and per-client aggregates, kept separately for each partition worksheet
+
+    Rows are folded in as they are mirrored, so queries never rescan records. A
+    worksheet mirrored again from its first row is reset on its own, and queries
+    merge the (few) worksheets' groups.
+    """
+
+    def __init__(self):
+        # worksheet -> group_by -> casefolded name -> GroupStats
+        self._groups: Dict[str, Dict[str, Dict[str, GroupStats]]] = {}
+        self._lock = threading.Lock()
+
+    def reset(self, records_by_worksheet: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Rebuild from scratch, e.g. after loading the mirror"""
+        groups = {}
+        for worksheet, records in records_by_worksheet.items():
+            groups[worksheet] = self._fold({field: {} for field in GROUP_FIELDS}, records)
+        with self._lock:
+            self._groups = groups
+
+    def add(self, worksheet: str, records: Iterable[Dict[str, Any]], replace: bool = False) -> None:
+        """Fold new rows of one worksheet in; replace=True drops what was counted for it before"""
+        with self._lock:
+            if replace or worksheet not in self._groups:
+                self._groups[worksheet] = {field: {} for field in GROUP_FIELDS}
+            self._fold(self._groups[worksheet], records)
+
+    @staticmethod
+    def _fold(groups: Dict[str, Dict[str, GroupStats]], records: Iterable[Dict[str, Any]]):
+        for record in records:
+            for group_by, field in GROUP_FIELDS.items():
+                name = str(record.get(field) or '').strip() or UNKNOWN_GROUP
+                key = name.casefold()
+                stats = groups[group_by].get(key)
+                if stats is None:
+                    stats = groups[group_by][key] = GroupStats(name)
+                stats.add(record)
+        return groups
+
+    def query(self, group_by: str = 'ats', name: str = None, min_count: int = 1, sort: str = 'count',
+              limit: int = 50) -> Dict[str, Any]:
+        """Merged groups (filtered by name substring and size, sorted) plus overall totals"""
+        if group_by not in GROUP_FIELDS:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_FIELDS)}")
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        name = name.casefold() if name else None
+
+        merged: Dict[str, GroupStats] = {}
+        overall = GroupStats('all')
+        with self._lock:
+            for groups in self._groups.values():
+                for key, stats in groups[group_by].items():
+                    overall.merge(stats)
+                    if name and name not in key:
+                        continue
+                    if key not in merged:
+                        merged[key] = GroupStats(stats.name)
+                    merged[key].merge(stats)
+
+        selected = [stats for stats in merged.values() if stats.count >= min_count]
+        if sort == 'name':
+            selected.sort(key=lambda stats: stats.name.casefold())
+        elif sort == 'mean_acs':
+            selected.sort(key=lambda stats: (-(stats.mean_acs or 0), -stats.count))
+        else:
+            selected.sort(key=lambda stats: (-stats.count, stats.name.casefold()))
+        return {
+            'group_by': group_by,
+            'total_groups': len(selected),
+            'groups': [stats.to_dict() for stats in selected[:limit]],
+            'overall': overall.to_dict()
+        }
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Job Category Co-occurrence Graph
+Links job categories that the same clients post in, for related-category fallback
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Neighbours kept per category
+DEFAULT_MAX_NEIGHBOURS = 10
+# Categories must share at least this many clients to be linked
+MIN_SHARED_CLIENTS = 2
+
+
+class CategoryGraph:
+    """
+    Compact weighted adjacency of job categories
+
+    Two categories are linked when several clients post in both; the weight is the
+    cosine similarity of their client sets. Only the strongest neighbours of each
+    category are kept, in CSR form (offsets into flat neighbour/weight arrays).
+    """
+
+    def __init__(self):
+        self.categories: List[str] = []
+        self.category_ids: Dict[str, int] = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.neighbours = np.zeros(0, dtype=np.int32)
+        self.weights = np.zeros(0, dtype=np.float32)
+        self.shared_clients = np.zeros(0, dtype=np.int32)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.neighbours)
+
+    @classmethod
+    def build(cls, aggregates: Optional[pd.DataFrame], max_neighbours: int = DEFAULT_MAX_NEIGHBOURS,
+              min_shared_clients: int = MIN_SHARED_CLIENTS) -> 'CategoryGraph':
+        """Build the graph from job rows or job aggregates (CLIENT_NAME, DETAIL_NORMALISED_CATEGORY)"""
+        graph = cls()
+        if aggregates is None or aggregates.empty:
+            return graph
+
+        pairs = aggregates[['CLIENT_NAME', 'DETAIL_NORMALISED_CATEGORY']].drop_duplicates()
+        client_codes, _ = pd.factorize(pairs['CLIENT_NAME'])
+        category_codes, categories = pd.factorize(pairs['DETAIL_NORMALISED_CATEGORY'])
+        graph.categories = categories.tolist()
+        graph.category_ids = {category: index for index, category in enumerate(graph.categories)}
+        n_categories = len(graph.categories)
+
+        # Clients x categories incidence; its Gram matrix counts clients shared by each category pair
+        incidence = np.zeros((client_codes.max() + 1, n_categories), dtype=np.float32)
+        incidence[client_codes, category_codes] = 1.0
+        shared = incidence.T @ incidence
+        clients_per_category = np.diag(shared).copy()
+        np.fill_diagonal(shared, 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            similarity = shared / np.sqrt(np.outer(clients_per_category, clients_per_category))
+        similarity[shared < min_shared_clients] = 0
+
+        offsets = [0]
+        neighbours, weights, shared_counts = [], [], []
+        for category in range(n_categories):
+            row = similarity[category]
+            linked = np.flatnonzero(row > 0)
+            if len(linked) > max_neighbours:
+                linked = linked[np.argpartition(-row[linked], max_neighbours - 1)[:max_neighbours]]
+            linked = linked[np.argsort(-row[linked], kind='stable')]
+            neighbours.append(linked.astype(np.int32))
+            weights.append(row[linked].astype(np.float32))
+            shared_counts.append(shared[category, linked].astype(np.int32))
+            offsets.append(offsets[-1] + len(linked))
+
+        graph.offsets = np.array(offsets, dtype=np.int64)
+        graph.neighbours = np.concatenate(neighbours) if neighbours else graph.neighbours
+        graph.weights = np.concatenate(weights) if weights else graph.weights
+        graph.shared_clients = np.concatenate(shared_counts) if shared_counts else graph.shared_clients
+        return graph
+
+    def related(self, category: str, limit: Optional[int] = None) -> List[Dict]:
+        """Categories most related to `category`, strongest first"""
+        index = self.category_ids.get(category)
+        if index is None:
+            return []
+        start, end = self.offsets[index], self.offsets[index + 1]
+        if limit is not None:
+            end = min(end, start + limit)
+        return [
+            {
+                'category': self.categories[self.neighbours[edge]],
+                'relatedness': round(float(self.weights[edge]), 4),
+                'shared_clients': int(self.shared_clients[edge])
+            }
+            for edge in range(start, end)
+        ]
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Client Name Matching
+Joins job-data client names to ACS registry names through canonical keys and a blocked fuzzy match
+"""
+
+import re
+import threading
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+# Similarity a fuzzy candidate needs to be accepted
+FUZZY_MATCH_THRESHOLD = 0.9
+# Candidates with different ACS scores this close to the best make a name ambiguous
+AMBIGUITY_MARGIN = 0.05
+# Best candidate shown for unmatched names when at least this similar
+SUGGESTION_THRESHOLD = 0.75
+# Blocking keys (tokens, token prefixes) shared by more than this share of registry names are not indexed
+MAX_BLOCK_SHARE = 0.05
+BLOCK_PREFIX = 4
+
+# Feed/campaign suffixes that don't change the client: "Uber exchange", "Lionstep AG 1"
+_NOISE_TOKENS = {'exchange', 'and'}
+_SEPARATORS = re.compile(r'[\s\-–—_/&+.,:;|()\'"]+')
+
+
+def normalize_client_name(name) -> str:
+    """Canonical key for a client name: case, punctuation, exchange suffixes and trailing numbers removed"""
+    if not isinstance(name, str):
+        return ''
+    key = unicodedata.normalize('NFKC', name).casefold()
+    tokens = [token for token in _SEPARATORS.split(key) if token and token not in _NOISE_TOKENS]
+    while len(tokens) > 1 and tokens[-1].isdigit():
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def _blocking_keys(key: str) -> Set[str]:
+    keys = set()
+    for token in key.split():
+        keys.add('t:' + token)
+        if len(token) > BLOCK_PREFIX:
+            keys.add('p:' + token[:BLOCK_PREFIX])
+    return keys
+
+
+class ClientMatch:
+    """Outcome of matching one job-data client name against the registry"""
+
+    __slots__ = ('name', 'status', 'method', 'client_name', 'acs_score', 'similarity', 'candidates')
+
+    def __init__(self, name: str, status: str, method: Optional[str] = None, client_name: Optional[str] = None,
+                 acs_score=None, similarity: Optional[float] = None, candidates: Optional[List[Dict]] = None):
+        self.name = name
+        self.status = status
+        self.method = method
+        self.client_name = client_name
+        self.acs_score = acs_score
+        self.similarity = similarity
+        self.candidates = candidates or []
+
+    def to_dict(self) -> Dict:
+        result = {'name': self.name, 'status': self.status}
+        if self.method:
+            result['method'] = self.method
+        if self.client_name is not None:
+            result['client_name'] = self.client_name
+            result['acs_score'] = self.acs_score
+        if self.similarity is not None:
+            result['similarity'] = self.similarity
+        if self.candidates:
+            result['candidates'] = self.candidates
+        return result
+
+
+class ClientNameMatcher:
+    """
+    Resolves job-data client names to ACS registry entries
+
+    Names are tried exactly, then by canonical key, then against registry names
+    sharing a blocking key (a token or token prefix) so only a handful of
+    candidates are compared per name. A name whose plausible registry entries
+    disagree on the ACS score is ambiguous and left unjoined, and so is one that
+    resolves to a registry entry deliberately left unscored. Results are cached
+    per name, so repeated partitions only match new names.
+    """
+
+    def __init__(self, acs_data: Optional[pd.DataFrame] = None, unscored_names: Iterable[str] = ()):
+        # Registry name -> ACS score; None for names the registry lists without a score
+        self._scores: Dict[str, object] = {}
+        self._by_key: Dict[str, List[str]] = {}
+        self._blocks: Dict[str, List[str]] = {}
+        self._results: Dict[str, ClientMatch] = {}
+        self._job_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if acs_data is not None:
+            self._index(acs_data, unscored_names)
+
+    def _index(self, acs_data: pd.DataFrame, unscored_names: Iterable[str]) -> None:
+        self._scores = dict(zip(acs_data['CLIENT_NAME'], acs_data['ACS_SCORE'].tolist()))
+        # Unscored names are indexed too, so "Volvo" is not resolved to its scored sibling "Volvo Exchange"
+        for name in unscored_names:
+            self._scores.setdefault(name, None)
+        for name in self._scores:
+            key = normalize_client_name(name)
+            if key:
+                self._by_key.setdefault(key, []).append(name)
+        blocks: Dict[str, List[str]] = {}
+        for key in self._by_key:
+            for block in _blocking_keys(key):
+                blocks.setdefault(block, []).append(key)
+        # Very common blocks ("adecco", "health") would make every name a candidate; keep the selective ones
+        limit = max(10, MAX_BLOCK_SHARE * len(self._by_key))
+        self._blocks = {block: keys for block, keys in blocks.items() if len(keys) <= limit}
+
+    def _resolve_key(self, name: str, key: str, method: str, similarity: Optional[float] = None) -> ClientMatch:
+        registry_names = self._by_key[key]
+        scores = {self._scores[registry_name] for registry_name in registry_names}
+        if len(scores) > 1:
+            candidates = [{'client_name': registry_name, 'acs_score': self._scores[registry_name]}
+                          for registry_name in registry_names]
+            return ClientMatch(name, 'ambiguous', method, candidates=candidates)
+        score = self._scores[registry_names[0]]
+        status = 'unscored' if score is None else 'matched'
+        return ClientMatch(name, status, method, registry_names[0], score, similarity)
+
+    def _match_one(self, name: str) -> ClientMatch:
+        if name in self._scores:
+            status = 'unscored' if self._scores[name] is None else 'matched'
+            return ClientMatch(name, status, 'exact', name, self._scores[name])
+        key = normalize_client_name(name)
+        if not key:
+            return ClientMatch(name, 'unmatched')
+        if key in self._by_key:
+            return self._resolve_key(name, key, 'normalized')
+
+        candidates = set()
+        for block in _blocking_keys(key):
+            candidates.update(self._blocks.get(block, ()))
+        scored = []
+        matcher = SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(key)
+        for candidate in candidates:
+            matcher.set_seq1(candidate)
+            # quick_ratio() is a cheap upper bound on ratio(); skip candidates that can't get close
+            if matcher.quick_ratio() >= SUGGESTION_THRESHOLD:
+                scored.append((round(matcher.ratio(), 3), candidate))
+        scored.sort(reverse=True)
+        if not scored or scored[0][0] < FUZZY_MATCH_THRESHOLD:
+            if scored and scored[0][0] >= SUGGESTION_THRESHOLD:
+                suggestion = self._by_key[scored[0][1]][0]
+                return ClientMatch(name, 'unmatched', similarity=scored[0][0], candidates=[
+                    {'client_name': suggestion, 'acs_score': self._scores[suggestion], 'similarity': scored[0][0]}])
+            return ClientMatch(name, 'unmatched')
+
+        best_similarity, best_key = scored[0]
+        close = [(similarity, candidate) for similarity, candidate in scored
+                 if similarity >= max(FUZZY_MATCH_THRESHOLD, best_similarity - AMBIGUITY_MARGIN)]
+        scores = {self._scores[registry_name] for _, candidate in close for registry_name in self._by_key[candidate]}
+        if len(scores) > 1:
+            candidates = [{'client_name': registry_name, 'acs_score': self._scores[registry_name], 'similarity': similarity}
+                          for similarity, candidate in close for registry_name in self._by_key[candidate]]
+            return ClientMatch(name, 'ambiguous', 'fuzzy', candidates=candidates)
+        return self._resolve_key(name, best_key, 'fuzzy', best_similarity)
+
+    def match(self, names: Iterable[str]) -> Dict[str, ClientMatch]:
+        """Match each distinct name (cached after the first time)"""
+        results = {}
+        with self._lock:
+            for name in names:
+                result = self._results.get(name)
+                if result is None:
+                    result = self._results[name] = self._match_one(name)
+                results[name] = result
+        return results
+
+    def joins(self, names: Iterable[str]) -> Dict[str, Tuple[str, object]]:
+        """Registry name and ACS score for every name that matched; ambiguous and unmatched names are left out"""
+        return {name: (result.client_name, result.acs_score) for name, result in self.match(names).items()
+                if result.status == 'matched'}
+
+    def set_job_counts(self, job_counts: pd.Series) -> None:
+        """Replace the job rows per name (of all job data currently held) that the report describes"""
+        self.match(job_counts.index)
+        counts = {name: int(count) for name, count in job_counts.items()}
+        with self._lock:
+            self._job_counts = counts
+
+    def report(self, limit: int = 100) -> Dict:
+        """Matched/ambiguous/unmatched counts, plus the non-exact matches and failures with the most job rows"""
+        with self._lock:
+            # Only names in the current job data; the cache also holds names from expired partitions
+            job_counts = self._job_counts
+            results = [self._results[name] for name in job_counts if name in self._results]
+
+        def rows(status, method=None):
+            selected = [result for result in results
+                        if result.status == status and (method is None or result.method == method)]
+            selected.sort(key=lambda result: (-job_counts.get(result.name, 0), result.name))
+            return [{**result.to_dict(), 'job_count': job_counts.get(result.name, 0)} for result in selected[:limit]]
+
+        summary = {status: {'names': 0, 'jobs': 0} for status in ('matched', 'unscored', 'ambiguous', 'unmatched')}
+        methods: Dict[str, int] = {}
+        for result in results:
+            summary[result.status]['names'] += 1
+            summary[result.status]['jobs'] += job_counts.get(result.name, 0)
+            if result.status == 'matched':
+                methods[result.method] = methods.get(result.method, 0) + 1
+        return {
+            'registry_clients': sum(score is not None for score in self._scores.values()),
+            'unscored_registry_clients': sum(score is None for score in self._scores.values()),
+            'summary': summary,
+            'matched_by_method': methods,
+            'normalized': rows('matched', 'normalized'),
+            'fuzzy': rows('matched', 'fuzzy'),
+            'unscored': rows('unscored'),
+            'ambiguous': rows('ambiguous'),
+            'unmatched': rows('unmatched')
+        }
@@ -5,35 +5,100 @@ Combines ACS scores with job data to help teams find similar clients for referen
 """
 
 import pandas as pd
+import numpy as np
 import json
-from typing import Dict, List, Tuple, Optional
+import threading
+from typing import Any, Dict, Iterator, List, Tuple, Optional
 import logging
+import profiling
+from metrics import REGISTRY
+from title_normalizer import TitleDictionary
+from title_classifier import TitleCategoryClassifier
+from category_graph import CategoryGraph
+from client_matching import ClientNameMatcher
+from analytics_cube import AnalyticsCube
+from client_versions import ClientVersionLog
+from job_partitions import DEFAULT_JOB_DATA_DIR, discover_partitions
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columns available to the streaming export; JOB_TITLE is decoded from JOB_TITLE_ID
+JOB_EXPORT_COLUMNS = ['CLIENT_NAME', 'JOB_TITLE', 'DETAIL_NORMALISED_CATEGORY', 'ACS_SCORE']
+CLIENT_EXPORT_COLUMNS = ['CLIENT_NAME', 'ACS_SCORE', 'TOTAL_JOBS', 'ACS_COMPLEXITY']
+EXPORT_BATCH_ROWS = 5000
+# Predicted categories tried, best first, when searching by job title
+TITLE_CATEGORY_CANDIDATES = 3
+# Related categories tried, most related first, when a category has too few exact matches
+RELATED_CATEGORY_BUDGET = 5
+
+FINDER_STAGE_SECONDS = REGISTRY.histogram(
+    'acs_finder_stage_duration_seconds', 'Duration of Client Reference Finder data loading stages', ['stage'])
+JOB_PARTITIONS_LOADED = REGISTRY.gauge(
+    'acs_job_partitions_loaded', 'Dated job export partitions currently held in memory')
+JOB_PARTITION_EVENTS = REGISTRY.counter(
+    'acs_job_partition_events_total', 'Job export partitions ingested or aged out', ['event'])
+
+# Columns of the per-partition job aggregates the indexes are built from
+AGGREGATE_COLUMNS = ['CLIENT_NAME', 'ACS_SCORE', 'DETAIL_NORMALISED_CATEGORY', 'JOB_TITLE_ID']
+
 class ClientReferenceFinder:
     """
     Finds similar clients based on ACS scores and job categories for reference purposes.
     """
     
-    def __init__(self, job_data_file: str = None):
-        """Initialize the Client Reference Finder."""
+    def __init__(self, job_data_file: str = None, country_data_file: str = None,
+                 job_data_dir: str = None, retention_days: float = None):
+        """
+        Initialize the Client Reference Finder.
+        
+        If job_data_dir holds dated job exports they are ingested as partitions
+        (see ingest_partitions) and job_data_file is ignored. Otherwise
+        job_data_file is loaded, and replaced by the first exports that appear
+        in job_data_dir later.
+        """
         self.acs_data = None
         self.job_data = None
         self.country_data = None
         self.combined_data = None
+        # Canonical job titles; job rows store JOB_TITLE_ID instead of the raw string
+        self.title_dictionary = TitleDictionary()
+        # Resolves job-data client names to ACS registry names (rebuilt with the registry)
+        self.client_matcher = ClientNameMatcher()
+        # Derived lookups rebuilt whenever combined_data changes; None means shed, rebuilt on next use
+        self._client_summaries = {}
+        self._analytics_cube = AnalyticsCube()
+        self._title_classifier = TitleCategoryClassifier()
+        self._category_graph = CategoryGraph()
+        self._index_lock = threading.Lock()
+        # Versioned client list for delta sync (/clients/changes)
+        self.client_versions = ClientVersionLog()
+        # Dated job export partitions: file name -> {'id', 'timestamp', 'rows'}, oldest first
+        self.job_data_dir = job_data_dir
+        self.retention_days = retention_days
+        self.partitions: Dict[str, Dict[str, Any]] = {}
+        self._partition_aggregates: Dict[int, pd.DataFrame] = {}
+        self._next_partition_id = 0
+        # job_data came from job_data_file and is dropped once dated exports arrive
+        self._job_data_from_file = False
+        self._ingest_lock = threading.Lock()
         
         # Load ACS data (hardcoded for now)
         self.load_acs_data(None)
         
+        # Country data feeds the analytics cube (job rows are not merged with it yet)
+        if country_data_file:
+            self.load_country_data(country_data_file)
+        
+        if job_data_dir and discover_partitions(job_data_dir):
+            self.ingest_partitions()
+            return
+        
         # Load job data if file provided
         if job_data_file:
             self.load_job_data(job_data_file)
-        
-        # TODO: Load country data when needed
-        # self.load_country_data(country_data_file)
+            self._job_data_from_file = self.job_data is not None
         
         # Combine data if both ACS and job data are available
         if self.acs_data is not None and self.job_data is not None:
@@ -41,6 +106,7 @@ class ClientReferenceFinder:
     
     def load_acs_data(self, file_path: str) -> None:
         """Load ACS scores data."""
+        unscored_names = []
         try:
             # For now, we'll use the manual data you provided
             acs_data = {
@@ -140,11 +206,13 @@ class ClientReferenceFinder:
                 'Modis- Switzerland': None, 'TAG - LHH - Euro': None, 'Covelo Group': None, 'Gifted Healthcare': None
             }
             
-            # Create DataFrame and filter out None values
+            # Create DataFrame and filter out None values (the matcher still needs those names)
             acs_list = []
             for client, score in acs_data.items():
                 if score is not None:
                     acs_list.append({'CLIENT_NAME': client, 'ACS_SCORE': score})
+                else:
+                    unscored_names.append(client)
             
             self.acs_data = pd.DataFrame(acs_list)
             
@@ -157,25 +225,130 @@ class ClientReferenceFinder:
                 {'CLIENT_NAME': 'Test Client', 'ACS_SCORE': 1}
             ])
             logger.warning("Created minimal ACS data to prevent failure")
+        
+        self.client_matcher = ClientNameMatcher(self.acs_data, unscored_names)
+        self.publish_client_versions()
+    
+    def publish_client_versions(self) -> None:
+        """Record the current ACS client list as a new data version if it changed."""
+        records = {
+            name: {'client_name': name, 'acs_score': int(score)}
+            for name, score in zip(self.acs_data['CLIENT_NAME'], self.acs_data['ACS_SCORE'])
+        }
+        version = self.client_versions.update(records)
+        logger.info(f"Client data version {version} ({len(records)} clients)")
     
     def load_job_data(self, file_path: str) -> None:
         """Load job data from CSV."""
+        with FINDER_STAGE_SECONDS.time(stage='load_job_data'):
+            self._load_job_data(file_path)
+    
+    def _load_job_data(self, file_path: str) -> None:
         try:
-            # Read the CSV file
-            self.job_data = pd.read_csv(file_path)
-            
-            # Clean column names
-            self.job_data.columns = [col.strip() for col in self.job_data.columns]
-            
-            # Clean the data
-            self.job_data = self.job_data.dropna(subset=['CLIENT_NAME', 'DETAIL_NORMALISED_CATEGORY'])
-            self.job_data = self.job_data[self.job_data['DETAIL_NORMALISED_CATEGORY'] != '']
-            
+            self.title_dictionary = TitleDictionary()
+            self.job_data = self._read_job_frame(file_path)
+            logger.info(f"Normalized job titles to {len(self.title_dictionary)} canonical titles")
             logger.info(f"Loaded job data: {len(self.job_data)} job postings across {self.job_data['CLIENT_NAME'].nunique()} clients")
             
         except Exception as e:
             logger.error(f"Error loading job data: {e}")
             self.job_data = None
+    
+    def _read_job_frame(self, file_path: str) -> pd.DataFrame:
+        """Read and clean one job export, encoding titles into the shared title dictionary."""
+        # Read the CSV file
+        frame = pd.read_csv(file_path)
+        
+        # Clean column names
+        frame.columns = [col.strip() for col in frame.columns]
+        
+        # Clean the data
+        frame = frame.dropna(subset=['CLIENT_NAME', 'DETAIL_NORMALISED_CATEGORY'])
+        frame = frame[frame['DETAIL_NORMALISED_CATEGORY'] != '']
+        
+        # Replace raw titles with canonical title IDs (near-duplicates share one ID)
+        if 'JOB_TITLE' in frame.columns:
+            title_ids = self.title_dictionary.encode(frame['JOB_TITLE'])
+            frame = frame.drop(columns=['JOB_TITLE']).assign(JOB_TITLE_ID=title_ids)
+        return frame
+    
+    def ingest_partitions(self) -> Dict[str, Any]:
+        """
+        Bring job data in line with the dated exports in job_data_dir.
+        
+        Only partitions not seen before are read; each is combined with ACS data
+        and reduced to a small aggregate on its own, and the indexes are rebuilt by
+        summing the aggregates rather than regrouping every job row, so each export
+        must hold only the postings new since the previous one (a delta); full
+        snapshots would be counted once per export. Partitions outside the
+        retention window are dropped by their PARTITION_ID.
+        """
+        with self._ingest_lock, FINDER_STAGE_SECONDS.time(stage='ingest_partitions'):
+            discovered = discover_partitions(self.job_data_dir, self.retention_days)
+            retained = {partition.name for partition in discovered}
+            expired = [name for name in self.partitions if name not in retained]
+            new = [partition for partition in discovered if partition.name not in self.partitions]
+            if not expired and not new:
+                return {'added': [], 'expired': [], 'partitions': len(self.partitions)}
+            
+            job_frames, combined_frames, added = [], [], []
+            for partition in new:
+                try:
+                    job_frame = self._read_job_frame(partition.path)
+                except Exception as e:
+                    logger.error(f"Error loading job partition {partition.name}: {e}")
+                    continue
+                partition_id = self._next_partition_id
+                self._next_partition_id += 1
+                # IDs are never reused, so a long-running server needs room for every partition it ever ingests
+                job_frame = job_frame.assign(PARTITION_ID=np.int32(partition_id))
+                combined_frame = self._combine_frame(job_frame)
+                job_frames.append(job_frame)
+                combined_frames.append(combined_frame)
+                self._partition_aggregates[partition_id] = self._aggregate_jobs(combined_frame)
+                self.partitions[partition.name] = {
+                    'id': partition_id, 'timestamp': partition.timestamp, 'rows': len(job_frame)}
+                added.append(partition.name)
+                logger.info("Ingested job partition %s: %d job postings", partition.name, len(job_frame))
+            
+            expired_ids = [self.partitions.pop(name)['id'] for name in expired]
+            for partition_id in expired_ids:
+                self._partition_aggregates.pop(partition_id, None)
+            for name in expired:
+                logger.info("Job partition %s aged out of the %s day retention window", name, self.retention_days)
+            
+            if self._job_data_from_file and added:
+                # The first dated exports replace the fallback job_data_file
+                self.job_data = self.combined_data = None
+                self._job_data_from_file = False
+            self.job_data = self._replace_partitions(self.job_data, expired_ids, job_frames)
+            self.combined_data = self._replace_partitions(self.combined_data, expired_ids, combined_frames)
+            # Recounted from the retained rows, so re-ingests and expired partitions don't skew the match report
+            self.client_matcher.set_job_counts(
+                self.job_data['CLIENT_NAME'].value_counts(sort=False) if self.job_data is not None else pd.Series(dtype=int))
+            self.partitions = dict(sorted(self.partitions.items(), key=lambda item: item[1]['timestamp']))
+            
+            with FINDER_STAGE_SECONDS.time(stage='build_indexes'):
+                self.build_indexes()
+            
+            JOB_PARTITIONS_LOADED.set(len(self.partitions))
+            JOB_PARTITION_EVENTS.inc(len(added), event='ingested')
+            JOB_PARTITION_EVENTS.inc(len(expired), event='expired')
+            logger.info("Job data: %d partitions, %d job postings with ACS scores",
+                        len(self.partitions), len(self.combined_data) if self.combined_data is not None else 0)
+            return {'added': added, 'expired': expired, 'partitions': len(self.partitions)}
+    
+    @staticmethod
+    def _replace_partitions(frame: Optional[pd.DataFrame], expired_ids: List[int],
+                            new_frames: List[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """Drop rows of expired partitions and append new partitions' rows."""
+        frames = []
+        if frame is not None:
+            frames.append(frame[~frame['PARTITION_ID'].isin(expired_ids)] if expired_ids else frame)
+        frames.extend(new_frames)
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].reset_index(drop=True)
 
     def load_country_data(self, file_path: str) -> None:
         """Load country data from CSV."""
@@ -198,59 +371,294 @@ class ClientReferenceFinder:
     
     def combine_data(self) -> None:
         """Combine ACS and job data for analysis."""
+        with FINDER_STAGE_SECONDS.time(stage='combine_data'):
+            self._combine_data()
+        with FINDER_STAGE_SECONDS.time(stage='build_indexes'):
+            self.build_indexes()
+    
+    def _combine_data(self) -> None:
         try:
-            logger.info(f"Starting data combination...")
-            logger.info(f"ACS data: {self.acs_data is not None}, shape: {self.acs_data.shape if self.acs_data is not None else 'None'}")
-            logger.info(f"Job data: {self.job_data is not None}, shape: {self.job_data.shape if self.job_data is not None else 'None'}")
-            logger.info(f"Country data: {self.country_data is not None}, shape: {self.country_data.shape if self.country_data is not None else 'None'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                for name, frame in (('ACS', self.acs_data), ('Job', self.job_data), ('Country', self.country_data)):
+                    logger.debug("%s data: shape %s", name, frame.shape if frame is not None else None)
             
             if self.acs_data is None or self.job_data is None:
                 logger.error("Cannot combine data: ACS or job data not loaded")
                 return
             
-            # Merge the datasets
-            logger.info("Merging datasets...")
-            self.combined_data = self.job_data.merge(
-                self.acs_data, 
-                on='CLIENT_NAME', 
-                how='left'
-            )
-            logger.info(f"Merge completed: {len(self.combined_data)} rows")
-            
-            # TODO: Add country data when needed
-            # if self.country_data is not None:
-            #     logger.info("Adding country data...")
-            #     self.combined_data = self.combined_data.merge(
-            #         self.country_data,
-            #         on='CLIENT_NAME',
-            #         how='left'
-            #     )
-            #     # Fill missing countries with "United States"
-            #     self.combined_data['NORMALISED_COUNTRY'] = self.combined_data['NORMALISED_COUNTRY'].fillna('United States')
-            #     logger.info(f"Country data added: {len(self.combined_data)} rows")
-            
-            # Remove rows without ACS scores
-            logger.info("Removing rows without ACS scores...")
-            initial_count = len(self.combined_data)
-            self.combined_data = self.combined_data.dropna(subset=['ACS_SCORE'])
-            final_count = len(self.combined_data)
-            logger.info(f"Rows with ACS scores: {final_count} (removed {initial_count - final_count})")
-            
-            logger.info(f"Combined data: {len(self.combined_data)} job postings with ACS scores")
+            self.combined_data = self._combine_frame(self.job_data)
+            self.client_matcher.set_job_counts(self.job_data['CLIENT_NAME'].value_counts(sort=False))
             
         except Exception as e:
             logger.error(f"Error combining data: {e}")
             self.combined_data = None
     
-    def find_similar_clients(self, target_acs: int, target_category: str, target_country: str = None, max_results: int = 10) -> List[Dict]:
+    def _combine_frame(self, job_frame: pd.DataFrame) -> pd.DataFrame:
+        """Join job rows with ACS scores, keeping only clients that have one."""
+        # Match each distinct client name once (exact, normalized or fuzzy), then map the registry name and
+        # score onto the rows, so spelling variants count as one client everywhere downstream. job_data keeps
+        # the raw names, and the matcher's report maps them to registry names.
+        joins = self.client_matcher.joins(job_frame['CLIENT_NAME'].unique())
+        combined = job_frame.assign(
+            CLIENT_NAME=job_frame['CLIENT_NAME'].map({name: client_name for name, (client_name, _) in joins.items()}),
+            ACS_SCORE=job_frame['CLIENT_NAME'].map({name: score for name, (_, score) in joins.items()}))
+        logger.debug("Client name join completed: %d rows", len(combined))
+        
+        # TODO: Add country data when needed
+        # if self.country_data is not None:
+        #     logger.info("Adding country data...")
+        #     combined = combined.merge(
+        #         self.country_data,
+        #         on='CLIENT_NAME',
+        #         how='left'
+        #     )
+        #     # Fill missing countries with "United States"
+        #     combined['NORMALISED_COUNTRY'] = combined['NORMALISED_COUNTRY'].fillna('United States')
+        #     logger.info(f"Country data added: {len(combined)} rows")
+        
+        # Remove rows without ACS scores
+        initial_count = len(combined)
+        combined = combined.dropna(subset=['ACS_SCORE'])
+        final_count = len(combined)
+        logger.info("Combined data: %d job postings with ACS scores (removed %d without)",
+                    final_count, initial_count - final_count)
+        return combined
+    
+    @staticmethod
+    def _aggregate_jobs(data: pd.DataFrame) -> pd.DataFrame:
+        """Job counts per client, ACS score, category and canonical title."""
+        columns = [col for col in AGGREGATE_COLUMNS if col in data.columns]
+        return data.groupby(columns, sort=False, dropna=False).size().rename('JOB_COUNT').reset_index()
+    
+    def job_aggregates(self) -> Optional[pd.DataFrame]:
+        """Job counts the indexes are built from, summed over all retained partitions."""
+        aggregates = list(self._partition_aggregates.values())
+        if not aggregates:
+            if self.combined_data is None:
+                return None
+            return self._aggregate_jobs(self.combined_data)
+        if len(aggregates) == 1:
+            return aggregates[0]
+        merged = pd.concat(aggregates, ignore_index=True)
+        columns = [col for col in AGGREGATE_COLUMNS if col in merged.columns]
+        return merged.groupby(columns, sort=False, dropna=False)['JOB_COUNT'].sum().reset_index()
+    
+    def build_indexes(self) -> None:
+        """Rebuild lookups derived from combined_data so they stay consistent with it."""
+        aggregates = self.job_aggregates()
+        with self._index_lock:
+            self._client_summaries = self._rebuild_client_summaries(aggregates)
+            self._analytics_cube = self._rebuild_analytics_cube(aggregates)
+            self._title_classifier = self._rebuild_title_classifier(aggregates)
+            self._category_graph = self._rebuild_category_graph(aggregates)
+    
+    def _rebuild_client_summaries(self, aggregates: Optional[pd.DataFrame] = None) -> Dict[str, Dict]:
+        try:
+            if aggregates is None:
+                aggregates = self.job_aggregates()
+            summaries = self._build_client_summaries(aggregates)
+            logger.info(f"Built summaries for {len(summaries)} clients")
+            return summaries
+        except Exception as e:
+            logger.error(f"Error building client summaries: {e}")
+            return {}
+    
+    def _rebuild_analytics_cube(self, aggregates: Optional[pd.DataFrame] = None) -> AnalyticsCube:
+        try:
+            if aggregates is None:
+                aggregates = self.job_aggregates()
+            cube = AnalyticsCube.build(aggregates, self.country_data)
+            logger.info(f"Built analytics cube with {cube.total_cells} cells")
+            return cube
+        except Exception as e:
+            logger.error(f"Error building analytics cube: {e}")
+            return AnalyticsCube()
+    
+    def _rebuild_title_classifier(self, aggregates: Optional[pd.DataFrame] = None) -> TitleCategoryClassifier:
+        try:
+            if aggregates is None:
+                aggregates = self.job_aggregates()
+            classifier = TitleCategoryClassifier.build(aggregates, self.title_dictionary)
+            logger.info(f"Built title classifier over {classifier.size} titles and {len(classifier.features)} features")
+            return classifier
+        except Exception as e:
+            logger.error(f"Error building title classifier: {e}")
+            return TitleCategoryClassifier()
+    
+    def _rebuild_category_graph(self, aggregates: Optional[pd.DataFrame] = None) -> CategoryGraph:
+        try:
+            if aggregates is None:
+                aggregates = self.job_aggregates()
+            graph = CategoryGraph.build(aggregates)
+            logger.info(f"Built category graph over {len(graph.categories)} categories and {graph.edge_count} edges")
+            return graph
+        except Exception as e:
+            logger.error(f"Error building category graph: {e}")
+            return CategoryGraph()
+    
+    @property
+    def client_summaries(self) -> Dict[str, Dict]:
+        """Per-client summaries, rebuilt on first use after being shed."""
+        summaries = self._client_summaries
+        if summaries is None:
+            with self._index_lock:
+                if self._client_summaries is None:
+                    self._client_summaries = self._rebuild_client_summaries()
+                summaries = self._client_summaries
+        return summaries
+    
+    @property
+    def analytics_cube(self) -> AnalyticsCube:
+        """ACS x category x country cube, rebuilt on first use after being shed."""
+        cube = self._analytics_cube
+        if cube is None:
+            with self._index_lock:
+                if self._analytics_cube is None:
+                    self._analytics_cube = self._rebuild_analytics_cube()
+                cube = self._analytics_cube
+        return cube
+    
+    @property
+    def title_classifier(self) -> TitleCategoryClassifier:
+        """Job title -> category classifier, rebuilt on first use after being shed."""
+        classifier = self._title_classifier
+        if classifier is None:
+            with self._index_lock:
+                if self._title_classifier is None:
+                    self._title_classifier = self._rebuild_title_classifier()
+                classifier = self._title_classifier
+        return classifier
+    
+    @property
+    def category_graph(self) -> CategoryGraph:
+        """Category co-occurrence graph, rebuilt on first use after being shed."""
+        graph = self._category_graph
+        if graph is None:
+            with self._index_lock:
+                if self._category_graph is None:
+                    self._category_graph = self._rebuild_category_graph()
+                graph = self._category_graph
+        return graph
+    
+    def shed_category_graph(self) -> bool:
+        """Drop the category graph under memory pressure; returns False if already dropped."""
+        with self._index_lock:
+            shed, self._category_graph = self._category_graph is not None, None
+        return shed
+    
+    def shed_title_classifier(self) -> bool:
+        """Drop the title classifier under memory pressure; returns False if already dropped."""
+        with self._index_lock:
+            shed, self._title_classifier = self._title_classifier is not None, None
+        return shed
+    
+    def shed_client_summaries(self) -> bool:
+        """Drop the client summaries under memory pressure; returns False if already dropped."""
+        with self._index_lock:
+            shed, self._client_summaries = self._client_summaries is not None, None
+        return shed
+    
+    def shed_analytics_cube(self) -> bool:
+        """Drop the analytics cube under memory pressure; returns False if already dropped."""
+        with self._index_lock:
+            shed, self._analytics_cube = self._analytics_cube is not None, None
+        return shed
+    
+    def memory_report(self) -> Dict[str, Any]:
+        """Deep memory usage (bytes) of each loaded dataset, index and cache."""
+        from memory_monitor import deep_sizeof
+        
+        def frame_info(frame):
+            if frame is None:
+                return {'loaded': False, 'bytes': 0}
+            return {'loaded': True, 'bytes': deep_sizeof(frame), 'rows': len(frame),
+                    'columns': {col: str(dtype) for col, dtype in frame.dtypes.items()}}
+        
+        def index_info(value):
+            if value is None:
+                return {'loaded': False, 'bytes': 0}
+            return {'loaded': True, 'bytes': deep_sizeof(value)}
+        
+        return {
+            'datasets': {
+                'acs_data': frame_info(self.acs_data),
+                'job_data': frame_info(self.job_data),
+                'combined_data': frame_info(self.combined_data),
+                'country_data': frame_info(self.country_data)
+            },
+            'indexes': {
+                'title_dictionary': {**index_info(self.title_dictionary), 'titles': len(self.title_dictionary)},
+                'client_summaries': index_info(self._client_summaries),
+                'analytics_cube': index_info(self._analytics_cube),
+                'title_classifier': index_info(self._title_classifier),
+                'category_graph': index_info(self._category_graph),
+                'client_versions': index_info(self.client_versions),
+                'job_partition_aggregates': index_info(self._partition_aggregates)
+            }
+        }
+    
+    def _build_client_summaries(self, aggregates: Optional[pd.DataFrame]) -> Dict[str, Dict]:
+        """Precompute every client's summary in one grouped pass over the job aggregates."""
+        if aggregates is None or aggregates.empty:
+            return {}
+        
+        data = aggregates
+        total_jobs = data.groupby('CLIENT_NAME', sort=False)['JOB_COUNT'].sum()
+        acs_scores = data.groupby('CLIENT_NAME', sort=False)['ACS_SCORE'].first()
+        
+        # Category histogram per client, most common first (matches value_counts ordering)
+        category_counts = (data.groupby(['CLIENT_NAME', 'DETAIL_NORMALISED_CATEGORY'], sort=False)['JOB_COUNT'].sum()
+                           .sort_values(ascending=False, kind='stable'))
+        categories_by_client: Dict[str, Dict[str, int]] = {}
+        for (client, category), count in category_counts.items():
+            categories_by_client.setdefault(client, {})[category] = int(count)
+        
+        titles_by_client = self._top_titles_by_client(data, 10)
+        
+        summaries = {}
+        for client, jobs in total_jobs.items():
+            acs_score = int(acs_scores[client])
+            summaries[client] = {
+                'client_name': client,
+                'acs_score': acs_score,
+                'total_jobs': int(jobs),
+                'job_categories': categories_by_client.get(client, {}),
+                'sample_job_titles': titles_by_client.get(client, []),
+                'acs_complexity': self._get_acs_complexity_description(acs_score)
+            }
+        return summaries
+    
+    def _top_titles_by_client(self, data: pd.DataFrame, limit: int) -> Dict[str, List[str]]:
+        """Most frequent distinct canonical titles per client, from job rows or job aggregates."""
+        if 'JOB_TITLE_ID' not in data.columns:
+            return {}
+        
+        groups = data[data['JOB_TITLE_ID'] >= 0].groupby(['CLIENT_NAME', 'JOB_TITLE_ID'], sort=False)
+        counts = groups['JOB_COUNT'].sum() if 'JOB_COUNT' in data.columns else groups.size()
+        counts = counts.sort_values(ascending=False, kind='stable')
+        top = counts.groupby(level=0, sort=False).head(limit)
+        
+        titles_by_client: Dict[str, List[str]] = {}
+        for client, title_id in top.index:
+            titles_by_client.setdefault(client, []).append(self.title_dictionary.titles[title_id])
+        return titles_by_client
+    
+    def find_similar_clients(self, target_acs: int, target_category: str, target_country: str = None,
+                             max_results: int = 10, include_related: bool = False) -> List[Dict]:
         """
         Find clients with similar ACS scores and job categories.
         
+        Clients posting in the exact category come first (match_type 'exact'). When
+        there are fewer than max_results of them, the most related categories from
+        the co-occurrence graph are tried in order, up to RELATED_CATEGORY_BUDGET
+        categories, and their clients are added with match_type 'related'.
+        
         Args:
             target_acs: The ACS score to match
             target_category: The job category to match
             target_country: Optional country filter
             max_results: Maximum number of results to return
+            include_related: Fall back to related categories when exact matches are sparse
             
         Returns:
             List of client dictionaries with matching criteria
@@ -260,47 +668,72 @@ class ClientReferenceFinder:
             return []
         
         try:
+            results = self._clients_in_category(target_acs, target_category, max_results)
+            for result in results:
+                result['match_type'] = 'exact'
+            if not include_related or len(results) >= max_results:
+                return results
+            
+            with profiling.phase('related'):
+                seen = {result['client_name'] for result in results}
+                for related in self.category_graph.related(target_category, RELATED_CATEGORY_BUDGET):
+                    clients = self._clients_in_category(target_acs, related['category'], max_results - len(results),
+                                                        exclude=seen)
+                    for client in clients:
+                        client.update({'match_type': 'related', 'related_to': target_category,
+                                       'relatedness': related['relatedness']})
+                        seen.add(client['client_name'])
+                    results.extend(clients)
+                    if len(results) >= max_results:
+                        break
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error finding similar clients: {e}")
+            return []
+    
+    def _clients_in_category(self, target_acs: int, target_category: str, max_results: int,
+                             exclude: Optional[set] = None) -> List[Dict]:
+        """Clients at target_acs posting in target_category, most jobs first, skipping names in exclude."""
+        with profiling.phase('filter'):
             # Filter by job category first (as per your requirement)
             category_filtered = self.combined_data[
                 self.combined_data['DETAIL_NORMALISED_CATEGORY'] == target_category
             ]
             
-            if len(category_filtered) == 0:
-                logger.warning(f"No clients found with job category: {target_category}")
-                return []
-            
             # Filter by ACS score within the category-filtered data
             acs_filtered = category_filtered[
                 category_filtered['ACS_SCORE'] == target_acs
             ]
-            
-            if len(acs_filtered) == 0:
-                logger.warning(f"No clients found with ACS {target_acs} for category: {target_category}")
-                return []
-            
-            # TODO: Add country filtering here once country data is provided
-            # if target_country:
-            #     acs_filtered = acs_filtered[
-            #         acs_filtered['COUNTRY'] == target_country
-            #     ]
-            
-            # TODO: Add country filtering here once country data is provided
-            # if target_country:
-            #     acs_filtered = acs_filtered[
-            #         acs_filtered['COUNTRY'] == target_country
-            #     ]
-            
-            logger.info(f"Found {len(acs_filtered)} clients with {target_category} jobs and ACS {target_acs}")
-            
+            if exclude:
+                acs_filtered = acs_filtered[~acs_filtered['CLIENT_NAME'].isin(exclude)]
+        
+        if len(category_filtered) == 0:
+            logger.warning(f"No clients found with job category: {target_category}")
+            return []
+        
+        if len(acs_filtered) == 0:
+            logger.warning(f"No clients found with ACS {target_acs} for category: {target_category}")
+            return []
+        
+        # TODO: Add country filtering here once country data is provided
+        # if target_country:
+        #     acs_filtered = acs_filtered[
+        #         acs_filtered['COUNTRY'] == target_country
+        #     ]
+        
+        logger.info("Found %d clients with %s jobs and ACS %s", len(acs_filtered), target_category, target_acs)
+        
+        with profiling.phase('groupby'):
             # Group by client and aggregate data
             client_groups = acs_filtered.groupby('CLIENT_NAME').agg({
                 'ACS_SCORE': 'first',
-                'JOB_TITLE': lambda x: list(x.unique())[:5],  # Sample job titles
                 'DETAIL_NORMALISED_CATEGORY': 'count'  # Job count
             }).reset_index()
             
             # Rename columns
-            client_groups.columns = ['client_name', 'acs_score', 'sample_job_titles', 'job_count']
+            client_groups.columns = ['client_name', 'acs_score', 'job_count']
             
             # Sort by job count (more jobs = better reference)
             client_groups = client_groups.sort_values('job_count', ascending=False)
@@ -308,22 +741,22 @@ class ClientReferenceFinder:
             # Limit results
             client_groups = client_groups.head(max_results)
             
-            # Convert to list of dictionaries
-            results = []
-            for _, row in client_groups.iterrows():
-                results.append({
-                    'client_name': row['client_name'],
-                    'acs_score': int(row['acs_score']),
-                    'job_count': int(row['job_count']),
-                    'sample_job_titles': row['sample_job_titles'],
-                    'matching_category': target_category
-                })
-            
-            return results
-            
-        except Exception as e:
-            logger.error(f"Error finding similar clients: {e}")
-            return []
+            # Sample job titles: most frequent distinct canonical titles
+            sample_titles = self._top_titles_by_client(
+                acs_filtered[acs_filtered['CLIENT_NAME'].isin(client_groups['client_name'])], 5)
+        
+        # Convert to list of dictionaries
+        results = []
+        for _, row in client_groups.iterrows():
+            results.append({
+                'client_name': row['client_name'],
+                'acs_score': int(row['acs_score']),
+                'job_count': int(row['job_count']),
+                'sample_job_titles': sample_titles.get(row['client_name'], []),
+                'matching_category': target_category
+            })
+        
+        return results
     
     def _calculate_similarity_score(self, client_row: pd.Series, target_acs: int, target_category: str = None) -> float:
         """Calculate a similarity score for ranking results."""
@@ -342,6 +775,41 @@ class ClientReferenceFinder:
         
         return round(score, 1)
     
+    def classify_title(self, title: str, top_n: int = 5) -> List[Dict]:
+        """Most likely job categories for a free-text job title, best first."""
+        if not title or not title.strip():
+            return []
+        with profiling.phase('classify'):
+            return self.title_classifier.classify(title, top_n=top_n)
+    
+    def find_similar_clients_for_title(self, target_acs: int, target_title: str, target_country: str = None,
+                                       max_results: int = 10, include_related: bool = False) -> Dict[str, Any]:
+        """
+        Find similar clients from a free-text job title instead of an exact category.
+        
+        The title is classified and the most likely categories are tried in order
+        until one has exact clients at the target ACS; only if none has does the
+        search fall back to categories related to the best prediction.
+        """
+        predictions = self.classify_title(target_title, top_n=TITLE_CATEGORY_CANDIDATES)
+        for prediction in predictions:
+            clients = self.find_similar_clients(target_acs, prediction['category'], target_country, max_results,
+                                                include_related=False)
+            if clients:
+                return {'clients': clients, 'matching_category': prediction['category'],
+                        'predicted_categories': predictions}
+        if predictions and include_related:
+            clients = self.find_similar_clients(target_acs, predictions[0]['category'], target_country, max_results,
+                                                include_related=True)
+            if clients:
+                return {'clients': clients, 'matching_category': predictions[0]['category'],
+                        'predicted_categories': predictions}
+        return {'clients': [], 'matching_category': None, 'predicted_categories': predictions}
+    
+    def client_name_report(self, limit: int = 100) -> Dict[str, Any]:
+        """How job-data client names were joined to the ACS registry: matched, ambiguous and unmatched."""
+        return self.client_matcher.report(limit)
+    
     def get_job_categories(self) -> List[str]:
         """Get list of available job categories."""
         if self.job_data is None:
@@ -351,36 +819,16 @@ class ClientReferenceFinder:
     
     def get_client_summary(self, client_name: str) -> Dict:
         """Get comprehensive summary for a specific client."""
-        if self.combined_data is None:
+        summary = self.client_summaries.get(client_name)
+        if summary is None:
             return {}
         
-        try:
-            client_data = self.combined_data[self.combined_data['CLIENT_NAME'] == client_name]
-            
-            if len(client_data) == 0:
-                return {}
-            
-            # Get ACS score
-            acs_score = client_data.iloc[0]['ACS_SCORE']
-            
-            # Get job categories and counts
-            category_counts = client_data['DETAIL_NORMALISED_CATEGORY'].value_counts()
-            
-            # Get sample job titles
-            sample_jobs = client_data['JOB_TITLE'].unique()[:10]
-            
-            return {
-                'client_name': client_name,
-                'acs_score': int(acs_score),
-                'total_jobs': len(client_data),
-                'job_categories': category_counts.to_dict(),
-                'sample_job_titles': sample_jobs.tolist(),
-                'acs_complexity': self._get_acs_complexity_description(acs_score)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting client summary: {e}")
-            return {}
+        # Copy so callers cannot mutate the precomputed summary
+        return {
+            **summary,
+            'job_categories': dict(summary['job_categories']),
+            'sample_job_titles': list(summary['sample_job_titles'])
+        }
     
     def _get_acs_complexity_description(self, acs_score: int) -> str:
         """Get human-readable description of ACS complexity."""
@@ -393,6 +841,76 @@ class ClientReferenceFinder:
         }
         return descriptions.get(acs_score, "Unknown Complexity")
     
+    def iter_job_batches(self, columns: List[str] = None, clients: List[str] = None,
+                         categories: List[str] = None, acs_scores: List[int] = None,
+                         batch_size: int = EXPORT_BATCH_ROWS) -> Iterator[pd.DataFrame]:
+        """
+        Yield filtered job rows in bounded-size batches for streaming export.
+        
+        Rows are sliced and filtered one batch at a time, so memory use does not
+        grow with the size of the export.
+        """
+        columns = columns or JOB_EXPORT_COLUMNS
+        unknown = [col for col in columns if col not in JOB_EXPORT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+        
+        # Hold references so a concurrent reload cannot change data mid-export
+        data = self.combined_data
+        if data is None:
+            return
+        # Trailing '' so missing titles (ID -1) decode to an empty string
+        titles = np.array(self.title_dictionary.titles + [''], dtype=object)
+        
+        for start in range(0, len(data), batch_size):
+            batch = data.iloc[start:start + batch_size]
+            if clients:
+                batch = batch[batch['CLIENT_NAME'].isin(clients)]
+            if categories:
+                batch = batch[batch['DETAIL_NORMALISED_CATEGORY'].isin(categories)]
+            if acs_scores:
+                batch = batch[batch['ACS_SCORE'].isin(acs_scores)]
+            if batch.empty:
+                continue
+            
+            out = {}
+            for col in columns:
+                if col == 'JOB_TITLE':
+                    out[col] = titles[batch['JOB_TITLE_ID'].to_numpy()] if 'JOB_TITLE_ID' in batch else ''
+                elif col == 'ACS_SCORE':
+                    out[col] = batch[col].astype(int).to_numpy()
+                else:
+                    out[col] = batch[col].to_numpy()
+            yield pd.DataFrame(out, columns=columns)
+    
+    def iter_client_batches(self, columns: List[str] = None, acs_scores: List[int] = None,
+                            batch_size: int = EXPORT_BATCH_ROWS) -> Iterator[pd.DataFrame]:
+        """Yield ACS registry clients (with job totals) in bounded-size batches for export."""
+        columns = columns or CLIENT_EXPORT_COLUMNS
+        unknown = [col for col in columns if col not in CLIENT_EXPORT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+        
+        data = self.acs_data
+        summaries = self.client_summaries
+        if data is None:
+            return
+        
+        for start in range(0, len(data), batch_size):
+            batch = data.iloc[start:start + batch_size]
+            if acs_scores:
+                batch = batch[batch['ACS_SCORE'].isin(acs_scores)]
+            if batch.empty:
+                continue
+            
+            out = {
+                'CLIENT_NAME': batch['CLIENT_NAME'].to_numpy(),
+                'ACS_SCORE': batch['ACS_SCORE'].astype(int).to_numpy(),
+                'TOTAL_JOBS': [summaries.get(name, {}).get('total_jobs', 0) for name in batch['CLIENT_NAME']],
+                'ACS_COMPLEXITY': [self._get_acs_complexity_description(score) for score in batch['ACS_SCORE']]
+            }
+            yield pd.DataFrame({col: out[col] for col in columns}, columns=columns)
+    
     def search_clients(self, query: str, max_results: int = 20) -> List[Dict]:
         """Search for clients by name."""
         if self.acs_data is None:
@@ -427,7 +945,7 @@ def main():
     print("=" * 50)
     
     # Initialize the finder
-    finder = ClientReferenceFinder(job_data_file="2025-08-29 3_39pm.csv")
+    finder = ClientReferenceFinder(job_data_file="2025-08-29 3_39pm.csv", job_data_dir=DEFAULT_JOB_DATA_DIR)
     
     if finder.combined_data is None:
         print("❌ Failed to load data")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Client Data Versions
+Monotonically versioned snapshots of the client list with per-version change tracking
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Versions kept for delta queries; older `since` values get a full snapshot instead
+DEFAULT_MAX_VERSIONS = 100
+
+
+def version_etag(version: int) -> str:
+    """Strong ETag for a client data version"""
+    return f'"clients-{version}"'
+
+
+class ClientVersionLog:
+    """
+    Tracks the client list as a sequence of versions
+
+    Versions are millisecond timestamps bumped to stay strictly increasing, so a
+    restarted server never reissues a version an old client may still hold. A
+    `since` that this process didn't issue (or has forgotten) gets a full snapshot.
+    """
+
+    def __init__(self, max_versions: int = DEFAULT_MAX_VERSIONS):
+        self.max_versions = max_versions
+        self.version = 0
+        self.clients: Dict[str, Dict[str, Any]] = {}
+        self._versions: List[int] = []
+        self._changes: List[Tuple[int, str, str]] = []  # (version, client_name, 'added'|'changed'|'removed')
+        self._snapshot: Optional[List[Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def update(self, clients: Dict[str, Dict[str, Any]]) -> int:
+        """Replace the client list, issuing a new version if anything changed"""
+        with self._lock:
+            changes = [(name, 'added' if name not in self.clients else 'changed')
+                       for name, record in clients.items() if self.clients.get(name) != record]
+            changes += [(name, 'removed') for name in self.clients if name not in clients]
+            if not changes and self._versions:
+                return self.version
+
+            version = max(self.version + 1, int(time.time() * 1000))
+            self._changes.extend((version, name, kind) for name, kind in changes)
+            self._versions.append(version)
+            if len(self._versions) > self.max_versions:
+                self._versions = self._versions[-self.max_versions:]
+                oldest = self._versions[0]
+                self._changes = [change for change in self._changes if change[0] > oldest]
+            self.clients = dict(clients)
+            self.version = version
+            self._snapshot = None
+            return version
+
+    def snapshot(self) -> Tuple[int, List[Dict[str, Any]]]:
+        """Current version and all clients sorted by name (built once per version)"""
+        with self._lock:
+            return self.version, self._sorted_clients()
+
+    def _sorted_clients(self) -> List[Dict[str, Any]]:
+        if self._snapshot is None:
+            self._snapshot = [self.clients[name] for name in sorted(self.clients)]
+        return self._snapshot
+
+    def changes_since(self, since: int) -> Dict[str, Any]:
+        """Clients added, changed and removed after version `since`, or a full snapshot if unknown"""
+        with self._lock:
+            version = self.version
+            if since not in self._versions:
+                return {'version': version, 'since': since, 'full': True, 'clients': self._sorted_clients()}
+
+            first_kind: Dict[str, str] = {}
+            for change_version, name, kind in self._changes:
+                if change_version > since:
+                    first_kind.setdefault(name, kind)
+            added, changed, removed = [], [], []
+            for name, kind in sorted(first_kind.items()):
+                present = name in self.clients
+                if kind == 'added' and present:
+                    added.append(self.clients[name])
+                elif kind != 'added' and present:
+                    changed.append(self.clients[name])
+                elif kind != 'added':
+                    removed.append(name)
+                # Added and removed again since `since`: nothing to report
+
+        return {'version': version, 'since': since, 'full': False,
+                'added': added, 'changed': changed, 'removed': removed}
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Request Deadlines
+Per-request time budgets propagated to outbound calls through a context variable
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+# Absolute time.monotonic() by which the current request must finish
+_deadline: contextvars.ContextVar = contextvars.ContextVar('acs_deadline', default=None)
+# Socket timeout for the outbound call currently running on this thread
+_call_timeout: contextvars.ContextVar = contextvars.ContextVar('acs_call_timeout', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's time budget ran out before (or while) an operation could run"""
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """Limit everything inside the with-block to `seconds`; nested deadlines can only shorten it"""
+    if not seconds or seconds <= 0:
+        yield
+        return
+    new_deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(new_deadline if current is None else min(current, new_deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def no_deadline():
+    """Run shared setup work (e.g. opening the spreadsheet) free of the calling request's deadline"""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current deadline, or None if there is none"""
+    current = _deadline.get()
+    return None if current is None else current - time.monotonic()
+
+
+def check(operation: str = 'operation') -> None:
+    """Raise DeadlineExceeded if the current deadline has passed"""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {operation}")
+
+
+@contextmanager
+def call_timeout(timeout: Optional[float], operation: str = 'call'):
+    """
+    Timeout for one outbound call: the smaller of `timeout` and the time left in the deadline
+
+    Raises DeadlineExceeded up front if no time is left.
+    """
+    check(operation)
+    left = remaining()
+    if left is not None:
+        timeout = left if timeout is None else min(timeout, left)
+    token = _call_timeout.set(timeout)
+    try:
+        yield timeout
+    finally:
+        _call_timeout.reset(token)
+
+
+def current_call_timeout() -> Optional[float]:
+    """Timeout set by the innermost call_timeout block, if any"""
+    return _call_timeout.get()
@@ -8,6 +8,8 @@ module.exports = {
     autorestart: true,
     watch: false,
     max_memory_restart: '1G',
+    // SIGTERM drains in-flight requests for up to ACS_SHUTDOWN_TIMEOUT (25s) before exiting
+    kill_timeout: 30000,
     env: {
       NODE_ENV: 'production',
       PORT: 3000
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Fake Google Sheets client for ACS Calculator
+In-memory stand-in for gspread with configurable latency and failure injection,
+used for offline load testing and benchmarking of the store path
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import gspread
+import requests
+
+import deadlines
+
+# Configure via environment when the server runs with ACS_FAKE_SHEETS=1
+LATENCY_ENV = 'ACS_FAKE_SHEETS_LATENCY_MS'
+JITTER_ENV = 'ACS_FAKE_SHEETS_JITTER_MS'
+FAILURE_RATE_ENV = 'ACS_FAKE_SHEETS_FAILURE_RATE'
+FAILURE_STATUS_ENV = 'ACS_FAKE_SHEETS_FAILURE_STATUS'
+
+
+class _FakeResponse:
+    """Just enough of a requests.Response for gspread.exceptions.APIError"""
+
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.text = f"Injected failure ({status_code})"
+
+    def json(self) -> Dict[str, Any]:
+        return {'error': {'code': self.status_code, 'message': self.text, 'status': 'INJECTED'}}
+
+
+class FakeSheetsConfig:
+    """Latency and failure injection settings"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, failure_rate: float = 0.0,
+                 failure_status: int = 503):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+
+    @classmethod
+    def from_env(cls) -> 'FakeSheetsConfig':
+        return cls(
+            latency_ms=float(os.getenv(LATENCY_ENV, '0')),
+            jitter_ms=float(os.getenv(JITTER_ENV, '0')),
+            failure_rate=float(os.getenv(FAILURE_RATE_ENV, '0')),
+            failure_status=int(os.getenv(FAILURE_STATUS_ENV, '503'))
+        )
+
+    def simulate_call(self) -> None:
+        """Sleep for the configured latency (or time out), then maybe raise an injected API error"""
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        # Behave like gspread's HTTP timeout when the latency exceeds the current call timeout
+        timeout = deadlines.current_call_timeout()
+        if timeout is not None and delay / 1000.0 > timeout:
+            time.sleep(max(0.0, timeout))
+            raise requests.exceptions.ReadTimeout(f"Injected latency of {delay:.0f}ms exceeded {timeout:.3f}s timeout")
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise gspread.exceptions.APIError(_FakeResponse(self.failure_status))
+
+
+def _column_index(letters: str) -> int:
+    """Convert A1 column letters to a zero-based index"""
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+def _parse_a1_range(a1_range: str, default_cols: int):
+    """Parse 'A2:O10' / 'A2:O' / '2:10' into zero-based (row_start, row_end, col_start, col_end)"""
+    start, _, end = a1_range.partition(':')
+    end = end or start
+
+    def split(cell):
+        letters = ''.join(ch for ch in cell if ch.isalpha())
+        digits = ''.join(ch for ch in cell if ch.isdigit())
+        return letters, (int(digits) if digits else None)
+
+    start_col, start_row = split(start)
+    end_col, end_row = split(end)
+    return (
+        (start_row or 1) - 1,
+        end_row,
+        _column_index(start_col) if start_col else 0,
+        _column_index(end_col) + 1 if end_col else default_cols
+    )
+
+
+class FakeWorksheet:
+    """In-memory worksheet implementing the gspread calls the backend uses"""
+
+    def __init__(self, title: str, rows: int, cols: int, config: FakeSheetsConfig):
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self._config = config
+        self._rows: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def _set_cells(self, row_start: int, col_start: int, values: List[List[Any]]) -> None:
+        for offset, values_row in enumerate(values):
+            row_index = row_start + offset
+            while len(self._rows) <= row_index:
+                self._rows.append([])
+            row = self._rows[row_index]
+            needed = col_start + len(values_row)
+            if len(row) < needed:
+                row.extend([''] * (needed - len(row)))
+            for col_offset, value in enumerate(values_row):
+                row[col_start + col_offset] = '' if value is None else str(value)
+
+    def append_row(self, values: List[Any], **kwargs) -> Dict[str, Any]:
+        self._config.simulate_call()
+        with self._lock:
+            self._set_cells(len(self._rows), 0, [values])
+            row_number = len(self._rows)
+            self.row_count = max(self.row_count, row_number)
+        return {'updates': {'updatedRange': f"{self.title}!A{row_number}"}}
+
+    def append_rows(self, values: List[List[Any]], **kwargs) -> Dict[str, Any]:
+        self._config.simulate_call()
+        with self._lock:
+            first = len(self._rows) + 1
+            self._set_cells(len(self._rows), 0, values)
+            self.row_count = max(self.row_count, len(self._rows))
+        return {'updates': {'updatedRange': f"{self.title}!A{first}:A{len(self._rows)}"}}
+
+    def update(self, a1_range: str, values: List[List[Any]], **kwargs) -> Dict[str, Any]:
+        self._config.simulate_call()
+        row_start, _, col_start, _ = _parse_a1_range(a1_range, self.col_count)
+        with self._lock:
+            self._set_cells(row_start, col_start, values)
+        return {'updatedRange': f"{self.title}!{a1_range}"}
+
+    def format(self, a1_range: str, cell_format: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self._config.simulate_call()
+        return {}
+
+    def get_all_values(self, **kwargs) -> List[List[str]]:
+        self._config.simulate_call()
+        with self._lock:
+            return [list(row) for row in self._rows]
+
+    def get(self, a1_range: str, **kwargs) -> List[List[str]]:
+        self._config.simulate_call()
+        return self._read_range(a1_range)
+
+    def batch_get(self, ranges: List[str], **kwargs) -> List[List[List[str]]]:
+        self._config.simulate_call()
+        return [self._read_range(a1_range) for a1_range in ranges]
+
+    def _read_range(self, a1_range: str) -> List[List[str]]:
+        row_start, row_end, col_start, col_end = _parse_a1_range(a1_range, self.col_count)
+        with self._lock:
+            rows = self._rows[row_start:row_end]
+            return [row[col_start:col_end] for row in rows]
+
+
+class FakeSpreadsheet:
+    """In-memory spreadsheet holding FakeWorksheets"""
+
+    def __init__(self, key: str, config: FakeSheetsConfig):
+        self.id = key
+        self.title = f"Fake ACS Spreadsheet ({key})"
+        self.url = f"https://docs.google.com/spreadsheets/d/{key}"
+        self._config = config
+        self._worksheets: Dict[str, FakeWorksheet] = {}
+        self._lock = threading.Lock()
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self._config.simulate_call()
+        with self._lock:
+            if title not in self._worksheets:
+                raise gspread.WorksheetNotFound(title)
+            return self._worksheets[title]
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        self._config.simulate_call()
+        with self._lock:
+            return list(self._worksheets.values())
+
+    def add_worksheet(self, title: str, rows: int, cols: int, **kwargs) -> FakeWorksheet:
+        self._config.simulate_call()
+        with self._lock:
+            if title in self._worksheets:
+                raise gspread.exceptions.APIError(_FakeResponse(400))
+            worksheet = FakeWorksheet(title, rows, cols, self._config)
+            self._worksheets[title] = worksheet
+            return worksheet
+
+
+class FakeSheetsClient:
+    """Stand-in for an authorized gspread client"""
+
+    # Spreadsheets persist for the life of the process, like a real remote store
+    _spreadsheets: Dict[str, FakeSpreadsheet] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, config: Optional[FakeSheetsConfig] = None):
+        self.config = config or FakeSheetsConfig.from_env()
+        self.timeout = None
+
+    def set_timeout(self, timeout: Optional[float]) -> None:
+        self.timeout = timeout
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        self.config.simulate_call()
+        with self._lock:
+            if key not in self._spreadsheets:
+                self._spreadsheets[key] = FakeSpreadsheet(key, self.config)
+            return self._spreadsheets[key]
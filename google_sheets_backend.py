@@ -5,18 +5,127 @@ This file handles the backend configuration and integration with Google Sheets
 """
 
 import os
+import re
 import json
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 import gspread
+import requests
 from google.oauth2.service_account import Credentials
 from google.auth.exceptions import GoogleAuthError
+import deadlines
+from metrics import REGISTRY
+from sheets_scheduler import PRIORITY_INFO, PRIORITY_READ, PRIORITY_WRITE, get_scheduler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SHEETS_CALL_SECONDS = REGISTRY.histogram(
+    'acs_sheets_call_duration_seconds', 'Latency of Google Sheets API calls', ['operation'])
+SHEETS_CALL_ERRORS = REGISTRY.counter(
+    'acs_sheets_call_errors_total', 'Failed Google Sheets API calls', ['operation'])
+SHEETS_CALL_TIMEOUTS = REGISTRY.counter(
+    'acs_sheets_call_timeouts_total', 'Google Sheets calls that timed out or ran out of request deadline',
+    ['operation', 'reason'])
+
+# Socket timeout per Sheets call; ACS_SHEETS_TIMEOUT_<OPERATION> (e.g. ..._APPEND_ROW) overrides one operation
+DEFAULT_CALL_TIMEOUT = float(os.getenv('ACS_SHEETS_TIMEOUT_SECONDS', '10'))
+
+# Calculation fields in worksheet column order (A..O), keyed as sent by the frontend
+CALCULATION_FIELDS = [
+    'timestamp', 'clientName', 'jobLink', 'atsName', 'pages', 'timeToFill', 'documents',
+    'loginRequired', 'acsScore', 'rawScore', 'adjustedScore', 'pageScore', 'timeScore',
+    'documentScore', 'loginMultiplier'
+]
+LAST_COLUMN = 'O'
+
+# Incremental reads fetch this many rows per range, several ranges per batch_get call
+READ_RANGE_ROWS = 500
+READ_RANGES_PER_CALL = 4
+
+# Scheduler lane per Sheets operation; callers can override (e.g. informational reads)
+OPERATION_PRIORITIES = {
+    'append_row': PRIORITY_WRITE,
+    'update': PRIORITY_WRITE,
+    'format': PRIORITY_WRITE,
+    'add_worksheet': PRIORITY_WRITE
+}
+# Appends are not safe to repeat after a server error
+NON_IDEMPOTENT_OPERATIONS = {'append_row', 'add_worksheet'}
+
+# Calculations are sharded into one worksheet per period, listed in a small index sheet
+PARTITION_FORMATS = {'monthly': '%Y-%m', 'yearly': '%Y'}
+PARTITION_INDEX_SHEET = 'ACS_Partitions'
+PARTITION_INDEX_HEADERS = ['Period', 'Worksheet', 'Rows', 'Created']
+# Pre-partitioning worksheet, kept readable as the oldest partition
+LEGACY_PERIOD = 'legacy'
+
+_UPDATED_ROW = re.compile(r'![A-Z]+(\d+)(?::[A-Z]+(\d+))?$')
+
+
+def build_calculation_row(acs_data: Dict[str, Any]) -> list:
+    """Worksheet row for an ACS calculation"""
+    row = [acs_data.get(field, '') for field in CALCULATION_FIELDS]
+    row[0] = acs_data.get('timestamp', datetime.now().isoformat())
+    return row
+
+
+def operation_timeout(operation: str) -> Optional[float]:
+    """Per-call timeout for a Sheets operation (0 in the environment disables it)"""
+    value = os.getenv(f'ACS_SHEETS_TIMEOUT_{operation.upper()}')
+    timeout = float(value) if value else DEFAULT_CALL_TIMEOUT
+    return timeout if timeout > 0 else None
+
+
+class SheetsCallTimeout(TimeoutError):
+    """A Sheets call got no response within its timeout"""
+
+
+class DeadlineClient(gspread.Client):
+    """gspread client whose HTTP timeout follows the current call (see deadlines.call_timeout)"""
+    
+    @property
+    def timeout(self):
+        call_timeout = deadlines.current_call_timeout()
+        return call_timeout if call_timeout is not None else self._default_timeout
+    
+    @timeout.setter
+    def timeout(self, value):
+        # Client.__init__ and set_timeout() set the fallback for calls made outside _sheets_call
+        self._default_timeout = value
+
+
+def appended_row_number(response) -> Optional[int]:
+    """Last row written by an append, from the API's updatedRange (e.g. "'Sheet'!A5:O5")"""
+    try:
+        match = _UPDATED_ROW.search(response['updates']['updatedRange'])
+    except (KeyError, TypeError):
+        return None
+    if not match:
+        return None
+    return int(match.group(2) or match.group(1))
+
+
+def partition_overlaps(period: Optional[str], date_from: Optional[str] = None, date_to: Optional[str] = None) -> bool:
+    """Whether a partition period ('YYYY-MM' or 'YYYY') can hold rows dated within [date_from, date_to]"""
+    if period is None or period == LEGACY_PERIOD:
+        return True
+    if date_from and period < date_from[:len(period)]:
+        return False
+    if date_to and period > date_to[:len(period)]:
+        return False
+    return True
+
+
+def partition_sort_key(period: Optional[str]):
+    """Oldest first, with the legacy worksheet ahead of every dated period"""
+    return (period not in (None, LEGACY_PERIOD), period or '')
+
+
 class GoogleSheetsBackend:
     """
     Backend class for Google Sheets integration
@@ -31,7 +140,20 @@ class GoogleSheetsBackend:
         self.is_configured = False
         self.gc = None  # gspread client
         self.spreadsheet = None
-        self.worksheet = None
+        self.worksheet = None  # worksheet that new calculations are appended to
+        # Period partitioning: 'monthly' (default), 'yearly' or 'none' for a single worksheet
+        self.partitioning = os.getenv('ACS_SHEETS_PARTITION', 'monthly').lower()
+        if self.partitioning not in PARTITION_FORMATS:
+            self.partitioning = 'none'
+        self.partitions: Dict[str, Dict[str, Any]] = {}  # period -> index entry
+        self.current_period = None
+        self.index_worksheet = None
+        self._worksheets: Dict[str, Any] = {}  # title -> opened worksheet
+        self._partition_lock = threading.RLock()
+        # Shared quota gate for every Sheets API call (see sheets_scheduler.py)
+        self.scheduler = get_scheduler()
+        # In-memory stand-in for load testing (see fake_sheets_backend.py)
+        self.use_fake = os.getenv('ACS_FAKE_SHEETS', '').lower() in ('1', 'true', 'yes')
         
         # Load configuration from environment or config file
         self.load_configuration()
@@ -43,6 +165,14 @@ class GoogleSheetsBackend:
     def load_configuration(self):
         """Load Google Sheets configuration from environment variables or config file"""
         try:
+            if self.use_fake:
+                self.service_account_email = 'fake-sheets@localhost'
+                self.private_key = 'fake'
+                self.spreadsheet_id = os.getenv('GOOGLE_SHEETS_SPREADSHEET_ID', 'fake-spreadsheet')
+                self.is_configured = True
+                logger.info("Using fake in-memory Google Sheets client")
+                return
+            
             # Try environment variables first
             self.service_account_email = os.getenv('GOOGLE_SHEETS_SERVICE_ACCOUNT_EMAIL')
             self.private_key = os.getenv('GOOGLE_SHEETS_PRIVATE_KEY')
@@ -78,42 +208,43 @@ class GoogleSheetsBackend:
         except Exception as e:
             logger.error(f"Error loading config file: {e}")
     
+    def authorize_client(self):
+        """Create an authorized gspread client from the service account"""
+        # Create credentials from service account
+        credentials = Credentials.from_service_account_info({
+            "type": "service_account",
+            "project_id": "acs-calculator-project",
+            "private_key_id": "key_id_from_json",
+            "private_key": self.private_key,
+            "client_email": self.service_account_email,
+            "client_id": "client_id_from_json",
+            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+            "token_uri": "https://oauth2.googleapis.com/token",
+            "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+            "client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{self.service_account_email}"
+        }, scopes=['https://www.googleapis.com/auth/spreadsheets'])
+        
+        # Create gspread client
+        client = gspread.authorize(credentials, client_factory=DeadlineClient)
+        client.set_timeout(DEFAULT_CALL_TIMEOUT or None)
+        return client
+    
     def initialize_google_sheets(self):
         """Initialize Google Sheets connection using gspread"""
         try:
-            # Create credentials from service account
-            credentials = Credentials.from_service_account_info({
-                "type": "service_account",
-                "project_id": "acs-calculator-project",
-                "private_key_id": "key_id_from_json",
-                "private_key": self.private_key,
-                "client_email": self.service_account_email,
-                "client_id": "client_id_from_json",
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-                "client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{self.service_account_email}"
-            }, scopes=['https://www.googleapis.com/auth/spreadsheets'])
-            
-            # Create gspread client
-            self.gc = gspread.authorize(credentials)
+            if self.use_fake:
+                from fake_sheets_backend import FakeSheetsClient
+                self.gc = FakeSheetsClient()
+            else:
+                self.gc = self.authorize_client()
             
             # Open spreadsheet
-            self.spreadsheet = self.gc.open_by_key(self.spreadsheet_id)
+            self.spreadsheet = self._sheets_call('open_by_key', self.gc.open_by_key, self.spreadsheet_id)
             
-            # Get or create worksheet
-            try:
-                self.worksheet = self.spreadsheet.worksheet(self.sheet_name)
-                logger.info(f"Connected to existing worksheet: {self.sheet_name}")
-            except gspread.WorksheetNotFound:
-                # Create new worksheet with headers
-                self.worksheet = self.spreadsheet.add_worksheet(
-                    title=self.sheet_name, 
-                    rows=1000, 
-                    cols=20
-                )
-                self.setup_headers()
-                logger.info(f"Created new worksheet: {self.sheet_name}")
+            if self.partitioning == 'none':
+                self.worksheet = self._open_or_create_worksheet(self.sheet_name)
+            else:
+                self.initialize_partitions()
             
             logger.info("Google Sheets connection established successfully")
             
@@ -124,9 +255,205 @@ class GoogleSheetsBackend:
             logger.error(f"Error initializing Google Sheets: {e}")
             self.is_configured = False
     
-    def setup_headers(self):
+    def _open_or_create_worksheet(self, title: str, headers: Optional[List[str]] = None, rows: int = 1000,
+                                  cols: int = 20, create: bool = True):
+        """Open a worksheet by title, creating it with headers if it doesn't exist"""
+        if title in self._worksheets:
+            return self._worksheets[title]
+        try:
+            worksheet = self._sheets_call('worksheet', self.spreadsheet.worksheet, title)
+            logger.info(f"Connected to existing worksheet: {title}")
+        except gspread.WorksheetNotFound:
+            if not create:
+                return None
+            try:
+                # Create new worksheet with headers
+                worksheet = self._sheets_call(
+                    'add_worksheet',
+                    self.spreadsheet.add_worksheet,
+                    title=title,
+                    rows=rows,
+                    cols=cols
+                )
+            except gspread.exceptions.APIError:
+                # Another instance created it first
+                worksheet = self._sheets_call('worksheet', self.spreadsheet.worksheet, title)
+            else:
+                self.setup_headers(worksheet, headers)
+                logger.info(f"Created new worksheet: {title}")
+        self._worksheets[title] = worksheet
+        return worksheet
+    
+    def initialize_partitions(self):
+        """Open the partition index, register the legacy worksheet and open the current partition"""
+        self.index_worksheet = self._open_or_create_worksheet(
+            PARTITION_INDEX_SHEET, PARTITION_INDEX_HEADERS, rows=100, cols=len(PARTITION_INDEX_HEADERS))
+        self.load_partition_index()
+        
+        if LEGACY_PERIOD not in self.partitions:
+            legacy = self._open_or_create_worksheet(self.sheet_name, create=False)
+            if legacy is not None:
+                # Nothing is appended to the single worksheet any more, so its size is final
+                self._register_partition(LEGACY_PERIOD, self.sheet_name, self._count_worksheet_rows(legacy))
+        
+        self.ensure_current_partition()
+    
+    def load_partition_index(self):
+        """Read the partition index sheet into self.partitions"""
+        rows = self._sheets_call('get_all_values', self.index_worksheet.get_all_values)
+        partitions = {}
+        for index_row, row in enumerate(rows[1:], start=2):
+            row = list(row) + [''] * (len(PARTITION_INDEX_HEADERS) - len(row))
+            period, title, row_count, created = row[:4]
+            # Two instances can race to register a period; the first entry wins
+            if not period or not title or period in partitions:
+                continue
+            partitions[period] = {
+                'period': period,
+                'worksheet': title,
+                'rows': int(row_count) if str(row_count).isdigit() else None,
+                'created': created,
+                'index_row': index_row
+            }
+        with self._partition_lock:
+            self.partitions = dict(sorted(partitions.items(), key=lambda item: partition_sort_key(item[0])))
+    
+    def _register_partition(self, period: str, title: str, rows: Optional[int] = None):
+        """Add a partition to the index sheet"""
+        created = datetime.now().isoformat()
+        response = self._sheets_call(
+            'append_row', self.index_worksheet.append_row, [period, title, '' if rows is None else rows, created])
+        with self._partition_lock:
+            self.partitions[period] = {
+                'period': period,
+                'worksheet': title,
+                'rows': rows,
+                'created': created,
+                'index_row': appended_row_number(response)
+            }
+            self.partitions = dict(sorted(self.partitions.items(), key=lambda item: partition_sort_key(item[0])))
+        logger.info(f"Registered partition {period} -> {title}")
+    
+    def partition_title(self, period: str) -> str:
+        """Worksheet title for a period, e.g. ACS_Calculations_2025_08"""
+        return f"{self.sheet_name}_{period.replace('-', '_')}"
+    
+    def current_partition_period(self) -> str:
+        return datetime.now().strftime(PARTITION_FORMATS[self.partitioning])
+    
+    def ensure_current_partition(self):
+        """Worksheet for the current period, rolling over (and sealing the previous one) when it changes"""
+        if self.partitioning == 'none':
+            return self.worksheet
+        period = self.current_partition_period()
+        if period == self.current_period:
+            return self.worksheet
+        with self._partition_lock:
+            if period == self.current_period:
+                return self.worksheet
+            previous = self.current_period
+            if period not in self.partitions:
+                # Another instance may already have rolled over
+                self.load_partition_index()
+            entry = self.partitions.get(period)
+            title = entry['worksheet'] if entry else self.partition_title(period)
+            worksheet = self._open_or_create_worksheet(title)
+            if entry is None:
+                self._register_partition(period, title)
+            if previous is not None:
+                self.seal_partition(previous)
+            self.worksheet, self.current_period = worksheet, period
+        return worksheet
+    
+    def seal_partition(self, period: str):
+        """Record the final row count of a closed partition so it never has to be counted again"""
+        entry = self.partitions.get(period)
+        if entry is None or entry['rows'] is not None:
+            return
+        try:
+            rows = self._count_worksheet_rows(self.worksheet_by_title(entry['worksheet']))
+            if entry.get('index_row'):
+                self._sheets_call('update', self.index_worksheet.update, f"C{entry['index_row']}", [[rows]])
+            entry['rows'] = rows
+            logger.info(f"Sealed partition {period} at {rows} rows")
+        except Exception as e:
+            logger.error(f"Error sealing partition {period}: {e}")
+    
+    def _count_worksheet_rows(self, worksheet, priority: Optional[int] = None) -> int:
+        """Rows in use (including the header row), reading only column A"""
+        return len(self._sheets_call('get', worksheet.get, 'A:A', priority=priority))
+    
+    def worksheet_by_title(self, title: Optional[str]):
+        """Opened worksheet for a partition title (the write worksheet when title is None)"""
+        if title is None or (self.worksheet is not None and title == self.worksheet.title):
+            return self.worksheet
+        return self._open_or_create_worksheet(title, create=False)
+    
+    def list_partitions(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Partitions (oldest first) that can hold rows dated within the range"""
+        if self.partitioning == 'none':
+            return [{'period': None, 'worksheet': self.sheet_name, 'rows': None}] if self.worksheet else []
+        with self._partition_lock:
+            entries = list(self.partitions.values())
+        return [
+            {'period': entry['period'], 'worksheet': entry['worksheet'], 'rows': entry['rows']}
+            for entry in entries if partition_overlaps(entry['period'], date_from, date_to)
+        ]
+    
+    def count_rows(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> int:
+        """Calculation rows (excluding headers) in the partitions covering the date range"""
+        total = 0
+        for partition in self.list_partitions(date_from, date_to):
+            rows = partition['rows']
+            if rows is None:
+                worksheet = self.worksheet_by_title(partition['worksheet'])
+                rows = self._count_worksheet_rows(worksheet, priority=PRIORITY_INFO) if worksheet else 0
+            total += max(0, rows - 1)
+        return total
+    
+    def _sheets_call(self, operation: str, func, *args, priority: Optional[int] = None, **kwargs):
+        """
+        Run a Google Sheets API call through the scheduler, recording its latency and failures
+        
+        Each attempt gets the operation's timeout, cut short by the request deadline
+        if one is set. Timeouts raise TimeoutError (DeadlineExceeded or SheetsCallTimeout)
+        and are counted apart from other errors.
+        """
+        if priority is None:
+            priority = OPERATION_PRIORITIES.get(operation, PRIORITY_READ)
+        timeout = operation_timeout(operation)
+        
+        def timed_call(*call_args, **call_kwargs):
+            # Timeout is taken after the quota wait so it reflects the deadline left at send time
+            with deadlines.call_timeout(timeout, f"Sheets {operation}"):
+                return func(*call_args, **call_kwargs)
+        
+        start = time.perf_counter()
+        try:
+            return self.scheduler.call(
+                timed_call, *args, priority=priority, operation=operation,
+                idempotent=operation not in NON_IDEMPOTENT_OPERATIONS, **kwargs
+            )
+        except deadlines.DeadlineExceeded:
+            SHEETS_CALL_TIMEOUTS.inc(operation=operation, reason='deadline')
+            raise
+        except requests.exceptions.Timeout as e:
+            left = deadlines.remaining()
+            if left is not None and left <= 0:
+                SHEETS_CALL_TIMEOUTS.inc(operation=operation, reason='deadline')
+                raise SheetsCallTimeout(f"Sheets {operation} got no response before the request deadline") from e
+            SHEETS_CALL_TIMEOUTS.inc(operation=operation, reason='call_timeout')
+            raise SheetsCallTimeout(f"Sheets {operation} got no response within {timeout}s") from e
+        except Exception:
+            SHEETS_CALL_ERRORS.inc(operation=operation)
+            raise
+        finally:
+            SHEETS_CALL_SECONDS.observe(time.perf_counter() - start, operation=operation)
+    
+    def setup_headers(self, worksheet=None, headers: Optional[List[str]] = None):
         """Set up column headers for the ACS data"""
-        headers = [
+        worksheet = worksheet or self.worksheet
+        headers = headers or [
             'Timestamp',
             'Client Name',
             'Job Link',
@@ -145,8 +472,9 @@ class GoogleSheetsBackend:
         ]
         
         try:
-            self.worksheet.update('A1:O1', [headers])
-            self.worksheet.format('A1:O1', {
+            header_range = f"A1:{chr(ord('A') + len(headers) - 1)}1"
+            self._sheets_call('update', worksheet.update, header_range, [headers])
+            self._sheets_call('format', worksheet.format, header_range, {
                 'textFormat': {'bold': True},
                 'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
             })
@@ -189,6 +517,8 @@ class GoogleSheetsBackend:
             'has_spreadsheet_id': bool(self.spreadsheet_id),
             'spreadsheet_id': self.spreadsheet_id if self.is_configured else None,
             'worksheet_name': self.sheet_name if self.is_configured else None,
+            'partitioning': self.partitioning,
+            'current_partition': self.worksheet.title if self.worksheet else None,
             'connection_status': 'Connected' if self.worksheet else 'Not Connected'
         }
     
@@ -205,29 +535,16 @@ class GoogleSheetsBackend:
         
         try:
             # Prepare data row
-            row_data = [
-                acs_data.get('timestamp', datetime.now().isoformat()),
-                acs_data.get('clientName', ''),
-                acs_data.get('jobLink', ''),
-                acs_data.get('atsName', ''),
-                acs_data.get('pages', ''),
-                acs_data.get('timeToFill', ''),
-                acs_data.get('documents', ''),
-                acs_data.get('loginRequired', ''),
-                acs_data.get('acsScore', ''),
-                acs_data.get('rawScore', ''),
-                acs_data.get('adjustedScore', ''),
-                acs_data.get('pageScore', ''),
-                acs_data.get('timeScore', ''),
-                acs_data.get('documentScore', ''),
-                acs_data.get('loginMultiplier', '')
-            ]
+            row_data = build_calculation_row(acs_data)
             
-            # Append row to worksheet
-            self.worksheet.append_row(row_data)
+            # Append row to the current period's worksheet
+            worksheet = self.ensure_current_partition()
+            response = self._sheets_call('append_row', worksheet.append_row, row_data)
             
-            # Get the row number (last row)
-            row_number = len(self.worksheet.get_all_values())
+            # Row number comes back with the append; only fall back to counting if it doesn't
+            row_number = appended_row_number(response)
+            if row_number is None:
+                row_number = self._count_worksheet_rows(worksheet, priority=PRIORITY_WRITE)
             
             logger.info(f"ACS calculation data stored successfully in row {row_number}")
             
@@ -235,9 +552,23 @@ class GoogleSheetsBackend:
                 'success': True,
                 'message': 'Data stored in Google Sheets',
                 'row_number': row_number,
+                'worksheet': worksheet.title,
+                'row_data': row_data,
                 'timestamp': datetime.now().isoformat()
             }
             
+        except TimeoutError as e:
+            # An append that timed out in flight may still have been written
+            outcome_unknown = isinstance(e, SheetsCallTimeout)
+            logger.warning(f"Timed out storing ACS calculation: {e}")
+            return {
+                'success': False,
+                'timed_out': True,
+                'outcome_unknown': outcome_unknown,
+                'message': ('Google Sheets did not respond in time; the calculation may not have been stored'
+                            if outcome_unknown else 'Google Sheets is busy; the calculation was not stored'),
+                'data_stored_locally': True
+            }
         except Exception as e:
             logger.error(f"Error storing ACS calculation: {e}")
             return {
@@ -246,20 +577,55 @@ class GoogleSheetsBackend:
                 'data_stored_locally': True
             }
     
+    def read_rows_after(self, after_row: int, worksheet_title: Optional[str] = None) -> list:
+        """
+        Read every row below after_row using ranged batch reads
+        
+        Reads the given partition worksheet (default: the current one). Returns rows
+        in order starting at row after_row + 1; fully empty rows inside the data
+        come back as empty lists.
+        """
+        worksheet = self.worksheet_by_title(worksheet_title)
+        if not worksheet:
+            return []
+        
+        rows = []
+        start = after_row + 1
+        while True:
+            ranges = [
+                f"A{start + i * READ_RANGE_ROWS}:{LAST_COLUMN}{start + (i + 1) * READ_RANGE_ROWS - 1}"
+                for i in range(READ_RANGES_PER_CALL)
+            ]
+            blocks = self._sheets_call('batch_get', worksheet.batch_get, ranges)
+            for block in blocks:
+                rows.extend(list(row) for row in block)
+                # A short block means we ran past the last row with data
+                if len(block) < READ_RANGE_ROWS:
+                    return rows
+            start += READ_RANGE_ROWS * READ_RANGES_PER_CALL
+    
     def get_spreadsheet_info(self) -> Dict[str, Any]:
         """Get information about the connected spreadsheet"""
         if not self.spreadsheet:
             return {'error': 'Not connected to spreadsheet'}
         
         try:
-            return {
+            info = {
                 'title': self.spreadsheet.title,
                 'url': self.spreadsheet.url,
-                'worksheet_name': self.sheet_name,
-                'total_rows': len(self.worksheet.get_all_values()) if self.worksheet else 0
+                'worksheet_name': self.worksheet.title if self.worksheet else self.sheet_name,
+                'partitions': self.list_partitions()
             }
         except Exception as e:
             return {'error': str(e)}
+        try:
+            info['total_rows'] = self.count_rows()
+        except TimeoutError as e:
+            # Everything but the row count is known locally; answer without it
+            info.update(total_rows=None, degraded=True, error=str(e))
+        except Exception as e:
+            return {'error': str(e)}
+        return info
 
 def main():
     """Main function to test the backend configuration"""
@@ -16,6 +16,8 @@ def check_health():
         "/acs_calculator.css", 
         "/acs_calculator.js",
         "/status",
+        "/healthz",
+        "/ready",
         "/spreadsheet-info",
         "/get-all-clients",
         "/joveo_logo.jpg"
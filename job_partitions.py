@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Dated Job Export Partitions
+Discovers timestamped job export files (e.g. "2025-08-29 3_39pm.csv") in a data directory
+"""
+
+import logging
+import os
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_DATA_DIR = os.path.join('data', 'jobs')
+
+# "2025-08-29 3_39pm.csv", "2025-08-29_15-39.csv", "2025-08-29.csv", "jobs_2025-08-29.csv"
+_PARTITION_NAME = re.compile(
+    r'(\d{4}-\d{2}-\d{2})(?:[ _T]+(\d{1,2})[_:\-.](\d{2})\s*([ap]m)?)?',
+    re.IGNORECASE
+)
+
+
+class JobPartition:
+    """One dated job export file"""
+
+    def __init__(self, name: str, path: str, timestamp: datetime):
+        self.name = name
+        self.path = path
+        self.timestamp = timestamp
+
+    def __repr__(self) -> str:
+        return f"JobPartition({self.name!r}, {self.timestamp.isoformat()})"
+
+
+def parse_partition_timestamp(file_name: str) -> Optional[datetime]:
+    """Export timestamp encoded in a file name, or None if it has no valid date (and time, if one is given)"""
+    match = _PARTITION_NAME.search(file_name)
+    if not match:
+        return None
+    date, hour, minute, meridiem = match.groups()
+    try:
+        timestamp = datetime.strptime(date, '%Y-%m-%d')
+    except ValueError:
+        return None
+    if hour is not None:
+        hour, minute = int(hour), int(minute)
+        if minute >= 60 or not (1 <= hour <= 12 if meridiem else hour < 24):
+            # Falling back to midnight would misorder same-day exports; skip the file instead
+            logger.warning(f"Ignoring job export {file_name!r}: invalid time in file name")
+            return None
+        if meridiem:
+            hour = hour % 12 + (12 if meridiem.lower() == 'pm' else 0)
+        timestamp = timestamp.replace(hour=hour, minute=minute)
+    return timestamp
+
+
+def discover_partitions(directory: str, retention_days: Optional[float] = None) -> List[JobPartition]:
+    """
+    Dated CSV exports in a directory, oldest first
+
+    With a retention window, only partitions within that many days of the newest
+    partition are returned, so data doesn't age out just because exports stop.
+    """
+    if not directory or not os.path.isdir(directory):
+        return []
+    partitions = []
+    for file_name in os.listdir(directory):
+        if not file_name.lower().endswith('.csv'):
+            continue
+        timestamp = parse_partition_timestamp(file_name)
+        if timestamp is None:
+            continue
+        partitions.append(JobPartition(file_name, os.path.join(directory, file_name), timestamp))
+    partitions.sort(key=lambda partition: (partition.timestamp, partition.name))
+
+    if retention_days and partitions:
+        cutoff = partitions[-1].timestamp - timedelta(days=retention_days)
+        partitions = [partition for partition in partitions if partition.timestamp >= cutoff]
+    return partitions
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Memory Monitoring for ACS Calculator
+Deep size accounting for loaded data, process RSS, tracemalloc sites and a soft memory budget
+"""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+import types
+from typing import Callable, Dict, List, Optional, Tuple
+
+from metrics import REGISTRY
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# PM2 restarts the app at 1G (ecosystem.config.js); shed caches well before that
+DEFAULT_SOFT_LIMIT_MB = 800
+DEFAULT_CHECK_SECONDS = 15.0
+# Objects visited per deep_sizeof call before giving up and reporting a lower bound
+MAX_VISITED_OBJECTS = 2_000_000
+
+PROCESS_RSS_BYTES = REGISTRY.gauge(
+    'acs_process_resident_memory_bytes', 'Resident set size of the server process')
+MEMORY_SOFT_LIMIT_BYTES = REGISTRY.gauge(
+    'acs_memory_soft_limit_bytes', 'Soft memory budget above which caches are shed')
+CACHE_SHEDS = REGISTRY.counter(
+    'acs_memory_cache_sheds_total', 'Caches dropped because the soft memory budget was exceeded', ['cache'])
+
+_OPAQUE_TYPES = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType,
+                 logging.Logger, type(threading.Lock()))
+
+
+def deep_sizeof(obj, _seen: Optional[set] = None) -> int:
+    """
+    Approximate bytes reachable from obj
+
+    DataFrames and numpy arrays report their own buffers (including Python
+    string objects for object columns); containers and plain objects are walked.
+    Objects shared between structures are only counted once per call.
+    """
+    seen = set() if _seen is None else _seen
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        if len(seen) > MAX_VISITED_OBJECTS:
+            break
+
+        # Avoid importing pandas/numpy here; recognise them by their sizing methods
+        if callable(getattr(current, 'memory_usage', None)) and hasattr(current, 'index'):
+            usage = current.memory_usage(deep=True, index=True)  # DataFrame: per column; Series: total
+            total += int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+            continue
+        if hasattr(current, 'nbytes') and hasattr(current, 'dtype'):
+            total += int(current.nbytes)
+            if current.dtype == object:
+                stack.extend(current.ravel().tolist())
+            continue
+
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif isinstance(current, (str, bytes, int, float, bool, type(None))):
+            continue
+        elif isinstance(current, _OPAQUE_TYPES):
+            # Don't follow references into code, classes or modules
+            continue
+        elif hasattr(current, '__dict__'):
+            stack.append(vars(current))
+    return total
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Current resident set size, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # Peak rather than current RSS: kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, ValueError):
+        return None
+
+
+def release_free_memory() -> None:
+    """Ask glibc to return freed heap pages to the OS so RSS reflects what was shed"""
+    try:
+        import ctypes
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def tracemalloc_top(limit: int = 15) -> Dict:
+    """Top allocation sites by size, if tracemalloc is tracing"""
+    if not tracemalloc.is_tracing():
+        return {'tracing': False, 'hint': 'Set ACS_TRACEMALLOC=1 (or a frame count) to trace allocations from startup'}
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        'tracing': True,
+        'traced_bytes': current,
+        'traced_peak_bytes': peak,
+        'top': [
+            {'site': str(stat.traceback[0]), 'size_bytes': stat.size, 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:limit]
+        ]
+    }
+
+
+def start_tracemalloc_from_env() -> None:
+    """Start tracemalloc at boot when ACS_TRACEMALLOC is set (1/true or a frame count)"""
+    value = os.getenv('ACS_TRACEMALLOC', '').strip().lower()
+    if not value or value in ('0', 'false', 'no', 'off') or tracemalloc.is_tracing():
+        return
+    frames = int(value) if value.isdigit() and int(value) > 1 else 1
+    tracemalloc.start(frames)
+    logger.info(f"tracemalloc started with {frames} frame(s)")
+
+
+class MemoryBudget:
+    """
+    Soft memory budget enforced by shedding registered caches
+
+    A background thread samples RSS. When it exceeds the soft limit, caches are
+    dropped in registration order until RSS is back under the limit. Caches
+    rebuild themselves lazily on next use.
+    """
+
+    def __init__(self, soft_limit_bytes: Optional[int], check_interval: float = DEFAULT_CHECK_SECONDS):
+        self.soft_limit_bytes = soft_limit_bytes
+        self.check_interval = check_interval
+        self.last_rss: Optional[int] = None
+        self.shed_counts: Dict[str, int] = {}
+        self._shedders: List[Tuple[str, Callable[[], bool]]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        if soft_limit_bytes:
+            MEMORY_SOFT_LIMIT_BYTES.set(soft_limit_bytes)
+
+    @classmethod
+    def from_env(cls) -> 'MemoryBudget':
+        """Budget from ACS_MEMORY_SOFT_LIMIT_MB (0 disables shedding) and ACS_MEMORY_CHECK_SECONDS"""
+        limit_mb = float(os.getenv('ACS_MEMORY_SOFT_LIMIT_MB', DEFAULT_SOFT_LIMIT_MB))
+        return cls(
+            soft_limit_bytes=int(limit_mb * 1024 * 1024) if limit_mb > 0 else None,
+            check_interval=float(os.getenv('ACS_MEMORY_CHECK_SECONDS', DEFAULT_CHECK_SECONDS))
+        )
+
+    def register(self, name: str, shed: Callable[[], bool]) -> None:
+        """
+        Register a cache that can be dropped under memory pressure (cheapest to rebuild first)
+
+        shed() returns False if the cache was already empty.
+        """
+        with self._lock:
+            self._shedders = [(n, s) for n, s in self._shedders if n != name] + [(name, shed)]
+
+    def check(self) -> List[str]:
+        """Sample RSS and shed caches if over budget; returns the caches shed"""
+        rss = process_rss_bytes()
+        self.last_rss = rss
+        if rss is not None:
+            PROCESS_RSS_BYTES.set(rss)
+        if not self.soft_limit_bytes or rss is None or rss <= self.soft_limit_bytes:
+            return []
+
+        with self._lock:
+            shedders = list(self._shedders)
+        shed = []
+        for name, shed_cache in shedders:
+            try:
+                if not shed_cache():
+                    continue
+            except Exception as e:
+                logger.error(f"Error shedding cache {name}: {e}")
+                continue
+            gc.collect()
+            release_free_memory()
+            shed.append(name)
+            CACHE_SHEDS.inc(cache=name)
+            self.shed_counts[name] = self.shed_counts.get(name, 0) + 1
+            rss = process_rss_bytes()
+            if rss is None or rss <= self.soft_limit_bytes:
+                break
+        self.last_rss = rss
+        if shed:
+            logger.warning(f"Memory over soft budget ({self.soft_limit_bytes // (1024 * 1024)} MB); "
+                           f"shed {', '.join(shed)}; RSS now {rss // (1024 * 1024) if rss else '?'} MB")
+        return shed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Memory budget check failed: {e}")
+
+    def start(self) -> threading.Thread:
+        """Start periodic budget checks in a daemon thread"""
+        thread = threading.Thread(target=self._run, name='acs-memory-budget', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def status(self) -> Dict:
+        with self._lock:
+            caches = [name for name, _ in self._shedders]
+        return {
+            'soft_limit_bytes': self.soft_limit_bytes,
+            'check_interval_seconds': self.check_interval,
+            'sheddable_caches': caches,
+            'shed_counts': dict(self.shed_counts)
+        }
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Request Profiling for ACS Calculator
+Opt-in cProfile/tracemalloc capture and cheap per-request phase timings
+"""
+
+import contextvars
+import cProfile
+import hmac
+import logging
+import os
+import random
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-ACS-Profile'
+PROFILE_MODE_HEADER = 'X-ACS-Profile-Mode'
+VALID_MODES = {'cpu', 'memory'}
+
+# Phase timer of the request currently being handled on this thread
+_current_timer = contextvars.ContextVar('acs_phase_timer', default=None)
+
+
+class PhaseTimer:
+    """Accumulates named phase durations for a single request"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def server_timing_header(self) -> str:
+        """Render recorded phases as a Server-Timing header value (milliseconds)"""
+        return ', '.join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items())
+
+
+@contextmanager
+def request_timer():
+    """Make a fresh PhaseTimer current for the duration of a request"""
+    timer = PhaseTimer()
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+@contextmanager
+def phase(name: str):
+    """Time a phase of the current request; a no-op outside of request_timer()"""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.phase(name):
+        yield
+
+
+def _parse_modes(value: Optional[str]) -> Set[str]:
+    """Parse 'cpu,memory' style mode lists; '1'/'true' means cpu"""
+    if not value:
+        return set()
+    value = value.strip().lower()
+    if value in ('0', 'false', 'no', 'off'):
+        return set()
+    if value in ('1', 'true', 'yes', 'on'):
+        return {'cpu'}
+    return {mode.strip() for mode in value.split(',') if mode.strip() in VALID_MODES}
+
+
+class RequestProfiler:
+    """
+    Wraps request handling in cProfile and/or tracemalloc when enabled
+
+    Enabled for a sampled fraction of requests via ACS_PROFILE, or for a single
+    request by sending the ACS_ADMIN_TOKEN in the X-ACS-Profile header.
+    """
+
+    def __init__(self, modes: Set[str], sample_rate: float, output_dir: str, admin_token: Optional[str]):
+        self.modes = modes
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.output_dir = output_dir
+        self.admin_token = admin_token
+        # cProfile and tracemalloc are process-wide, so only one capture runs at a time
+        self._busy = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'RequestProfiler':
+        """Build the profiler from ACS_PROFILE* environment variables"""
+        try:
+            sample_rate = float(os.getenv('ACS_PROFILE_SAMPLE_RATE', '1.0'))
+        except ValueError:
+            logger.warning("Invalid ACS_PROFILE_SAMPLE_RATE, defaulting to 1.0")
+            sample_rate = 1.0
+        return cls(
+            modes=_parse_modes(os.getenv('ACS_PROFILE')),
+            sample_rate=sample_rate,
+            output_dir=os.getenv('ACS_PROFILE_DIR', 'profiles'),
+            admin_token=os.getenv('ACS_ADMIN_TOKEN') or None
+        )
+
+    def modes_for_request(self, headers) -> Set[str]:
+        """Decide which profilers (if any) should run for a request"""
+        token = headers.get(PROFILE_HEADER) if headers is not None else None
+        if token and self.admin_token and hmac.compare_digest(token, self.admin_token):
+            return _parse_modes(headers.get(PROFILE_MODE_HEADER)) or {'cpu'}
+        if self.modes and random.random() < self.sample_rate:
+            return set(self.modes)
+        return set()
+
+    @contextmanager
+    def maybe_profile(self, route: str, headers):
+        """Profile the with-block if this request is selected"""
+        modes = self.modes_for_request(headers)
+        if not modes or not self._busy.acquire(blocking=False):
+            yield
+            return
+
+        profiler = cProfile.Profile() if 'cpu' in modes else None
+        started_tracemalloc = False
+        before = None
+        try:
+            if 'memory' in modes:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(25)
+                    started_tracemalloc = True
+                before = tracemalloc.take_snapshot()
+            if profiler:
+                profiler.enable()
+            try:
+                yield
+            finally:
+                if profiler:
+                    profiler.disable()
+                after = tracemalloc.take_snapshot() if before is not None else None
+                self._write_output(route, profiler, before, after)
+        finally:
+            if started_tracemalloc:
+                tracemalloc.stop()
+            self._busy.release()
+
+    def _write_output(self, route: str, profiler: Optional[cProfile.Profile], before, after) -> None:
+        """Write pstats and tracemalloc reports to the output directory"""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            slug = re.sub(r'[^A-Za-z0-9]+', '-', route).strip('-') or 'root'
+            stem = os.path.join(self.output_dir, f"{datetime.now().strftime('%Y%m%dT%H%M%S_%f')}_{slug}_{os.getpid()}")
+
+            if profiler:
+                # Load with pstats, snakeviz or flameprof to get a flamegraph
+                profiler.dump_stats(f"{stem}.pstats")
+                logger.info(f"CPU profile written to {stem}.pstats")
+
+            if after is not None:
+                stats = after.compare_to(before, 'traceback')
+                with open(f"{stem}.tracemalloc.txt", 'w') as f:
+                    f.write(f"Top allocation sites for {route}\n\n")
+                    for stat in stats[:25]:
+                        f.write(f"{stat}\n")
+                        for line in stat.traceback.format()[-6:]:
+                            f.write(f"    {line}\n")
+                        f.write("\n")
+                logger.info(f"Allocation trace written to {stem}.tracemalloc.txt")
+        except Exception as e:
+            logger.error(f"Error writing profile output: {e}")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Rolling Restart for ACS Calculator
+Starts a replacement server on the same port (SO_REUSEPORT), waits until it is warm, then drains the old one
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+DEFAULT_READY_FILE = os.path.join('logs', 'acs_ready.json')
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'acs_server.py')
+
+
+def read_ready_pid(ready_file):
+    """PID of the process that last announced it was ready, if any"""
+    try:
+        with open(ready_file, 'r') as f:
+            return json.load(f).get('pid')
+    except (OSError, ValueError):
+        return None
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replace a running acs_server.py without dropping requests')
+    parser.add_argument('--ready-file', default=os.getenv('ACS_READY_FILE', DEFAULT_READY_FILE),
+                        help='Ready file shared by the old and new server (ACS_READY_FILE)')
+    parser.add_argument('--old-pid', type=int, help='PID to replace (default: the PID in the ready file)')
+    parser.add_argument('--ready-timeout', type=float, default=300, help='Seconds to wait for the new server to warm up')
+    parser.add_argument('--stop-timeout', type=float, default=float(os.getenv('ACS_SHUTDOWN_TIMEOUT', '25')) + 10,
+                        help='Seconds to wait for the old server to drain and exit')
+    parser.add_argument('--log', default=os.path.join('logs', 'acs_server.log'), help='Output file for the new server')
+    args = parser.parse_args()
+
+    old_pid = args.old_pid or read_ready_pid(args.ready_file)
+    if old_pid and not process_alive(old_pid):
+        print(f"⚠️  Old server {old_pid} is not running; starting a new one only")
+        old_pid = None
+
+    env = dict(os.environ, ACS_REUSE_PORT='1', ACS_READY_FILE=args.ready_file)
+    log_dir = os.path.dirname(args.log)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+    with open(args.log, 'a') as log:
+        new_server = subprocess.Popen([sys.executable, SERVER_SCRIPT], env=env, stdout=log, stderr=subprocess.STDOUT,
+                                      start_new_session=True)
+    print(f"🚀 Started replacement server {new_server.pid}; waiting for it to warm up...")
+
+    deadline = time.monotonic() + args.ready_timeout
+    while read_ready_pid(args.ready_file) != new_server.pid:
+        if new_server.poll() is not None:
+            print(f"❌ Replacement server exited with code {new_server.returncode}; old server left running")
+            return 1
+        if time.monotonic() > deadline:
+            print(f"❌ Replacement server not ready after {args.ready_timeout:.0f}s; stopping it, old server left running")
+            new_server.send_signal(signal.SIGTERM)
+            return 1
+        time.sleep(0.5)
+    print(f"✅ Replacement server {new_server.pid} is ready")
+
+    if old_pid:
+        print(f"🛑 Draining old server {old_pid}...")
+        os.kill(old_pid, signal.SIGTERM)
+        deadline = time.monotonic() + args.stop_timeout
+        while process_alive(old_pid) and time.monotonic() < deadline:
+            time.sleep(0.2)
+        if process_alive(old_pid):
+            print(f"⚠️  Old server {old_pid} still running after {args.stop_timeout:.0f}s")
+            return 1
+        print(f"✅ Old server {old_pid} exited")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Google Sheets Request Scheduler
+Token-bucket rate limiting with priority lanes and exponential backoff for Sheets API calls
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+import deadlines
+from metrics import REGISTRY
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Priority lanes: lower value runs first
+PRIORITY_WRITE = 0
+PRIORITY_READ = 1
+PRIORITY_INFO = 2
+PRIORITY_NAMES = {PRIORITY_WRITE: 'write', PRIORITY_READ: 'read', PRIORITY_INFO: 'info'}
+
+# Sheets API default quota is 60 requests per minute per user
+DEFAULT_QUOTA_PER_MINUTE = 60
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_CAP = 32.0
+
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    'acs_sheets_queue_wait_seconds', 'Time Sheets calls waited for a quota token', ['lane'],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+QUEUE_DEPTH = REGISTRY.gauge(
+    'acs_sheets_queue_depth', 'Sheets calls waiting for a quota token', ['lane'])
+THROTTLE_EVENTS = REGISTRY.counter(
+    'acs_sheets_throttle_events_total', 'Sheets calls delayed by quota or retried after errors', ['reason'])
+TOKENS_AVAILABLE = REGISTRY.gauge(
+    'acs_sheets_tokens_available', 'Sheets quota tokens currently in the bucket')
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status of a gspread APIError (or anything carrying a response)"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error: Exception, idempotent: bool = True) -> bool:
+    """
+    Rate limits are always worth retrying; server errors only for idempotent calls
+
+    A 429 means the request was rejected before it ran. A 5xx on an append may
+    still have written the row, so retrying it could store a duplicate.
+    """
+    status = error_status(error)
+    if status == 429:
+        return True
+    return idempotent and status is not None and 500 <= status < 600
+
+
+class SheetsScheduler:
+    """
+    Central gate for every Google Sheets API call
+
+    Calls run on the caller's thread once they hold a token. Waiting callers are
+    served strictly by lane (writes before reads before informational reads) and
+    FIFO within a lane. A 429 drains the bucket so every caller backs off together.
+    """
+
+    def __init__(self, quota_per_minute: float = DEFAULT_QUOTA_PER_MINUTE, burst: Optional[float] = None,
+                 max_retries: int = DEFAULT_MAX_RETRIES, backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_cap: float = DEFAULT_BACKOFF_CAP):
+        if quota_per_minute <= 0:
+            raise ValueError(f"Sheets quota must be positive, got {quota_per_minute}")
+        self.rate = quota_per_minute / 60.0
+        # A bucket smaller than one token could never let a call through
+        self.capacity = max(1.0, burst if burst is not None else quota_per_minute / 6.0)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._waiting = []  # heap of (priority, sequence)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        TOKENS_AVAILABLE.set(self._tokens)
+
+    @classmethod
+    def from_env(cls) -> 'SheetsScheduler':
+        """Build a scheduler from ACS_SHEETS_* environment variables"""
+        burst = os.getenv('ACS_SHEETS_BURST')
+        quota = float(os.getenv('ACS_SHEETS_QUOTA_PER_MINUTE', DEFAULT_QUOTA_PER_MINUTE))
+        if quota <= 0:
+            logger.warning(f"Ignoring ACS_SHEETS_QUOTA_PER_MINUTE={quota}; using {DEFAULT_QUOTA_PER_MINUTE}")
+            quota = DEFAULT_QUOTA_PER_MINUTE
+        return cls(
+            quota_per_minute=quota,
+            burst=float(burst) if burst else None,
+            max_retries=int(os.getenv('ACS_SHEETS_MAX_RETRIES', DEFAULT_MAX_RETRIES)),
+            backoff_base=float(os.getenv('ACS_SHEETS_BACKOFF_BASE', DEFAULT_BACKOFF_BASE)),
+            backoff_cap=float(os.getenv('ACS_SHEETS_BACKOFF_CAP', DEFAULT_BACKOFF_CAP))
+        )
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = PRIORITY_READ) -> float:
+        """
+        Block until this caller is first in line and a token is available; returns seconds waited
+
+        Gives up with DeadlineExceeded when the caller's request deadline (see
+        deadlines.py) would pass before a token can be had.
+        """
+        lane = PRIORITY_NAMES.get(priority, str(priority))
+        start = time.monotonic()
+        left = deadlines.remaining()
+        give_up_at = None if left is None else start + left
+        ticket = (priority, next(self._sequence))
+        throttled = False
+        admitted = False
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            QUEUE_DEPTH.inc(lane=lane)
+            try:
+                while True:
+                    self._refill()
+                    if self._waiting[0] == ticket and self._tokens >= 1:
+                        heapq.heappop(self._waiting)
+                        admitted = True
+                        self._tokens -= 1
+                        TOKENS_AVAILABLE.set(self._tokens)
+                        # Let the next caller in line re-check
+                        self._condition.notify_all()
+                        break
+                    throttled = True
+                    wait = (1 - self._tokens) / self.rate if self._tokens < 1 else None
+                    if give_up_at is not None:
+                        now = time.monotonic()
+                        # First in line but the next token arrives too late: fail now rather than at the deadline
+                        if now >= give_up_at or (self._waiting[0] == ticket and wait is not None
+                                                 and now + wait > give_up_at):
+                            raise deadlines.DeadlineExceeded(f"Deadline exceeded waiting for Sheets quota ({lane})")
+                        wait = give_up_at - now if wait is None else min(wait, give_up_at - now)
+                    self._condition.wait(timeout=wait)
+            finally:
+                if not admitted:
+                    # Deadline or any other exception: leave the line so callers behind are not stuck
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    self._condition.notify_all()
+                QUEUE_DEPTH.dec(lane=lane)
+        waited = time.monotonic() - start
+        if throttled:
+            THROTTLE_EVENTS.inc(reason='quota_wait')
+        QUEUE_WAIT_SECONDS.observe(waited, lane=lane)
+        return waited
+
+    def penalize(self) -> None:
+        """Empty the bucket after a rate-limit response so all callers slow down"""
+        with self._condition:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+            TOKENS_AVAILABLE.set(self._tokens)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def call(self, func: Callable, *args, priority: int = PRIORITY_READ, operation: str = '',
+             idempotent: bool = True, **kwargs):
+        """Run a Sheets call under the quota, retrying 429/5xx with backoff within the request deadline"""
+        attempt = 0
+        while True:
+            self.acquire(priority)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e, idempotent) or attempt >= self.max_retries:
+                    raise
+                status = error_status(e)
+                if status == 429:
+                    THROTTLE_EVENTS.inc(reason='rate_limited')
+                    self.penalize()
+                else:
+                    THROTTLE_EVENTS.inc(reason='server_error')
+                delay = self.backoff_delay(attempt)
+                left = deadlines.remaining()
+                if left is not None and delay >= left:
+                    raise deadlines.DeadlineExceeded(
+                        f"Deadline exceeded before retrying Sheets {operation or 'call'} after {status}") from e
+                attempt += 1
+                logger.warning(f"Sheets {operation or 'call'} failed with {status}; "
+                               f"retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                time.sleep(delay)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> SheetsScheduler:
+    """Process-wide scheduler shared by every GoogleSheetsBackend"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SheetsScheduler.from_env()
+        return _scheduler
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Structured Logging for ACS Calculator
+Queue-based asynchronous JSON logging with request context and INFO sampling
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+from metrics import REGISTRY
+
+DEFAULT_QUEUE_SIZE = 10000
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+LOG_RECORDS_DROPPED = REGISTRY.counter(
+    'acs_log_records_dropped_total', 'Log records dropped because the log queue was full or sampled out', ['reason'])
+
+# Request context, captured on the calling thread when a record is created
+_request_context: contextvars.ContextVar = contextvars.ContextVar('acs_request_context', default=None)
+
+# Standard LogRecord attributes; anything else on a record came in through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@contextmanager
+def request_context(route: str, request_id: Optional[str] = None):
+    """Tag every record logged inside the with-block with the request ID and route"""
+    context = {'request_id': request_id or new_request_id(), 'route': route, 'start': time.perf_counter()}
+    token = _request_context.set(context)
+    try:
+        yield context
+    finally:
+        _request_context.reset(token)
+
+
+def current_request_id() -> Optional[str]:
+    context = _request_context.get()
+    return context['request_id'] if context else None
+
+
+class RequestContextFilter(logging.Filter):
+    """Copy the current request context onto records before they leave the calling thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _request_context.get()
+        if context is not None:
+            record.request_id = context['request_id']
+            record.route = context['route']
+            if not hasattr(record, 'duration_ms'):
+                record.elapsed_ms = round((time.perf_counter() - context['start']) * 1000, 3)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fraction of INFO-and-below records logged while serving requests
+
+    Startup and background records are always kept, as is everything at WARNING
+    or above, and any record logged with extra={'sample': False}.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno >= logging.WARNING or getattr(record, 'sample', True) is False:
+            return True
+        if getattr(record, 'request_id', None) is None:
+            return True
+        if random.random() < self.rate:
+            return True
+        LOG_RECORDS_DROPPED.inc(reason='sampled')
+        return False
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a background listener without formatting them
+
+    Message formatting (including %-style args) happens on the listener thread.
+    When the queue is full, records below ERROR are dropped and counted; ERROR and
+    above block until there is room so they are never lost.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Tracebacks reference live frames; render them now, everything else later
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno >= logging.ERROR:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc(reason='queue_full')
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, request context and extras"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != 'sample':
+                entry[key] = value
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Plain text with the request ID appended, for local development"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        request_id = getattr(record, 'request_id', None)
+        return f"{line} [request_id={request_id}]" if request_id else line
+
+
+def configure_logging() -> None:
+    """
+    Route all logging through a bounded queue to a background writer
+
+    ACS_LOG_FORMAT: json (default) or text; ACS_LOG_LEVEL: root level (INFO);
+    ACS_LOG_INFO_SAMPLE_RATE: fraction of per-request INFO records kept (1.0);
+    ACS_LOG_QUEUE_SIZE: records buffered before low-level ones are dropped (10000).
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_format = os.getenv('ACS_LOG_FORMAT', 'json').lower()
+    level = getattr(logging, os.getenv('ACS_LOG_LEVEL', 'INFO').upper(), logging.INFO)
+    sample_rate = float(os.getenv('ACS_LOG_INFO_SAMPLE_RATE', '1.0'))
+    queue_size = int(os.getenv('ACS_LOG_QUEUE_SIZE', DEFAULT_QUEUE_SIZE))
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if log_format == 'json' else TextFormatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    handler = AsyncQueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(SamplingFilter(sample_rate))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
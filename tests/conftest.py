@@ -0,0 +1,52 @@
+"""Shared fixtures; also makes the top-level modules importable when pytest runs from any directory"""
+
+import http.client
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class LiveServer:
+    """An ACS server on an ephemeral port, with a minimal HTTP client"""
+
+    def __init__(self, module, httpd):
+        self.module = module
+        self.httpd = httpd
+        self.port = httpd.server_address[1]
+
+    def request(self, method, path, body=None, headers=None):
+        """(status, headers, parsed JSON body or None)"""
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=10)
+        try:
+            payload = json.dumps(body).encode('utf-8') if body is not None else None
+            connection.request(method, path, body=payload, headers=headers or {})
+            response = connection.getresponse()
+            data = response.read()
+            parsed = json.loads(data) if data and 'json' in (response.getheader('Content-type') or '') else None
+            return response.status, response.headers, parsed
+        finally:
+            connection.close()
+
+
+@pytest.fixture
+def live_server(monkeypatch):
+    """Serve ACSCalculatorHandler without Sheets; tests install their own finder/backend on live_server.module"""
+    import acs_server
+    monkeypatch.setattr(acs_server, '_shared_backend', None)
+    monkeypatch.setattr(acs_server, '_shared_backend_initialized', True)
+    monkeypatch.setattr(acs_server, '_client_finder', None)
+    monkeypatch.setattr(acs_server, '_calculation_history', None)
+    httpd = acs_server.ACSHTTPServer(('127.0.0.1', 0), acs_server.ACSCalculatorHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield LiveServer(acs_server, httpd)
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
@@ -0,0 +1,109 @@
+"""Tests for what-if re-scoring and its agreement with the calculator's own scoring"""
+
+import itertools
+
+import pytest
+
+from acs_rescoring import CURRENT_SCHEME, CalculationFactors, ScoringScheme, parse_schemes, what_if
+
+# Factor scores of each answer, as in getPageScore / getTimeScore / getDocumentScore in acs_calculator.js
+PAGE_SCORES = {'1': 1, '2-5': 3, '>5': 6}
+TIME_SCORES = {'<5': 1, '5-15': 4, '>15': 8}
+DOCUMENT_SCORES = {'0': 1, '1': 3, '>1': 6}
+
+
+def js_final_acs(page_score, time_score, document_score, login_required):
+    """calculateACS + getFinalACS from acs_calculator.js, operation for operation"""
+    login_multiplier = 1.2 if login_required else 1.0
+    adjusted = ((page_score * 0.2) + (time_score * 0.6) + (document_score * 0.2)) * login_multiplier
+    if adjusted <= 1.5:
+        return 1
+    if adjusted <= 2.5:
+        return 2
+    if adjusted <= 3.5:
+        return 3
+    if adjusted <= 4.5:
+        return 4
+    return 5
+
+
+def record(pages, time, documents, login=False, client='Acme', acs=None):
+    return {'pageScore': pages, 'timeScore': time, 'documentScore': documents,
+            'loginRequired': 'true' if login else 'false', 'clientName': client, 'acsScore': acs}
+
+
+def test_current_scheme_matches_the_calculator_for_every_answer():
+    combinations = list(itertools.product(PAGE_SCORES.values(), TIME_SCORES.values(), DOCUMENT_SCORES.values(),
+                                          (False, True)))
+    factors = CalculationFactors(record(*combination) for combination in combinations)
+    expected = [js_final_acs(*combination) for combination in combinations]
+    assert factors.score(CURRENT_SCHEME).tolist() == expected
+
+
+@pytest.mark.parametrize('adjusted, acs', [
+    (1.0, 1), (1.5, 1), (1.51, 2), (2.5, 2), (2.51, 3), (3.5, 3), (3.51, 4), (4.5, 4), (4.51, 5), (9.0, 5)
+])
+def test_thresholds_are_inclusive_upper_bounds(adjusted, acs):
+    scheme = ScoringScheme('pages only', weights={'pages': 1.0, 'time': 0.0, 'documents': 0.0})
+    assert CalculationFactors([record(adjusted, 0, 0)]).score(scheme).tolist() == [acs]
+
+
+def test_login_multiplier_uses_stored_multiplier_before_flag():
+    rows = [
+        record(3, 4, 3),                                  # raw 3.6 -> 4
+        record(3, 4, 3, login=True),                      # 4.32 -> 4
+        {**record(3, 4, 3), 'loginMultiplier': '1.2'},    # stored multiplier wins over the flag
+        record(6, 4, 6, login=True),                      # 4.8 * 1.2 = 5.76 -> 5
+    ]
+    factors = CalculationFactors(rows)
+    assert factors.login.tolist() == [False, True, True, True]
+    assert factors.score(ScoringScheme('strict login', login_multiplier=1.3)).tolist() == [4, 5, 5, 5]
+
+
+def test_rows_without_factor_scores_are_skipped():
+    factors = CalculationFactors([record(1, 1, 1), record('', 1, 1), {'clientName': 'Hand edited', 'acsScore': 3}])
+    assert len(factors) == 1
+    assert factors.skipped == 2
+
+
+def test_what_if_reports_shift_transitions_and_clients():
+    rows = [record(1, 1, 1, client='Acme', acs=1), record(3, 4, 3, client='Acme', acs=4),
+            record(1, 4, 1, client='Globex', acs=3), record(1, 4, 1, client='Globex', acs=2)]
+    lenient = ScoringScheme('lenient', thresholds=[1.5, 2.5, 3.7, 4.5])
+    result = what_if(CalculationFactors(rows), [lenient])
+
+    assert result['calculations'] == 4
+    assert result['baseline']['distribution'] == {'1': 1, '2': 0, '3': 2, '4': 1, '5': 0}
+    # The last Globex row was stored as 2 but scores 3 today
+    assert result['baseline']['stored_mismatches'] == 1
+    scheme = result['schemes'][0]
+    assert scheme['distribution'] == {'1': 1, '2': 0, '3': 3, '4': 0, '5': 0}
+    assert scheme['distribution_shift']['4'] == -1
+    assert scheme['transitions'] == {'1': {'1': 1}, '3': {'3': 2}, '4': {'3': 1}}
+    assert (scheme['rows_changed'], scheme['rows_up'], scheme['rows_down']) == (1, 0, 1)
+    assert [change['client_name'] for change in scheme['client_changes']] == ['Acme']
+    assert scheme['client_changes'][0]['mean_acs_change'] == -0.5
+
+
+def test_current_scheme_against_itself_changes_nothing():
+    rows = [record(*combination) for combination in itertools.product((1, 3, 6), (1, 4, 8), (1, 3, 6))]
+    scheme = what_if(CalculationFactors(rows), [ScoringScheme('same')])['schemes'][0]
+    assert scheme['rows_changed'] == 0
+    assert sum(scheme['distribution'].values()) == len(rows)
+
+
+@pytest.mark.parametrize('payload', [
+    None, [], ['not a scheme'], [{'weights': {'salary': 1}}], [{'thresholds': [1, 2, 3]}],
+    [{'thresholds': [1.5, 1.5, 3.5, 4.5]}]
+])
+def test_invalid_schemes_are_rejected(payload):
+    with pytest.raises(ValueError):
+        parse_schemes(payload)
+
+
+def test_omitted_scheme_parts_keep_the_current_methodology():
+    scheme, = parse_schemes([{'weights': {'time': 0.5}}])
+    assert scheme.name == 'scheme_1'
+    assert scheme.weights == {'pages': 0.2, 'time': 0.5, 'documents': 0.2}
+    assert scheme.login_multiplier == CURRENT_SCHEME.login_multiplier
+    assert scheme.thresholds == CURRENT_SCHEME.thresholds
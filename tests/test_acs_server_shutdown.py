@@ -0,0 +1,102 @@
+"""Tests for graceful shutdown: in-flight requests drain, new connections are refused"""
+
+import http.client
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+import acs_server
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Answers every GET after a delay, like a request waiting on a Sheets write"""
+
+    # Longer than serve_forever's 0.5s poll, so shutdown() returns while the request is still running
+    delay = 1.5
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = b'done'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def get(port, results):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    try:
+        connection.request('GET', '/slow')
+        response = connection.getresponse()
+        results.append((response.status, response.read()))
+    except OSError as e:
+        results.append(e)
+    finally:
+        connection.close()
+
+
+def wait_until(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, 'condition not met in time'
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(acs_server, '_draining', threading.Event())
+    monkeypatch.setattr(acs_server, 'READY_FILE', None)
+    httpd = acs_server.ACSHTTPServer(('127.0.0.1', 0), SlowHandler)
+
+    def run():
+        # Same sequence as run_server: serve until shutdown(), then drain
+        httpd.serve_forever()
+        acs_server.finish_shutdown(httpd)
+    serving = threading.Thread(target=run, daemon=True)
+    serving.start()
+    yield httpd
+    serving.join(timeout=10)
+    httpd.server_close()
+
+
+def test_in_flight_request_finishes_while_new_connections_are_refused(server):
+    port = server.server_address[1]
+    results = []
+    in_flight = threading.Thread(target=get, args=(port, results))
+    in_flight.start()
+    wait_until(lambda: server.active_requests == 1)
+
+    shutdown = threading.Thread(target=acs_server.begin_shutdown, args=(server, 'test'))
+    shutdown.start()
+    assert not acs_server.is_ready()
+    # The listening socket closes while the slow request is still running
+    wait_until(lambda: server.socket.fileno() == -1)
+    assert server.active_requests == 1
+    with pytest.raises(ConnectionRefusedError):
+        socket.create_connection(('127.0.0.1', port), timeout=1).close()
+
+    in_flight.join()
+    shutdown.join()
+    assert results == [(200, b'done')]
+    wait_until(lambda: server.active_requests == 0)
+
+
+def test_connections_queued_before_the_socket_closes_are_still_served(monkeypatch):
+    monkeypatch.setattr(acs_server, 'READY_FILE', None)
+    monkeypatch.setattr(SlowHandler, 'delay', 0)
+    httpd = acs_server.ACSHTTPServer(('127.0.0.1', 0), SlowHandler)
+    results = []
+    # Nothing is accepting yet, so this connection waits in the listen backlog
+    queued = threading.Thread(target=get, args=(httpd.server_address[1], results))
+    queued.start()
+    time.sleep(0.1)
+    acs_server.finish_shutdown(httpd)
+    queued.join()
+    assert results == [(200, b'done')]
+    assert httpd.active_requests == 0
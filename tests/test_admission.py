@@ -0,0 +1,136 @@
+"""Tests for per-route admission control"""
+
+import threading
+import time
+
+import pytest
+
+import deadlines
+from admission import AdmissionController, RouteLimiter, parse_route_limits
+
+
+def wait_until(condition, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, 'condition not met in time'
+        time.sleep(0.005)
+
+
+def test_parse_route_limits():
+    assert parse_route_limits(' /a=2:4, /b=0 ,') == {'/a': (2, 4), '/b': (0, 0)}
+    with pytest.raises(ValueError):
+        parse_route_limits('/a=two:4')
+
+
+def test_admits_up_to_the_concurrency_limit_without_waiting():
+    limiter = RouteLimiter('/r', max_concurrent=2, max_queue=0)
+    assert limiter.acquire(1) is None
+    assert limiter.acquire(1) is None
+    assert limiter.status()['active'] == 2
+
+
+def test_sheds_when_the_queue_is_full():
+    limiter = RouteLimiter('/r', max_concurrent=1, max_queue=1)
+    assert limiter.acquire(1) is None
+    waiter = threading.Thread(target=limiter.acquire, args=(1,))
+    waiter.start()
+    wait_until(lambda: limiter.status()['waiting'] == 1)
+
+    start = time.monotonic()
+    assert limiter.acquire(1) == 'queue_full'
+    # Rejected at once rather than after waiting
+    assert time.monotonic() - start < 0.1
+    limiter.release()
+    waiter.join()
+    status = limiter.status()
+    assert status['shed'] == {'queue_full': 1, 'timeout': 0}
+    assert (status['active'], status['waiting'], status['admitted']) == (1, 0, 2)
+
+
+def test_sheds_after_waiting_too_long():
+    limiter = RouteLimiter('/r', max_concurrent=1, max_queue=4)
+    assert limiter.acquire(1) is None
+    start = time.monotonic()
+    assert limiter.acquire(0.05) == 'timeout'
+    assert time.monotonic() - start >= 0.05
+    status = limiter.status()
+    assert status['shed'] == {'queue_full': 0, 'timeout': 1}
+    assert (status['active'], status['waiting']) == (1, 0)
+
+
+def test_waiters_are_admitted_in_arrival_order():
+    limiter = RouteLimiter('/r', max_concurrent=1, max_queue=10)
+    assert limiter.acquire(1) is None
+    order = []
+
+    def request(name):
+        assert limiter.acquire(2) is None
+        order.append(name)
+        limiter.release()
+
+    threads = []
+    for name in range(5):
+        thread = threading.Thread(target=request, args=(name,))
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda: limiter.status()['waiting'] == name + 1)
+    limiter.release()
+    for thread in threads:
+        thread.join()
+    assert order == [0, 1, 2, 3, 4]
+    assert limiter.status()['active'] == 0
+
+
+def test_new_arrivals_do_not_overtake_the_queue():
+    limiter = RouteLimiter('/r', max_concurrent=1, max_queue=10)
+    assert limiter.acquire(1) is None
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(limiter.acquire(2)))
+    waiter.start()
+    wait_until(lambda: limiter.status()['waiting'] == 1)
+    # A free slot alone is not enough while someone is already waiting
+    limiter.max_concurrent = 2
+    assert limiter.acquire(0.05) == 'timeout'
+    waiter.join()
+    assert results == [None]
+    assert limiter.status()['active'] == 2
+
+
+def test_admit_releases_the_slot_when_the_request_raises():
+    controller = AdmissionController({'/r': (1, 0)})
+    with pytest.raises(RuntimeError):
+        with controller.admit('/r') as reason:
+            assert reason is None
+            raise RuntimeError('handler failed')
+    assert controller.limiters['/r'].status()['active'] == 0
+    with controller.admit('/r') as reason:
+        assert reason is None
+
+
+def test_admit_yields_the_shed_reason_without_taking_a_slot():
+    controller = AdmissionController({'/r': (1, 0)})
+    with controller.admit('/r') as first:
+        assert first is None
+        with controller.admit('/r') as second:
+            assert second == 'queue_full'
+    assert controller.limiters['/r'].status()['active'] == 0
+
+
+def test_unlimited_routes_pass_straight_through():
+    controller = AdmissionController({'/r': (1, 0), '/off': (0, 5)})
+    assert '/off' not in controller.limiters
+    with controller.admit('/r'):
+        with controller.admit('/status') as reason:
+            assert reason is None
+        with controller.admit('/off') as reason:
+            assert reason is None
+
+
+def test_queue_wait_is_capped_by_the_request_deadline():
+    controller = AdmissionController({'/r': (1, 4)}, max_wait=5)
+    with controller.admit('/r'):
+        start = time.monotonic()
+        with deadlines.deadline(0.05):
+            with controller.admit('/r') as reason:
+                assert reason == 'timeout'
+        assert time.monotonic() - start < 1
@@ -0,0 +1,59 @@
+"""Tests for the ACS x category x country analytics cube"""
+
+import pandas as pd
+import pytest
+
+from analytics_cube import AnalyticsCube
+
+
+def job_rows(client, acs, category, jobs):
+    return [{'CLIENT_NAME': client, 'ACS_SCORE': acs, 'DETAIL_NORMALISED_CATEGORY': category}] * jobs
+
+
+@pytest.fixture
+def combined_data():
+    return pd.DataFrame(
+        job_rows('A', 5, 'Nurses', 6) + job_rows('A', 5, 'Drivers', 4)
+        + job_rows('B', 5, 'Nurses', 5) + job_rows('C', 2, 'Drivers', 3)
+    )
+
+
+@pytest.fixture
+def country_data():
+    return pd.DataFrame({
+        'CLIENT_NAME': ['A', 'A', 'A', 'B'],
+        'NORMALISED_COUNTRY': ['Germany', 'France', 'Spain', 'Germany']
+    })
+
+
+@pytest.fixture
+def cube(combined_data, country_data):
+    return AnalyticsCube.build(combined_data, country_data)
+
+
+def test_rollups_count_each_job_once(cube, combined_data):
+    assert cube.query()['total'] == {'job_count': len(combined_data), 'client_count': 3}
+    assert cube.query({'acs': ['5']})['total'] == {'job_count': 15, 'client_count': 2}
+
+
+def test_rollup_totals_match_combined_data(cube, combined_data):
+    for dimension, column in (('acs', 'ACS_SCORE'), ('category', 'DETAIL_NORMALISED_CATEGORY')):
+        result = cube.query(group_by=[dimension])
+        counts = {row[dimension]: row['job_count'] for row in result['cells']}
+        assert counts == combined_data.groupby(column).size().to_dict()
+        assert result['total']['job_count'] == len(combined_data)
+
+
+def test_country_cells_count_jobs_in_every_country_of_the_client(cube):
+    counts = {row['country']: row['job_count'] for row in cube.query(group_by=['country'])['cells']}
+    # A (10 jobs) hires in three countries, B (5) in Germany, C has no mapping and defaults to United States
+    assert counts == {'Germany': 15, 'France': 10, 'Spain': 10, 'United States': 3}
+    assert cube.query({'country': ['Germany'], 'acs': ['5']})['total'] == {'job_count': 15, 'client_count': 2}
+
+
+def test_job_aggregates_give_the_same_cube(combined_data, country_data):
+    aggregates = (combined_data.groupby(['CLIENT_NAME', 'ACS_SCORE', 'DETAIL_NORMALISED_CATEGORY'])
+                  .size().rename('JOB_COUNT').reset_index())
+    from_rows = AnalyticsCube.build(combined_data, country_data)
+    from_aggregates = AnalyticsCube.build(aggregates, country_data)
+    assert from_rows.cells == from_aggregates.cells
@@ -0,0 +1,116 @@
+"""Tests for the calculation history mirror"""
+
+import threading
+import time
+
+import pytest
+
+from calculation_history import CalculationHistory
+
+
+class SlowBackend:
+    """Minimal stand-in for GoogleSheetsBackend: one partition whose reads take a while"""
+
+    spreadsheet_id = 'sheet'
+    sheet_name = 'ACS_Calculations'
+    worksheet = object()
+    current_period = None
+
+    def __init__(self, rows, delay=0.2):
+        self.rows = rows
+        self.delay = delay
+        self.list_calls = 0
+        self.read_calls = 0
+        self._lock = threading.Lock()
+
+    def list_partitions(self):
+        with self._lock:
+            self.list_calls += 1
+        time.sleep(self.delay)
+        return [{'worksheet': self.sheet_name, 'period': None, 'rows': None}]
+
+    def read_rows_after(self, after_row, worksheet=None):
+        with self._lock:
+            self.read_calls += 1
+        return self.rows[after_row - 1:]
+
+
+def calculation_row(client, ats, acs):
+    return ['2026-01-0%dT10:00:00' % acs, client, '', ats, '1', '1', '1', 'FALSE', str(acs)]
+
+
+@pytest.fixture
+def backend():
+    return SlowBackend([calculation_row('Acme', 'Workday', 3), calculation_row('Beta', 'Greenhouse', 5)])
+
+
+def test_concurrent_stale_requests_sync_once(tmp_path, backend):
+    history = CalculationHistory(backend, mirror_path=str(tmp_path / 'mirror.jsonl'), sync_interval=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(history.maybe_sync())) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 10
+    assert backend.list_calls == 1
+    assert backend.read_calls == 1
+    assert history.query()['total'] == 2
+
+
+def test_fresh_mirror_is_not_synced_again(tmp_path, backend):
+    backend.delay = 0
+    history = CalculationHistory(backend, mirror_path=str(tmp_path / 'mirror.jsonl'), sync_interval=60)
+    assert history.maybe_sync()
+    assert history.maybe_sync()
+    assert backend.list_calls == 1
+
+
+def test_failed_sync_serves_the_mirror(tmp_path, backend):
+    backend.delay = 0
+    history = CalculationHistory(backend, mirror_path=str(tmp_path / 'mirror.jsonl'), sync_interval=0)
+    history.sync()
+
+    def fail():
+        raise TimeoutError('Sheets did not answer')
+    backend.list_partitions = fail
+    assert history.maybe_sync() is False
+    assert history.query()['total'] == 2
+
+
+def test_mirror_is_reloaded_from_disk(tmp_path, backend):
+    backend.delay = 0
+    path = str(tmp_path / 'mirror.jsonl')
+    CalculationHistory(backend, mirror_path=path).sync()
+    reloaded = CalculationHistory(backend, mirror_path=path)
+    assert [record['clientName'] for record in reloaded.query()['calculations']] == ['Beta', 'Acme']
+
+
+def test_stored_row_is_mirrored_without_a_read(tmp_path, backend):
+    backend.delay = 0
+    history = CalculationHistory(backend, mirror_path=str(tmp_path / 'mirror.jsonl'), sync_interval=60)
+    history.sync()
+    history.record_stored(4, calculation_row('Gamma', 'Lever', 2))
+    assert history.query()['total'] == 3
+    assert history.ats_stats()['overall']['count'] == 3
+    assert backend.read_calls == 1
+
+
+def test_storing_does_not_wait_for_a_running_sync(tmp_path, backend):
+    backend.delay = 0.5
+    history = CalculationHistory(backend, mirror_path=str(tmp_path / 'mirror.jsonl'), sync_interval=60)
+    syncing = threading.Thread(target=history.sync)
+    syncing.start()
+    time.sleep(0.05)
+
+    # The row was appended to the sheet while the sync was still listing partitions
+    row = calculation_row('Gamma', 'Lever', 2)
+    backend.rows.append(row)
+    start = time.monotonic()
+    history.record_stored(4, row)
+    assert time.monotonic() - start < 0.1
+
+    syncing.join()
+    # The running sync read past the last mirrored row, so it mirrored the stored row exactly once
+    assert sorted(record['clientName'] for record in history.query()['calculations']) == ['Acme', 'Beta', 'Gamma']
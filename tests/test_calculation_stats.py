@@ -0,0 +1,111 @@
+"""Tests for per-ATS and per-client calculation aggregates"""
+
+import pytest
+
+from calculation_history import CalculationHistory
+from calculation_stats import UNKNOWN_GROUP, CalculationStats
+
+
+def calculation(client, ats, acs, adjusted=None, login=False, timestamp='2026-01-05T10:00:00'):
+    return {'timestamp': timestamp, 'clientName': client, 'atsName': ats, 'acsScore': str(acs),
+            'adjustedScore': '' if adjusted is None else str(adjusted), 'loginRequired': 'TRUE' if login else 'FALSE',
+            'pageScore': '1', 'timeScore': '4', 'documentScore': '3'}
+
+
+def test_empty_history_has_no_groups():
+    result = CalculationStats().query()
+    assert (result['total_groups'], result['groups']) == (0, [])
+    overall = result['overall']
+    assert overall['count'] == 0
+    assert overall['mean_acs'] is None and overall['p50_acs'] is None and overall['login_required_share'] is None
+
+
+def test_groups_are_case_insensitive_and_percentiles_exact():
+    stats = CalculationStats()
+    stats.add('ACS_2026_01', [calculation('Acme', 'Workday', acs) for acs in (1, 2, 2, 5)]
+              + [calculation('Beta', 'workday', 4, adjusted=3.6, login=True)])
+    group, = stats.query()['groups']
+    assert (group['name'], group['count']) == ('Workday', 5)
+    assert group['mean_acs'] == 2.8
+    assert (group['p50_acs'], group['p90_acs']) == (2, 5)
+    assert group['acs_distribution'] == {'1': 1, '2': 2, '4': 1, '5': 1}
+    assert group['mean_adjusted_score'] == 3.6
+    assert group['login_required_share'] == 0.2
+
+
+def test_missing_ats_and_blank_scores_are_grouped_not_dropped():
+    stats = CalculationStats()
+    record = calculation('Acme', 'Workday', 3)
+    del record['atsName']
+    stats.add('ACS_2026_01', [record, calculation('Beta', '  ', ''), calculation('Gamma', 'Workday', 'n/a')])
+    groups = {group['name']: group for group in stats.query()['groups']}
+    assert groups[UNKNOWN_GROUP]['count'] == 2
+    assert groups[UNKNOWN_GROUP]['acs_distribution'] == {'3': 1}
+    assert groups['Workday']['mean_acs'] is None
+
+
+def test_query_filters_sorts_and_validates():
+    stats = CalculationStats()
+    stats.add('ACS_2026_01', [calculation('Acme', 'Workday', 5), calculation('Beta', 'Greenhouse', 1),
+                              calculation('Beta', 'Greenhouse', 2)])
+    assert [group['name'] for group in stats.query(sort='mean_acs')['groups']] == ['Workday', 'Greenhouse']
+    assert [group['name'] for group in stats.query(sort='count')['groups']] == ['Greenhouse', 'Workday']
+    assert [group['name'] for group in stats.query(name='green')['groups']] == ['Greenhouse']
+    assert stats.query(min_count=2)['total_groups'] == 1
+    assert [group['name'] for group in stats.query(group_by='client')['groups']] == ['Beta', 'Acme']
+    # Filters narrow the groups, never the overall totals
+    assert stats.query(name='green')['overall']['count'] == 3
+    with pytest.raises(ValueError):
+        stats.query(group_by='country')
+    with pytest.raises(ValueError):
+        stats.query(sort='newest')
+
+
+def test_worksheet_mirrored_again_replaces_its_own_counts():
+    stats = CalculationStats()
+    stats.add('ACS_2026_01', [calculation('Acme', 'Workday', 3)])
+    stats.add('ACS_2026_02', [calculation('Acme', 'Workday', 4)])
+    stats.add('ACS_2026_01', [calculation('Acme', 'Workday', 5)], replace=True)
+    assert stats.query()['groups'][0]['acs_distribution'] == {'4': 1, '5': 1}
+
+
+class OneSheetBackend:
+    """Sheets backend stand-in with a single, already-mirrored worksheet"""
+
+    spreadsheet_id = 'sheet'
+    sheet_name = 'ACS_Calculations'
+    worksheet = object()
+    current_period = None
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def list_partitions(self):
+        return [{'worksheet': self.sheet_name, 'period': None, 'rows': None}]
+
+    def read_rows_after(self, after_row, worksheet=None):
+        return self.rows[after_row - 1:]
+
+
+def row(client, ats, acs):
+    return ['2026-01-05T10:00:00', client, '', ats, '1', '1', '1', 'FALSE', str(acs)]
+
+
+def test_stats_follow_stored_rows_without_a_resync(tmp_path):
+    backend = OneSheetBackend([row('Acme', 'Workday', 3)])
+    history = CalculationHistory(backend, mirror_path=str(tmp_path / 'mirror.jsonl'), sync_interval=60)
+    assert history.ats_stats()['overall']['count'] == 0
+    history.sync()
+    assert history.ats_stats()['groups'][0]['count'] == 1
+
+    history.record_stored(3, row('Beta', 'Greenhouse', 5))
+    history.record_stored(4, row('Gamma', '', 2))
+    # Not contiguous with the mirror: left for the next sync rather than counted out of order
+    history.record_stored(9, row('Delta', 'Workday', 1))
+    groups = {group['name']: group['count'] for group in history.ats_stats()['groups']}
+    assert groups == {'Workday': 1, 'Greenhouse': 1, UNKNOWN_GROUP: 1}
+    assert history.ats_stats(group_by='client', name='beta')['groups'][0]['mean_acs'] == 5
+
+    # Reloading the mirror from disk rebuilds the same aggregates
+    reloaded = CalculationHistory(backend, mirror_path=str(tmp_path / 'mirror.jsonl'))
+    assert reloaded.ats_stats()['overall']['count'] == 3
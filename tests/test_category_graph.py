@@ -0,0 +1,106 @@
+"""Tests for the category co-occurrence graph and the related-category fallback"""
+
+import math
+
+import pandas as pd
+import pytest
+
+from category_graph import CategoryGraph
+from client_reference_finder import ClientReferenceFinder
+
+
+def pairs(mapping):
+    return pd.DataFrame([(client, category) for category, clients in mapping.items() for client in clients],
+                        columns=['CLIENT_NAME', 'DETAIL_NORMALISED_CATEGORY'])
+
+
+GRAPH_DATA = pairs({
+    'Nurses': ['a', 'b', 'c'],
+    'Nursing Assistants': ['a', 'b', 'c', 'd'],
+    'Home Health Aides': ['b', 'c', 'e', 'f'],
+    'Drivers': ['c', 'g'],
+})
+
+
+def test_related_categories_are_strongest_first_with_cosine_weights():
+    graph = CategoryGraph.build(GRAPH_DATA)
+    related = graph.related('Nurses')
+    assert [entry['category'] for entry in related] == ['Nursing Assistants', 'Home Health Aides']
+    assert related[0] == {'category': 'Nursing Assistants', 'relatedness': round(3 / math.sqrt(12), 4),
+                          'shared_clients': 3}
+    assert related[1]['shared_clients'] == 2
+    # Drivers shares only one client with Nurses, below MIN_SHARED_CLIENTS
+    assert graph.related('Drivers') == []
+
+
+def test_csr_offsets_index_each_category_run():
+    graph = CategoryGraph.build(GRAPH_DATA)
+    assert graph.offsets[0] == 0 and graph.offsets[-1] == graph.edge_count
+    assert len(graph.offsets) == len(graph.categories) + 1
+    for index, category in enumerate(graph.categories):
+        start, end = graph.offsets[index], graph.offsets[index + 1]
+        neighbours = [graph.categories[n] for n in graph.neighbours[start:end]]
+        assert neighbours == [entry['category'] for entry in graph.related(category)]
+        assert list(graph.weights[start:end]) == sorted(graph.weights[start:end], reverse=True)
+
+
+def test_limits_and_unknown_categories():
+    graph = CategoryGraph.build(GRAPH_DATA, max_neighbours=1)
+    assert [entry['category'] for entry in graph.related('Nurses')] == ['Nursing Assistants']
+    assert len(CategoryGraph.build(GRAPH_DATA).related('Nurses', limit=1)) == 1
+    assert graph.related('Astronauts') == []
+    assert CategoryGraph.build(None).edge_count == 0
+
+
+@pytest.fixture
+def finder(tmp_path):
+    # All of these clients have ACS 1 in the built-in registry
+    jobs = pairs({
+        'Nurses': ['CareRite', 'Spring Health'],
+        'Nursing Assistants': ['CareRite', 'Spring Health', 'LHH', 'LHH'],
+        'Drivers': ['Roadie', 'Scale AI'],
+    }).assign(JOB_TITLE='Staff')
+    path = tmp_path / 'jobs.csv'
+    jobs.to_csv(path, index=False)
+    return ClientReferenceFinder(job_data_file=str(path))
+
+
+def test_finder_falls_back_to_related_categories_only_when_asked(finder):
+    exact = finder.find_similar_clients(target_acs=1, target_category='Nurses')
+    assert {client['client_name'] for client in exact} == {'CareRite', 'Spring Health'}
+    assert {client['match_type'] for client in exact} == {'exact'}
+
+    widened = finder.find_similar_clients(target_acs=1, target_category='Nurses', include_related=True)
+    related = [client for client in widened if client['match_type'] == 'related']
+    assert widened[:2] == exact
+    assert [(client['client_name'], client['matching_category'], client['related_to']) for client in related] == [
+        ('LHH', 'Nursing Assistants', 'Nurses')]
+
+
+@pytest.fixture
+def server(live_server, finder, monkeypatch):
+    monkeypatch.setattr(live_server.module, '_client_finder', finder)
+    return live_server
+
+
+@pytest.mark.parametrize('flag', [None, False, 'false', 'False', 0, 1, 'yes'])
+def test_endpoint_returns_only_the_exact_category_unless_related_is_enabled(server, flag):
+    body = {'target_acs': 1, 'target_category': 'Nurses'}
+    if flag is not None:
+        body['include_related'] = flag
+    status, _, response = server.request('POST', '/find-similar-clients', body=body)
+    assert status == 200
+    assert response['search_params']['include_related'] is False
+    assert (response['exact_matches'], response['related_matches']) == (2, 0)
+    assert {client['matching_category'] for client in response['clients']} == {'Nurses'}
+
+
+@pytest.mark.parametrize('flag', [True, 'true', ' TRUE '])
+def test_endpoint_labels_related_matches_when_enabled(server, flag):
+    body = {'target_acs': 1, 'target_category': 'Nurses', 'include_related': flag}
+    status, _, response = server.request('POST', '/find-similar-clients', body=body)
+    assert status == 200
+    assert response['search_params']['include_related'] is True
+    assert (response['exact_matches'], response['related_matches']) == (2, 1)
+    related = response['clients'][-1]
+    assert (related['client_name'], related['match_type'], related['related_to']) == ('LHH', 'related', 'Nurses')
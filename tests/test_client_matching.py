@@ -0,0 +1,168 @@
+"""Tests for joining job-data client names to the ACS registry"""
+
+import pandas as pd
+import pytest
+
+from client_matching import ClientNameMatcher, normalize_client_name
+from client_reference_finder import ClientReferenceFinder
+
+REGISTRY = pd.DataFrame([
+    ('Uber', 3), ('Lionstep AG', 2), ('K&B Transportation', 4), ('Heartland Dental', 2), ('Wells Fargo', 1),
+    ('Acme Staffing', 1), ('Acme Staffing Inc', 5), ('Globex Health', 2), ('Globex Healthy', 4)
+], columns=['CLIENT_NAME', 'ACS_SCORE'])
+
+
+@pytest.fixture
+def matcher():
+    return ClientNameMatcher(REGISTRY)
+
+
+@pytest.mark.parametrize('name, key', [
+    ('Uber exchange', 'uber'),
+    ('Lionstep AG 2', 'lionstep ag'),
+    ('K B Transportation', 'k b transportation'),
+    ('K&B  Transportation', 'k b transportation'),
+    ('Centers Healthcare - Exchange', 'centers healthcare'),
+    ('1800 Flowers', '1800 flowers'),  # only trailing numbers are campaign suffixes
+    ('2020', '2020'),                  # a name that is only a number keeps it
+    ('', ''),
+    (None, ''),
+])
+def test_normalize_client_name(name, key):
+    assert normalize_client_name(name) == key
+
+
+@pytest.mark.parametrize('name, method, client_name', [
+    ('Uber', 'exact', 'Uber'),
+    ('Uber exchange', 'normalized', 'Uber'),
+    ('Lionstep AG 2', 'normalized', 'Lionstep AG'),
+    ('K B Transportation', 'normalized', 'K&B Transportation'),
+    ('Hearland Dental', 'fuzzy', 'Heartland Dental'),
+])
+def test_matched_names(matcher, name, method, client_name):
+    result = matcher.match([name])[name]
+    assert (result.status, result.method, result.client_name) == ('matched', method, client_name)
+    assert result.acs_score == REGISTRY.set_index('CLIENT_NAME')['ACS_SCORE'][client_name]
+
+
+def test_registry_names_sharing_a_key_with_different_scores_are_ambiguous():
+    registry = pd.DataFrame([('Acme Staffing', 1), ('ACME Staffing', 3)], columns=['CLIENT_NAME', 'ACS_SCORE'])
+    result = ClientNameMatcher(registry).match(['acme staffing'])['acme staffing']
+    assert (result.status, result.method) == ('ambiguous', 'normalized')
+    assert {candidate['client_name'] for candidate in result.candidates} == {'Acme Staffing', 'ACME Staffing'}
+
+
+def test_close_fuzzy_candidates_with_different_scores_are_ambiguous(matcher):
+    result = matcher.match(['Globex Healthh'])['Globex Healthh']
+    assert (result.status, result.method) == ('ambiguous', 'fuzzy')
+    assert {candidate['client_name'] for candidate in result.candidates} == {'Globex Health', 'Globex Healthy'}
+
+
+def test_unmatched_names_suggest_the_closest_registry_name(matcher):
+    result = matcher.match(['Wells Fargo RSR'])['Wells Fargo RSR']
+    assert result.status == 'unmatched'
+    assert result.candidates[0]['client_name'] == 'Wells Fargo'
+    assert matcher.match(['Initech'])['Initech'].candidates == []
+
+
+def test_names_resolving_to_unscored_registry_entries_stay_unjoined():
+    matcher = ClientNameMatcher(REGISTRY, unscored_names=['Uber Eats', 'Initech'])
+    assert matcher.match(['Initech'])['Initech'].status == 'unscored'
+    assert matcher.match(['initech 2'])['initech 2'].status == 'unscored'
+    assert matcher.joins(['Initech', 'initech 2', 'Uber']) == {'Uber': ('Uber', 3)}
+    assert matcher.report()['unscored_registry_clients'] == 2
+
+
+@pytest.mark.parametrize('name', [
+    'Volvo', 'Ericsson', 'Totalmed', 'Adecco Canada', 'BrandSafway', 'Avata Partners', 'Workerhero',
+    'Five Guys- Exchange'
+])
+def test_built_in_registry_keeps_unscored_clients_unscored(name):
+    # Each of these has a scored "Exchange" sibling (or twin) that a key match must not borrow from
+    matcher = ClientReferenceFinder().client_matcher
+    assert matcher.match([name])[name].status == 'unscored'
+    assert matcher.joins([name]) == {}
+
+
+def test_built_in_registry_variants_of_split_clients_are_ambiguous():
+    matcher = ClientReferenceFinder().client_matcher
+    result = matcher.match(['volvo'])['volvo']
+    assert result.status == 'ambiguous'
+    assert {candidate['client_name'] for candidate in result.candidates} == {'Volvo', 'Volvo Exchange'}
+    assert matcher.joins(['Volvo Exchange']) == {'Volvo Exchange': ('Volvo Exchange', 1)}
+
+
+def test_joins_leave_out_ambiguous_and_unmatched_names(matcher):
+    joins = matcher.joins(['Uber exchange', 'Globex Healthh', 'Initech', 'Acme Staffing'])
+    assert joins == {'Uber exchange': ('Uber', 3), 'Acme Staffing': ('Acme Staffing', 1)}
+
+
+def test_report_counts_jobs_per_outcome(matcher):
+    matcher.set_job_counts(pd.Series({'Uber': 5, 'Uber exchange': 3, 'Initech': 2}))
+    report = matcher.report()
+    assert report['summary']['matched'] == {'names': 2, 'jobs': 8}
+    assert report['summary']['unmatched'] == {'names': 1, 'jobs': 2}
+    assert report['matched_by_method'] == {'exact': 1, 'normalized': 1}
+    assert report['normalized'][0]['name'] == 'Uber exchange'
+    assert report['normalized'][0]['job_count'] == 3
+
+
+@pytest.fixture
+def finder(tmp_path):
+    # Registry spellings come from the finder's built-in ACS data
+    jobs = pd.DataFrame([
+        ('Scale AI', 'Data Annotator', 'Data Entry'),
+        ('scale ai 2', 'Data Annotator', 'Data Entry'),
+        ('Scale AI - Exchange', 'AI Trainer', 'Data Entry'),
+        ('Roadie exchange', 'Delivery Driver', 'Transportation'),
+        ('Roadie', 'Delivery Driver', 'Transportation'),
+        ('Unknown Client', 'Delivery Driver', 'Transportation'),
+    ], columns=['CLIENT_NAME', 'JOB_TITLE', 'DETAIL_NORMALISED_CATEGORY'])
+    path = tmp_path / 'jobs.csv'
+    jobs.to_csv(path, index=False)
+    return ClientReferenceFinder(job_data_file=str(path))
+
+
+def test_spelling_variants_are_joined_under_the_registry_name(finder):
+    assert sorted(finder.combined_data['CLIENT_NAME'].unique()) == ['Roadie', 'Scale AI']
+    # Raw spellings stay in job_data and in the match report
+    assert 'scale ai 2' in set(finder.job_data['CLIENT_NAME'])
+    report = finder.client_name_report()
+    assert {row['name'] for row in report['normalized']} == {'scale ai 2', 'Scale AI - Exchange', 'Roadie exchange'}
+
+
+def test_variants_count_towards_one_client_downstream(finder):
+    assert finder.get_client_summary('Scale AI')['total_jobs'] == 3
+    assert finder.get_client_summary('scale ai 2') == {}
+
+    clients = finder.find_similar_clients(target_acs=1, target_category='Data Entry')
+    assert [(client['client_name'], client['job_count']) for client in clients] == [('Scale AI', 3)]
+
+    exported = pd.concat(finder.iter_client_batches()).set_index('CLIENT_NAME')['TOTAL_JOBS']
+    assert exported['Scale AI'] == 3
+    assert exported['Roadie'] == 2
+
+
+def write_export(directory, file_name, client_names):
+    rows = [(name, 'Delivery Driver', 'Transportation') for name in client_names]
+    pd.DataFrame(rows, columns=['CLIENT_NAME', 'JOB_TITLE', 'DETAIL_NORMALISED_CATEGORY']).to_csv(
+        directory / file_name, index=False)
+
+
+def test_report_job_counts_follow_the_retained_partitions(tmp_path):
+    write_export(tmp_path, '2025-08-01.csv', ['Roadie exchange'] * 3 + ['Initech'])
+    finder = ClientReferenceFinder(job_data_dir=str(tmp_path), retention_days=7)
+    write_export(tmp_path, '2025-08-05.csv', ['Roadie exchange'] * 2)
+    finder.ingest_partitions()
+    finder.ingest_partitions()  # nothing new: counts must not be added again
+
+    def job_counts():
+        report = finder.client_name_report()
+        return {row['name']: row['job_count'] for section in ('normalized', 'unmatched') for row in report[section]}
+    assert job_counts() == {'Roadie exchange': 5, 'Initech': 1}
+
+    # The first export ages out of the 7 day window once a newer one arrives
+    write_export(tmp_path, '2025-08-10.csv', ['Roadie exchange'])
+    assert finder.ingest_partitions()['expired'] == ['2025-08-01.csv']
+    assert job_counts() == {'Roadie exchange': 3}
+    assert finder.client_name_report()['summary']['unmatched'] == {'names': 0, 'jobs': 0}
@@ -0,0 +1,140 @@
+"""Tests for versioned client data, conditional requests and delta sync"""
+
+import pandas as pd
+import pytest
+
+from client_reference_finder import ClientReferenceFinder
+from client_versions import ClientVersionLog, version_etag
+
+
+def clients(**scores):
+    return {name: {'client_name': name, 'acs_score': score} for name, score in scores.items()}
+
+
+def test_versions_only_change_when_the_client_list_does():
+    log = ClientVersionLog()
+    first = log.update(clients(Acme=1, Beta=2))
+    assert log.update(clients(Acme=1, Beta=2)) == first
+    second = log.update(clients(Acme=3, Beta=2))
+    assert second > first
+    assert log.snapshot() == (second, [{'client_name': 'Acme', 'acs_score': 3}, {'client_name': 'Beta', 'acs_score': 2}])
+
+
+def test_changes_since_a_known_version_are_a_delta():
+    log = ClientVersionLog()
+    first = log.update(clients(Acme=1, Beta=2, Gamma=3))
+    log.update(clients(Acme=4, Beta=2, Delta=5))
+    changes = log.changes_since(first)
+    assert changes['full'] is False
+    assert changes['added'] == [{'client_name': 'Delta', 'acs_score': 5}]
+    assert changes['changed'] == [{'client_name': 'Acme', 'acs_score': 4}]
+    assert changes['removed'] == ['Gamma']
+    assert log.changes_since(log.version) == {'version': log.version, 'since': log.version, 'full': False,
+                                              'added': [], 'changed': [], 'removed': []}
+
+
+def test_added_then_removed_clients_are_not_reported():
+    log = ClientVersionLog()
+    first = log.update(clients(Acme=1))
+    log.update(clients(Acme=1, Temp=2))
+    log.update(clients(Acme=1))
+    changes = log.changes_since(first)
+    assert (changes['added'], changes['changed'], changes['removed']) == ([], [], [])
+
+
+def test_unknown_or_forgotten_versions_get_a_full_snapshot():
+    log = ClientVersionLog(max_versions=2)
+    first = log.update(clients(Acme=1))
+    log.update(clients(Acme=2))
+    log.update(clients(Acme=3))
+    for since in (first, 12345):
+        changes = log.changes_since(since)
+        assert changes['full'] is True
+        assert changes['clients'] == [{'client_name': 'Acme', 'acs_score': 3}]
+
+
+class StoringBackend:
+    """Sheets backend stand-in that accepts every calculation"""
+
+    worksheet = object()
+
+    def __init__(self):
+        self.stored = []
+
+    def store_acs_calculation(self, data):
+        self.stored.append(data)
+        return {'success': True, 'message': 'stored', 'row_number': len(self.stored) + 1}
+
+
+class RecordingHistory:
+    """Calculation history stand-in that only notes stored rows"""
+
+    def __init__(self):
+        self.stored_rows = []
+
+    def record_stored(self, row_number, values, worksheet=None):
+        self.stored_rows.append(row_number)
+
+
+@pytest.fixture
+def server(live_server, monkeypatch):
+    monkeypatch.setattr(live_server.module, '_client_finder', ClientReferenceFinder())
+    monkeypatch.setattr(live_server.module, '_shared_backend', StoringBackend())
+    monkeypatch.setattr(live_server.module, '_calculation_history', RecordingHistory())
+    return live_server
+
+
+def test_unchanged_client_list_revalidates_with_304(server):
+    status, headers, body = server.request('GET', '/get-all-clients')
+    assert status == 200
+    etag = headers['ETag']
+    assert etag == version_etag(body['version'])
+    assert body['total_count'] == len(body['clients'])
+
+    version = body['version']
+
+    status, headers, body = server.request('GET', '/get-all-clients', headers={'If-None-Match': etag})
+    assert (status, headers['ETag'], body) == (304, etag, None)
+    status, _, _ = server.request('GET', f'/clients/changes?since={version}', headers={'If-None-Match': etag})
+    assert status == 304
+
+
+def test_storing_a_calculation_keeps_the_client_list_current(server):
+    _, headers, body = server.request('GET', '/get-all-clients')
+    status, _, stored = server.request('POST', '/store-calculation', body={'clientName': 'Acme', 'acsScore': 3})
+    assert (status, stored['success']) == (200, True)
+    assert server.module._calculation_history.stored_rows == [2]
+    # Calculations don't edit the ACS registry, so the cached list is still valid
+    status, _, _ = server.request('GET', '/get-all-clients', headers={'If-None-Match': headers['ETag']})
+    assert status == 304
+    status, _, changes = server.request('GET', f"/clients/changes?since={body['version']}")
+    assert (status, changes['added'], changes['changed'], changes['removed']) == (200, [], [], [])
+
+
+def test_registry_update_is_served_as_a_delta(server):
+    _, headers, body = server.request('GET', '/get-all-clients')
+    version = body['version']
+    finder = server.module._client_finder
+    acs_data = finder.acs_data.copy()
+    acs_data.loc[acs_data['CLIENT_NAME'] == 'Roadie', 'ACS_SCORE'] = 5
+    acs_data = acs_data[acs_data['CLIENT_NAME'] != 'Scale AI']
+    finder.acs_data = pd.concat([acs_data, pd.DataFrame([{'CLIENT_NAME': 'Initech', 'ACS_SCORE': 2}])],
+                                ignore_index=True)
+    finder.publish_client_versions()
+
+    status, new_headers, changes = server.request('GET', f'/clients/changes?since={version}',
+                                                  headers={'If-None-Match': headers['ETag']})
+    assert status == 200
+    assert new_headers['ETag'] != headers['ETag']
+    assert changes['full'] is False and changes['version'] > version
+    assert [client['client_name'] for client in changes['added']] == ['Initech']
+    assert changes['changed'] == [{'client_name': 'Roadie', 'acs_score': 5, 'complexity_level': 'Very Complex'}]
+    assert changes['removed'] == ['Scale AI']
+
+    status, _, _ = server.request('GET', '/get-all-clients', headers={'If-None-Match': headers['ETag']})
+    assert status == 200
+
+
+def test_changes_need_a_numeric_since(server):
+    status, _, _ = server.request('GET', '/clients/changes?since=yesterday')
+    assert status == 400
@@ -0,0 +1,83 @@
+"""Tests for request deadlines and per-call timeouts"""
+
+import threading
+import time
+
+import pytest
+
+import deadlines
+
+
+def test_no_deadline_by_default():
+    assert deadlines.remaining() is None
+    deadlines.check()
+
+
+@pytest.mark.parametrize('seconds', [None, 0, -1])
+def test_missing_or_non_positive_budget_sets_no_deadline(seconds):
+    with deadlines.deadline(seconds):
+        assert deadlines.remaining() is None
+
+
+def test_deadline_is_restored_on_exit():
+    with deadlines.deadline(5):
+        assert 4.9 < deadlines.remaining() <= 5
+    assert deadlines.remaining() is None
+
+
+def test_nested_deadlines_can_only_shorten():
+    with deadlines.deadline(1):
+        with deadlines.deadline(10):
+            assert deadlines.remaining() <= 1
+        with deadlines.deadline(0.2):
+            assert deadlines.remaining() <= 0.2
+        assert 0.2 < deadlines.remaining() <= 1
+
+
+def test_no_deadline_lifts_the_outer_deadline():
+    with deadlines.deadline(1):
+        with deadlines.no_deadline():
+            assert deadlines.remaining() is None
+        assert deadlines.remaining() is not None
+
+
+def test_check_raises_once_the_deadline_passes():
+    with deadlines.deadline(0.01):
+        deadlines.check()
+        time.sleep(0.02)
+        with pytest.raises(deadlines.DeadlineExceeded, match='before sheet read'):
+            deadlines.check('sheet read')
+    # DeadlineExceeded is a TimeoutError, so existing timeout handling still applies
+    assert issubclass(deadlines.DeadlineExceeded, TimeoutError)
+
+
+def test_call_timeout_is_capped_by_the_time_left():
+    assert deadlines.current_call_timeout() is None
+    with deadlines.call_timeout(30) as timeout:
+        assert timeout == 30
+        assert deadlines.current_call_timeout() == 30
+    with deadlines.deadline(0.5):
+        with deadlines.call_timeout(30) as timeout:
+            assert timeout <= 0.5
+        with deadlines.call_timeout(None) as timeout:
+            assert timeout <= 0.5
+        with deadlines.call_timeout(0.1) as timeout:
+            assert timeout == 0.1
+    assert deadlines.current_call_timeout() is None
+
+
+def test_call_timeout_refuses_to_start_after_the_deadline():
+    with deadlines.deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(deadlines.DeadlineExceeded):
+            with deadlines.call_timeout(30, 'append'):
+                pytest.fail('call should not start')
+
+
+def test_deadlines_are_per_thread():
+    seen = []
+    with deadlines.deadline(1):
+        thread = threading.Thread(target=lambda: seen.append(deadlines.remaining()))
+        thread.start()
+        thread.join()
+    assert seen == [None]
@@ -0,0 +1,98 @@
+"""Tests for dated job export discovery and partition ingest"""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from client_reference_finder import ClientReferenceFinder
+from job_partitions import discover_partitions, parse_partition_timestamp
+
+
+@pytest.mark.parametrize('file_name, timestamp', [
+    ('2025-08-29 3_39pm.csv', datetime(2025, 8, 29, 15, 39)),
+    ('2025-08-29 12_05am.csv', datetime(2025, 8, 29, 0, 5)),
+    ('2025-08-29 12_05pm.csv', datetime(2025, 8, 29, 12, 5)),
+    ('2025-08-29_15-39.csv', datetime(2025, 8, 29, 15, 39)),
+    ('2025-08-29T07:30.csv', datetime(2025, 8, 29, 7, 30)),
+    ('2025-08-29.csv', datetime(2025, 8, 29)),
+    ('jobs_2025-08-29.csv', datetime(2025, 8, 29)),
+    ('jobs.csv', None),
+    ('2025-13-01.csv', None),
+])
+def test_parse_partition_timestamp(file_name, timestamp):
+    assert parse_partition_timestamp(file_name) == timestamp
+
+
+@pytest.mark.parametrize('file_name', ['2025-08-29 25_00.csv', '2025-08-29 3_75pm.csv', '2025-08-29 13_10pm.csv',
+                                       '2025-08-29 0_30am.csv'])
+def test_invalid_times_reject_the_file(file_name, caplog):
+    assert parse_partition_timestamp(file_name) is None
+    assert 'invalid time' in caplog.text
+
+
+def test_exports_with_invalid_times_are_not_ingested(tmp_path):
+    for name in ('2025-08-29 9_00am.csv', '2025-08-29 3_75pm.csv'):
+        (tmp_path / name).write_text('CLIENT_NAME\n')
+    assert [partition.name for partition in discover_partitions(str(tmp_path))] == ['2025-08-29 9_00am.csv']
+
+
+def write_export(directory, file_name, client_names, category='Transportation'):
+    rows = [(name, 'Delivery Driver', category) for name in client_names]
+    pd.DataFrame(rows, columns=['CLIENT_NAME', 'JOB_TITLE', 'DETAIL_NORMALISED_CATEGORY']).to_csv(
+        directory / file_name, index=False)
+
+
+def test_discovery_orders_by_time_and_skips_undated_files(tmp_path):
+    for name in ('2025-08-29 3_39pm.csv', '2025-08-29 9_00am.csv', '2025-08-01.csv', 'notes.csv', '2025-08-02.txt'):
+        (tmp_path / name).write_text('CLIENT_NAME\n')
+    names = [partition.name for partition in discover_partitions(str(tmp_path))]
+    assert names == ['2025-08-01.csv', '2025-08-29 9_00am.csv', '2025-08-29 3_39pm.csv']
+    assert discover_partitions(str(tmp_path / 'missing')) == []
+
+
+def test_retention_is_counted_back_from_the_newest_export(tmp_path):
+    for name in ('2025-07-01.csv', '2025-08-20.csv', '2025-08-22.csv', '2025-08-29.csv'):
+        (tmp_path / name).write_text('CLIENT_NAME\n')
+    names = [partition.name for partition in discover_partitions(str(tmp_path), retention_days=7)]
+    # 2025-08-22 is exactly 7 days before the newest export and is kept
+    assert names == ['2025-08-22.csv', '2025-08-29.csv']
+    assert len(discover_partitions(str(tmp_path))) == 4
+
+
+def test_ingest_adds_new_exports_and_expires_old_ones(tmp_path):
+    write_export(tmp_path, '2025-08-01.csv', ['Roadie'] * 3)
+    finder = ClientReferenceFinder(job_data_dir=str(tmp_path), retention_days=7)
+    assert list(finder.partitions) == ['2025-08-01.csv']
+    assert finder.get_client_summary('Roadie')['total_jobs'] == 3
+
+    write_export(tmp_path, '2025-08-05.csv', ['Roadie', 'Scale AI'])
+    assert finder.ingest_partitions() == {'added': ['2025-08-05.csv'], 'expired': [], 'partitions': 2}
+    assert finder.ingest_partitions()['added'] == []
+    assert finder.get_client_summary('Roadie')['total_jobs'] == 4
+
+    write_export(tmp_path, '2025-08-10.csv', ['Scale AI'])
+    result = finder.ingest_partitions()
+    assert result == {'added': ['2025-08-10.csv'], 'expired': ['2025-08-01.csv'], 'partitions': 2}
+    assert finder.get_client_summary('Roadie')['total_jobs'] == 1
+    assert finder.get_client_summary('Scale AI')['total_jobs'] == 2
+    assert len(finder.job_data) == len(finder.combined_data) == 3
+    assert finder.job_data['PARTITION_ID'].dtype == 'int32'
+
+
+def test_exports_arriving_after_startup_replace_the_fallback_file(tmp_path):
+    job_dir = tmp_path / 'jobs'
+    job_dir.mkdir()
+    write_export(tmp_path, 'fallback.csv', ['Roadie'] * 5)
+    finder = ClientReferenceFinder(job_data_file=str(tmp_path / 'fallback.csv'), job_data_dir=str(job_dir))
+    assert finder.job_data_dir == str(job_dir)
+    assert finder.get_client_summary('Roadie')['total_jobs'] == 5
+    # Nothing dated yet: the fallback stays
+    assert finder.ingest_partitions()['added'] == []
+    assert finder.get_client_summary('Roadie')['total_jobs'] == 5
+
+    write_export(job_dir, '2025-08-01.csv', ['Roadie', 'Scale AI'])
+    assert finder.ingest_partitions()['added'] == ['2025-08-01.csv']
+    assert finder.get_client_summary('Roadie')['total_jobs'] == 1
+    assert finder.get_client_summary('Scale AI')['total_jobs'] == 1
+    assert len(finder.combined_data) == 2
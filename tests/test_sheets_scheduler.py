@@ -0,0 +1,130 @@
+"""Tests for the Sheets token bucket, priority lanes and backoff"""
+
+import threading
+import time
+
+import pytest
+
+import deadlines
+from sheets_scheduler import (PRIORITY_INFO, PRIORITY_READ, PRIORITY_WRITE, SheetsScheduler, is_retryable)
+
+
+class StatusError(Exception):
+    """Error shaped like gspread's APIError (carries a response with a status code)"""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.response = type('Response', (), {'status_code': status})()
+
+
+def test_quota_must_be_positive():
+    with pytest.raises(ValueError):
+        SheetsScheduler(quota_per_minute=0)
+    with pytest.raises(ValueError):
+        SheetsScheduler(quota_per_minute=-5)
+
+
+def test_invalid_env_quota_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv('ACS_SHEETS_QUOTA_PER_MINUTE', '0')
+    assert SheetsScheduler.from_env().rate == 1.0
+
+
+def test_burst_is_served_immediately_then_refills_at_the_quota_rate():
+    scheduler = SheetsScheduler(quota_per_minute=600, burst=3)  # 10 tokens per second
+    for _ in range(3):
+        assert scheduler.acquire() < 0.02
+    waited = scheduler.acquire()
+    assert 0.05 < waited < 0.3
+
+
+def test_waiting_callers_are_served_by_lane_then_arrival():
+    scheduler = SheetsScheduler(quota_per_minute=600, burst=1)
+    scheduler.acquire()  # empty the bucket so everyone below has to queue
+    order = []
+
+    def caller(name, priority):
+        scheduler.acquire(priority)
+        order.append(name)
+
+    callers = [('info', PRIORITY_INFO), ('read-1', PRIORITY_READ), ('write', PRIORITY_WRITE), ('read-2', PRIORITY_READ)]
+    threads = []
+    for name, priority in callers:
+        thread = threading.Thread(target=caller, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    assert order == ['write', 'read-1', 'read-2', 'info']
+
+
+def test_deadline_gives_up_and_leaves_the_line():
+    scheduler = SheetsScheduler(quota_per_minute=6, burst=1)  # next token in 10s
+    scheduler.acquire()
+    with deadlines.deadline(0.5):
+        start = time.monotonic()
+        with pytest.raises(deadlines.DeadlineExceeded):
+            scheduler.acquire()
+    # Fails fast instead of sleeping until the deadline
+    assert time.monotonic() - start < 0.2
+    assert scheduler._waiting == []
+
+
+def test_other_exceptions_also_remove_the_ticket(monkeypatch):
+    scheduler = SheetsScheduler(quota_per_minute=6, burst=1)
+    scheduler.acquire()
+
+    def broken_wait(timeout=None):
+        raise RuntimeError('interrupted')
+    monkeypatch.setattr(scheduler._condition, 'wait', broken_wait)
+    with pytest.raises(RuntimeError):
+        scheduler.acquire()
+    assert scheduler._waiting == []
+
+
+def test_rate_limits_are_retried_with_backoff(monkeypatch):
+    scheduler = SheetsScheduler(quota_per_minute=6000, max_retries=3)
+    monkeypatch.setattr(scheduler, 'backoff_delay', lambda attempt: 0)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise StatusError(429)
+        return 'ok'
+    assert scheduler.call(flaky) == 'ok'
+    assert len(attempts) == 3
+    # A 429 empties the bucket so every caller backs off
+    assert scheduler._tokens < 1
+
+
+def test_retries_stop_after_max_retries(monkeypatch):
+    scheduler = SheetsScheduler(quota_per_minute=6000, max_retries=2)
+    monkeypatch.setattr(scheduler, 'backoff_delay', lambda attempt: 0)
+    attempts = []
+
+    def always_failing():
+        attempts.append(1)
+        raise StatusError(503)
+    with pytest.raises(StatusError):
+        scheduler.call(always_failing)
+    assert len(attempts) == 3
+
+
+def test_non_idempotent_server_errors_are_not_retried():
+    scheduler = SheetsScheduler(quota_per_minute=6000)
+    attempts = []
+
+    def append():
+        attempts.append(1)
+        raise StatusError(500)
+    with pytest.raises(StatusError):
+        scheduler.call(append, idempotent=False)
+    assert len(attempts) == 1
+    assert is_retryable(StatusError(429), idempotent=False)
+    assert not is_retryable(StatusError(400))
+
+
+def test_backoff_delay_is_capped():
+    scheduler = SheetsScheduler(backoff_base=1.0, backoff_cap=4.0)
+    assert all(0 <= scheduler.backoff_delay(attempt) <= 4.0 for attempt in range(10))
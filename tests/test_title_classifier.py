@@ -0,0 +1,86 @@
+"""Tests for the TF-IDF job title category classifier"""
+
+import pandas as pd
+import pytest
+
+from title_classifier import TitleCategoryClassifier, title_features
+from title_normalizer import MISSING_TITLE_ID, TitleDictionary
+
+POSTINGS = [
+    # (title, category, jobs)
+    ('CDL-A Truck Driver', 'Transportation', 10),
+    ('Truck Driver - Dallas, TX', 'Transportation', 5),
+    ('Team Truck Driver', 'Transportation', 4),
+    ('Delivery Driver', 'Transportation', 6),
+    ('Delivery Driver', 'Retail', 2),
+    ('Registered Nurse', 'Healthcare', 8),
+    ('ICU Registered Nurse', 'Healthcare', 3),
+    ('Nurse Practitioner', 'Healthcare', 2),
+    ('Software Engineer', 'Technology', 7),
+    ('Senior Software Engineer', 'Technology', 4),
+    ('Retail Sales Associate', 'Retail', 9),
+]
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    dictionary = TitleDictionary()
+    frame = pd.DataFrame(POSTINGS, columns=['JOB_TITLE', 'DETAIL_NORMALISED_CATEGORY', 'JOB_COUNT'])
+    frame['JOB_TITLE_ID'] = dictionary.encode(frame['JOB_TITLE'])
+    return TitleCategoryClassifier.build(frame, dictionary)
+
+
+def test_features_are_words_and_padded_trigrams():
+    features = title_features('rn icu')
+    assert features['w:rn'] == 1 and features['w:icu'] == 1
+    assert {' rn', 'rn ', ' ic', 'icu', 'cu '} <= {key[2:] for key in features if key.startswith('c:')}
+
+
+def test_one_document_per_canonical_title(classifier):
+    # The two "Delivery Driver" rows collapse into one document carrying a category mix
+    assert classifier.size == len({title for title, _, _ in POSTINGS})
+    index = classifier.titles.index('Delivery Driver')
+    category_ids, shares = classifier.title_categories[index]
+    mix = {classifier.categories[c]: round(float(s), 2) for c, s in zip(category_ids, shares)}
+    assert mix == {'Transportation': 0.75, 'Retail': 0.25}
+
+
+@pytest.mark.parametrize('title, category', [
+    ('truck driver', 'Transportation'),
+    ('Truck Drivr', 'Transportation'),                # misspelling still shares trigrams
+    ('Teamdriver (m/w/d)', 'Transportation'),         # compound word
+    ('Registered Nurse - Houston, TX', 'Healthcare'),
+    ('Software Engineer II', 'Technology'),
+    ('Sales Associate', 'Retail'),
+])
+def test_classify_picks_the_expected_category(classifier, title, category):
+    result = classifier.classify(title)
+    assert result[0]['category'] == category
+    assert result[0]['similar_titles']
+
+
+def test_confidences_are_sorted_and_sum_to_one(classifier):
+    result = classifier.classify('Delivery Driver', top_n=10)
+    confidences = [entry['confidence'] for entry in result]
+    assert confidences == sorted(confidences, reverse=True)
+    assert sum(confidences) == pytest.approx(1.0, abs=1e-3)
+    assert classifier.classify('Delivery Driver', top_n=1)[0]['category'] == 'Transportation'
+
+
+def test_exact_title_is_its_own_nearest_neighbour(classifier):
+    index, similarity = classifier.nearest_titles('Registered Nurse', limit=3)[0]
+    assert classifier.titles[index] == 'Registered Nurse'
+    assert similarity == pytest.approx(1.0, abs=1e-5)
+
+
+def test_unknown_or_blank_titles_classify_to_nothing(classifier):
+    assert classifier.classify('') == []
+    assert classifier.classify('zzzz qqqq') == []
+
+
+def test_empty_or_untitled_aggregates_build_an_empty_index():
+    dictionary = TitleDictionary()
+    assert TitleCategoryClassifier.build(None, dictionary).classify('Truck Driver') == []
+    untitled = pd.DataFrame({'JOB_TITLE_ID': [MISSING_TITLE_ID], 'DETAIL_NORMALISED_CATEGORY': ['Retail'],
+                             'JOB_COUNT': [3]})
+    assert TitleCategoryClassifier.build(untitled, dictionary).size == 0
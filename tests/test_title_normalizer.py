@@ -0,0 +1,52 @@
+"""Tests for job title normalization"""
+
+import pandas as pd
+import pytest
+
+from title_normalizer import MISSING_TITLE_ID, TitleDictionary, normalize_title
+
+
+@pytest.mark.parametrize('title, key', [
+    ('Truck Driver - Dallas, TX', 'truck driver'),
+    ('CDL-A Driver | London, UK', 'cdl-a driver'),
+    ('Software Engineer (Berlin, Germany)', 'software engineer'),
+    ('Sales Rep in Austin, Texas', 'sales rep'),
+    ('Warehouse Associate - Columbus, OH, USA', 'warehouse associate'),
+    ('Registered Nurse - New York, New York', 'registered nurse'),
+    ('Driver - Portland, Oregon', 'driver'),
+    ('Driver - Remote', 'driver'),
+    ('Driver (Hybrid)', 'driver'),
+    ('Driver - Remote - Dallas, TX', 'driver'),
+    ('Pflegefachkraft (m/w/d)', 'pflegefachkraft'),
+    ('  Registered   NURSE ', 'registered nurse'),
+])
+def test_location_and_noise_are_removed(title, key):
+    assert normalize_title(title) == key
+
+
+@pytest.mark.parametrize('title, key', [
+    ('Nurse - ICU, Nights', 'nurse - icu, nights'),
+    ('Degree in Business, Finance', 'degree in business, finance'),
+    ('Nurse (Nights, Weekends)', 'nurse (nights, weekends)'),
+    ('Teacher - Math, Science', 'teacher - math, science'),
+    ('Nurse - ICU', 'nurse - icu'),
+    ('Nurse - ICU, OR', 'nurse - icu, or'),
+    ('Analyst - Support, IT', 'analyst - support, it'),
+    ('Physician - Family Medicine, PA', 'physician - family medicine, pa'),
+])
+def test_non_location_qualifiers_are_kept(title, key):
+    assert normalize_title(title) == key
+
+
+def test_qualified_titles_get_distinct_ids():
+    dictionary = TitleDictionary()
+    ids = dictionary.encode(pd.Series(['Nurse - ICU, Nights', 'Nurse - ICU, Days', 'Nurse', 'Nurse - Austin, TX']))
+    assert ids[0] != ids[1]
+    assert ids[2] == ids[3]
+    assert len({ids[0], ids[1], ids[2]}) == 3
+
+
+def test_missing_titles_get_the_missing_id():
+    ids = TitleDictionary().encode(pd.Series(['Driver', None, '  ']))
+    assert ids[1] == MISSING_TITLE_ID
+    assert ids[2] == MISSING_TITLE_ID
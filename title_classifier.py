@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Job Title Category Classifier
+TF-IDF nearest-neighbour index mapping free-text job titles to job categories
+"""
+
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from title_normalizer import TitleDictionary, normalize_title
+
+# Neighbouring titles whose categories vote on a query
+DEFAULT_NEIGHBOURS = 25
+# Features found in more than this share of titles ("manager", "er ") are skipped at query time
+# when the query has rarer features, so their long postings are rarely scanned
+MAX_DOCUMENT_FREQUENCY = 0.1
+# Character n-grams catch spelling variants and compounds ("cdl-a", "teamdriver"); words catch the rest
+CHAR_NGRAM = 3
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def title_features(key: str) -> Dict[str, int]:
+    """Term counts for a normalized title: words plus character trigrams of each padded word"""
+    counts: Dict[str, int] = {}
+    for word in _TOKEN.findall(key):
+        counts['w:' + word] = counts.get('w:' + word, 0) + 1
+        padded = f" {word} "
+        for start in range(len(padded) - CHAR_NGRAM + 1):
+            gram = 'c:' + padded[start:start + CHAR_NGRAM]
+            counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+class TitleCategoryClassifier:
+    """
+    Sparse TF-IDF index over canonical job titles
+
+    Each canonical title is one document carrying the category mix of its postings.
+    A query is vectorized the same way, scored against titles sharing any feature
+    through an inverted index, and its nearest titles vote for categories weighted
+    by similarity.
+    """
+
+    def __init__(self):
+        self.features: Dict[str, int] = {}
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.common = np.zeros(0, dtype=bool)
+        # Inverted index in CSR form: postings of feature f are offsets[f]:offsets[f + 1]
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.posting_titles = np.zeros(0, dtype=np.int32)
+        self.posting_weights = np.zeros(0, dtype=np.float32)
+        # Per indexed title: display title and category distribution (category ids, shares)
+        self.titles: List[str] = []
+        self.categories: List[str] = []
+        self.title_categories: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    @property
+    def size(self) -> int:
+        return len(self.titles)
+
+    @classmethod
+    def build(cls, aggregates: Optional[pd.DataFrame], title_dictionary: TitleDictionary) -> 'TitleCategoryClassifier':
+        """Index every canonical title that has postings, from job aggregates with JOB_TITLE_ID and JOB_COUNT"""
+        classifier = cls()
+        if aggregates is None or aggregates.empty or 'JOB_TITLE_ID' not in aggregates.columns:
+            return classifier
+
+        pairs = (aggregates[aggregates['JOB_TITLE_ID'] >= 0]
+                 .groupby(['JOB_TITLE_ID', 'DETAIL_NORMALISED_CATEGORY'], sort=True)['JOB_COUNT'].sum())
+        if pairs.empty:
+            return classifier
+        title_ids = pairs.index.get_level_values(0).to_numpy()
+        category_codes, classifier.categories = pd.factorize(pairs.index.get_level_values(1))
+        classifier.categories = list(classifier.categories)
+        counts = pairs.to_numpy(dtype=np.float64)
+
+        # Category mix per title (pairs are sorted by title id, so each title is one run)
+        unique_ids, starts = np.unique(title_ids, return_index=True)
+        ends = np.append(starts[1:], len(title_ids))
+        for start, end in zip(starts, ends):
+            shares = counts[start:end] / counts[start:end].sum()
+            classifier.title_categories.append((category_codes[start:end].astype(np.int32), shares.astype(np.float32)))
+        classifier.titles = [title_dictionary.titles[title_id] for title_id in unique_ids]
+
+        # Flattened (document, feature, count) triples; factorizing assigns feature ids in one pass
+        docs: List[int] = []
+        terms: List[str] = []
+        term_counts: List[int] = []
+        for doc, title_id in enumerate(unique_ids):
+            features = title_features(title_dictionary.keys[title_id])
+            docs.extend([doc] * len(features))
+            terms.extend(features)
+            term_counts.extend(features.values())
+        if not terms:
+            return classifier
+        feature_ids, feature_names = pd.factorize(pd.Series(terms, dtype=object))
+        classifier.features = {name: index for index, name in enumerate(feature_names)}
+        docs = np.array(docs, dtype=np.int32)
+
+        n_docs = len(unique_ids)
+        df = np.bincount(feature_ids, minlength=len(feature_names)).astype(np.float64)
+        idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+        classifier.idf = idf.astype(np.float32)
+        classifier.common = df > max(1, MAX_DOCUMENT_FREQUENCY * n_docs)
+
+        # Sublinear TF x IDF, L2-normalized per document
+        weights = (1 + np.log(np.array(term_counts, dtype=np.float64))) * idf[feature_ids]
+        norms = np.sqrt(np.bincount(docs, weights=weights * weights, minlength=n_docs))
+        weights /= norms[docs]
+
+        order = np.argsort(feature_ids, kind='stable')
+        classifier.posting_titles = docs[order]
+        classifier.posting_weights = weights[order].astype(np.float32)
+        classifier.offsets = np.zeros(len(feature_names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(feature_ids, minlength=len(feature_names)), out=classifier.offsets[1:])
+        return classifier
+
+    def _query_vector(self, title: str) -> Dict[int, float]:
+        vector = {}
+        for feature, count in title_features(normalize_title(title)).items():
+            feature_id = self.features.get(feature)
+            if feature_id is not None:
+                vector[feature_id] = (1 + math.log(count)) * float(self.idf[feature_id])
+        # Common features have long postings and little weight; only score them when nothing rarer matched
+        rare = {f: w for f, w in vector.items() if not self.common[f]}
+        vector = rare or vector
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        return {f: w / norm for f, w in vector.items()}
+
+    def nearest_titles(self, title: str, limit: int = DEFAULT_NEIGHBOURS) -> List[Tuple[int, float]]:
+        """Indexed titles most similar to a free-text title, as (title index, cosine similarity)"""
+        vector = self._query_vector(title)
+        if not vector:
+            return []
+        scores = np.zeros(self.size, dtype=np.float32)
+        for feature_id, weight in vector.items():
+            start, end = self.offsets[feature_id], self.offsets[feature_id + 1]
+            # Postings of one feature name each title once, so fancy-index addition is safe
+            scores[self.posting_titles[start:end]] += weight * self.posting_weights[start:end]
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(index), float(scores[index])) for index in candidates]
+
+    def classify(self, title: str, top_n: int = 5, neighbours: int = DEFAULT_NEIGHBOURS) -> List[Dict]:
+        """Most likely categories for a free-text title, best first, with confidences summing to at most 1"""
+        nearest = self.nearest_titles(title, neighbours)
+        if not nearest:
+            return []
+        votes = np.zeros(len(self.categories), dtype=np.float64)
+        examples: Dict[int, List[str]] = {}
+        for index, similarity in nearest:
+            category_ids, shares = self.title_categories[index]
+            votes[category_ids] += similarity * shares
+            for category_id in category_ids[np.argsort(-shares)][:1]:
+                examples.setdefault(int(category_id), []).append(self.titles[index])
+        total = votes.sum()
+        best = np.argsort(-votes, kind='stable')[:top_n]
+        return [
+            {
+                'category': self.categories[category_id],
+                'confidence': round(float(votes[category_id] / total), 4),
+                'similar_titles': examples.get(int(category_id), [])[:3]
+            }
+            for category_id in best if votes[category_id] > 0
+        ]
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Job Title Normalization
+Maps raw job titles to canonical title IDs so near-duplicates share one entry
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# ID stored for rows without a usable title
+MISSING_TITLE_ID = -1
+
+# Gender tags common in German/Swiss postings: (m/w/d), (w/m/d), (f/m/x), (all genders)
+_GENDER_TAG = re.compile(r'\(\s*(?:[mwfdxh]\s*(?:/\s*[mwfdxh]\s*){1,3}|all genders)\)')
+# Trailing location segments: " - Dallas, TX", " | London, UK", " in Austin, TX", " - Remote", "(Berlin, DE)".
+# A "<place>, <region>" suffix is only stripped when the region is known, so qualifiers such as
+# "Nurse - ICU, Nights" or "Degree in Business, Finance" keep their own canonical title.
+_LOCATION_SUFFIXES = [
+    re.compile(r'\s+[-–|@]\s+[^-–|@]*,\s*(?P<region>[^,\-–|@]+)$'),
+    re.compile(r'\s+[-–|@]\s+(?:remote|hybrid|on-?site)$'),
+    re.compile(r'\s*\((?:[^()]*,\s*(?P<region>[^(),]+)|remote|hybrid|on-?site)\)$'),
+    re.compile(r'\s+in\s+[a-z .\'-]+,\s*(?P<region>[a-z .]+)$'),
+]
+# US states, Canadian provinces and the countries the job exports cover, as codes and names (casefolded)
+_REGION_CODES = (
+    'al ak az ar ca co ct de dc fl ga hi id il in ia ks ky la me md ma mi mn ms mo mt ne nv nh nj nm ny nc nd '
+    'oh ok or pa ri sc sd tn tx ut vt va wa wv wi wy ab bc mb nb nl ns nt nu on pe qc sk yt '
+    'us usa uk gb fr ch nl be at es it ie au nz pl se dk no fi pt cz lu sg in'
+)
+_REGION_NAMES = (
+    'alabama alaska arizona arkansas california colorado connecticut delaware florida georgia hawaii idaho '
+    'illinois indiana iowa kansas kentucky louisiana maine maryland massachusetts michigan minnesota '
+    'mississippi missouri montana nebraska nevada ohio oklahoma oregon pennsylvania tennessee texas utah '
+    'vermont virginia washington wisconsin wyoming ontario quebec alberta manitoba saskatchewan '
+    'england scotland wales germany deutschland france switzerland schweiz suisse netherlands belgium austria '
+    'österreich spain italy ireland canada australia india poland sweden denmark norway finland portugal '
+    'luxembourg singapore'
+)
+# Codes that are also words or job-title qualifiers ("ICU, OR" is the operating room, "Support, IT", "Clinic, PA");
+# their full names still count, so "Portland, Oregon" is stripped but "Portland, OR" keeps its own title
+_AMBIGUOUS_CODES = frozenset('or in it me hi oh ok id co de la pa ma md ms pt on no at be'.split())
+LOCATION_REGIONS = frozenset([code for code in _REGION_CODES.split() if code not in _AMBIGUOUS_CODES]
+                             + _REGION_NAMES.split() + [
+    'new hampshire', 'new jersey', 'new mexico', 'new york', 'north carolina', 'north dakota', 'rhode island',
+    'south carolina', 'south dakota', 'west virginia', 'british columbia', 'nova scotia', 'new brunswick',
+    'united states', 'united kingdom', 'new zealand'
+])
+_WHITESPACE = re.compile(r'\s+')
+_EDGE_PUNCTUATION = ' -–|,;:/.'
+
+
+def normalize_title(title) -> str:
+    """Canonical key for a job title: case, whitespace, gender tags and location suffixes removed"""
+    if not isinstance(title, str):
+        return ''
+    key = unicodedata.normalize('NFKC', title).casefold()
+    key = _GENDER_TAG.sub(' ', key)
+    key = _WHITESPACE.sub(' ', key).strip(_EDGE_PUNCTUATION)
+    # Peel off location suffixes until none match ("Driver - Remote - Dallas, TX")
+    previous = None
+    while key != previous:
+        previous = key
+        for pattern in _LOCATION_SUFFIXES:
+            match = pattern.search(key)
+            if match is None:
+                continue
+            region = match.groupdict().get('region')
+            if region is not None and region.strip(' .') not in LOCATION_REGIONS:
+                continue
+            stripped = key[:match.start()].strip(_EDGE_PUNCTUATION)
+            if stripped:
+                key = stripped
+    return key
+
+
+class TitleDictionary:
+    """
+    Hashed dictionary of canonical job titles
+
+    Each canonical title gets a dense integer ID; the display title is the most
+    frequent raw spelling seen for that ID.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.keys: List[str] = []
+        self.titles: List[str] = []
+        self._display_counts: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def encode(self, titles: pd.Series) -> np.ndarray:
+        """Map a column of raw titles to canonical IDs, extending the dictionary as needed"""
+        # Normalize each distinct raw spelling once rather than once per row
+        codes, uniques = pd.factorize(titles, use_na_sentinel=True)
+        raw_counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        lookup = np.empty(len(uniques), dtype=np.int32)
+
+        for index, raw in enumerate(uniques):
+            key = normalize_title(raw)
+            if not key:
+                lookup[index] = MISSING_TITLE_ID
+                continue
+            title_id = self._ids.get(key)
+            display = _WHITESPACE.sub(' ', raw).strip()
+            if title_id is None:
+                title_id = len(self.keys)
+                self._ids[key] = title_id
+                self.keys.append(key)
+                self.titles.append(display)
+                self._display_counts.append(int(raw_counts[index]))
+            elif raw_counts[index] > self._display_counts[title_id]:
+                # Show the most common spelling for this canonical title
+                self.titles[title_id] = display
+                self._display_counts[title_id] = int(raw_counts[index])
+            lookup[index] = title_id
+
+        ids = np.full(len(codes), MISSING_TITLE_ID, dtype=np.int32)
+        present = codes >= 0
+        ids[present] = lookup[codes[present]]
+        return ids
+
+    def id_for(self, title: str) -> Optional[int]:
+        """Canonical ID for a raw title, if it has been seen"""
+        return self._ids.get(normalize_title(title))
+
+    def title(self, title_id: int) -> Optional[str]:
+        """Display title for a canonical ID"""
+        if 0 <= title_id < len(self.titles):
+            return self.titles[title_id]
+        return None
+
+    def decode(self, title_ids) -> List[str]:
+        """Display titles for a sequence of IDs, skipping missing ones"""
+        return [self.titles[i] for i in title_ids if 0 <= i < len(self.titles)]